@@ -1,8 +1,15 @@
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The database tooling shared by the projects (dbkit) lives at the
+# repository root.
+REPO_ROOT = BASE_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
 SECRET_KEY = 'django-insecure-advanced-api-project-secret-key-change-in-production'
 
 DEBUG = True
@@ -18,17 +25,21 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'django_filters',
+    'dbkit',
     'api',
 ]
 
 MIDDLEWARE = [
+    'dbkit.instrumentation.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.snapshots.CatalogSnapshotMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'dbkit.routing.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'advanced_api_project.urls'
@@ -58,6 +69,22 @@ DATABASES = {
     }
 }
 
+# Read replica for the catalog's read endpoints (dbkit.routing). Set
+# DATABASE_REPLICA_NAME to a second SQLite file to try it locally; refresh it
+# from db.sqlite3 with `python manage.py sync_replica`. Under test the replica
+# mirrors the default test database and reads simply stay on default.
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['dbkit.routing.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Seconds a client keeps reading from default after one of its writes.
+REPLICA_PIN_SECONDS = 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -74,6 +101,43 @@ STATIC_URL = '/static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache used for catalog API responses. LocMemCache is per process; point
+# this at Redis or Memcached when running several workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'advanced-api-project',
+    }
+}
+
+# Seconds an anonymous /api/books/ or /api/authors/ response stays cached.
+# Writes invalidate entries immediately regardless of this value.
+CATALOG_CACHE_TIMEOUT = 300
+
+# Change feeds (api.sync). Rows written in the last SYNC_SAFETY_LAG_SECONDS
+# are held back until the next sync; keep it above the longest transaction
+# that writes books or authors. Deletions are kept for
+# SYNC_TOMBSTONE_RETENTION_DAYS (`python manage.py prune_tombstones`).
+SYNC_SAFETY_LAG_SECONDS = 5
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+# Static snapshot mode (api.snapshots): set CATALOG_SNAPSHOT_ROOT to serve
+# anonymous catalog GETs from precomputed files, built with
+# `python manage.py build_catalog_snapshots` and kept current by running
+# `python manage.py build_catalog_snapshots --changed --interval 5` as a worker.
+# List pages embed absolute links, so they are built for each origin below.
+CATALOG_SNAPSHOT_ROOT = os.environ.get('CATALOG_SNAPSHOT_ROOT')
+CATALOG_SNAPSHOT_ORIGINS = ['http://localhost:8000', 'http://127.0.0.1:8000']
+CATALOG_SNAPSHOT_LIST_PAGES = 5
+
+# Per-request SQL instrumentation (dbkit.instrumentation), logged to dbkit.sql.
+# Instrument every request in development and a 1% sample otherwise.
+SQL_INSTRUMENTATION = {
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.01,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SERVER_TIMING': True,
+}
+
 # REST Framework Configuration with Filtering, Searching, and Ordering
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
@@ -81,7 +145,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
@@ -6,3 +6,7 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'Book API'
+
+    def ready(self):
+        # Register signal handlers for cache invalidation
+        from . import signals  # noqa: F401
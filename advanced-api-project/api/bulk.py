@@ -0,0 +1,168 @@
+"""
+Bulk operations for the catalog list endpoints.
+
+``PATCH /api/books/`` accepts a JSON array of partial updates, each carrying
+the ``id`` of the book to change:
+
+    [
+        {"id": 12, "publication_year": 1954},
+        {"id": 40, "title": "The Two Towers", "author": 3}
+    ]
+
+The whole batch is validated in one pass, the target rows are locked with a
+single SELECT ... FOR UPDATE, and the valid items are written with
+bulk_update() in chunks. Items that fail validation are reported and skipped;
+the others are applied.
+
+bulk_update() bypasses model signals, so this module applies their side
+effects itself: ``updated_at`` is stamped (which also brings the rows to the
+change feed and the catalog snapshot refresh), the catalog statistics are
+moved and the catalog response cache is invalidated.
+
+``GET /api/books/?ids=12,40,7`` (and ``/api/authors/?ids=...``) resolves a
+list of ids in one in_bulk() query instead of one detail request per id.
+Results follow the order of the ids, and ids with no row are listed under
+``missing``:
+
+    {"results": [{"id": 12, ...}, {"id": 7, ...}], "missing": [40]}
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import bump_catalog_generation_on_commit
+from .models import Author
+from .stats import apply_book_moves
+
+
+class BulkLookupMixin:
+    """
+    Adds ``?ids=`` batch lookups to a ListAPIView.
+
+    The lookup uses the view's queryset (so its select_related() and
+    prefetch_related() apply) but skips filtering and pagination. Duplicate
+    ids are returned once.
+
+    Attributes:
+        - bulk_lookup_query_param: Query parameter carrying the ids
+        - bulk_lookup_max_ids: Most ids accepted in one request
+    """
+    bulk_lookup_query_param = 'ids'
+    bulk_lookup_max_ids = 5000
+
+    def list(self, request, *args, **kwargs):
+        # A blank ?ids= is ignored, as the catalog cache key ignores it too.
+        if not request.query_params.get(self.bulk_lookup_query_param):
+            return super().list(request, *args, **kwargs)
+
+        ids = self.get_lookup_ids(request)
+        objects = self.get_queryset().in_bulk(ids)
+        found = [objects[pk] for pk in ids if pk in objects]
+        return Response({
+            'results': self.get_serializer(found, many=True).data,
+            'missing': [pk for pk in ids if pk not in objects],
+        })
+
+    def get_lookup_ids(self, request):
+        param = self.bulk_lookup_query_param
+        values = [value for value in request.query_params[param].split(',') if value.strip()]
+        if len(values) > self.bulk_lookup_max_ids:
+            raise ValidationError({param: [f'At most {self.bulk_lookup_max_ids} ids can be looked up at once.']})
+        try:
+            ids = [int(value) for value in values]
+        except ValueError:
+            raise ValidationError({param: ['Expected a comma-separated list of integer ids.']})
+        # dict.fromkeys() drops duplicates and keeps the first occurrence's order.
+        return list(dict.fromkeys(ids))
+
+
+class BulkPartialUpdateMixin:
+    """
+    Adds list-level PATCH to a ListAPIView.
+
+    Attributes:
+        - bulk_update_serializer_class: Serializer validating a single item
+        - bulk_update_max_items: Largest accepted batch
+        - bulk_update_batch_size: Rows per UPDATE statement
+    """
+    bulk_update_serializer_class = None
+    bulk_update_max_items = 5000
+    bulk_update_batch_size = 500
+
+    def patch(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'detail': 'Expected a non-empty list of partial updates.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.bulk_update_max_items:
+            return Response(
+                {'detail': f'At most {self.bulk_update_max_items} items can be updated at once.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [None] * len(items)
+        ids = {}
+        for index, item in enumerate(items):
+            pk = item.get('id') if isinstance(item, dict) else None
+            if isinstance(pk, bool) or not isinstance(pk, int):
+                results[index] = {'id': pk, 'status': 'invalid', 'errors': {'id': ['A valid integer is required.']}}
+            elif pk in ids:
+                results[index] = {'id': pk, 'status': 'invalid', 'errors': {'id': ['Duplicate id in request.']}}
+            else:
+                ids[pk] = index
+
+        with transaction.atomic():
+            model = self.get_queryset().model
+            books = model.objects.select_for_update().in_bulk(list(ids))
+            author_ids = {
+                int(item['author']) for item in items
+                if isinstance(item, dict) and str(item.get('author', '')).isdigit()
+            }
+            context = self.get_serializer_context()
+            context['authors'] = Author.objects.in_bulk(author_ids)
+
+            now = timezone.now()
+            changed = []
+            moves = []
+            fields = set()
+            for pk, index in ids.items():
+                book = books.get(pk)
+                if book is None:
+                    results[index] = {'id': pk, 'status': 'not_found'}
+                    continue
+                data = {key: value for key, value in items[index].items() if key != 'id'}
+                serializer = self.bulk_update_serializer_class(
+                    book, data=data, partial=True, context=context
+                )
+                if not serializer.is_valid():
+                    results[index] = {'id': pk, 'status': 'invalid', 'errors': serializer.errors}
+                    continue
+
+                before = (book.author_id, book.publication_year)
+                for field, value in serializer.validated_data.items():
+                    setattr(book, field, value)
+                    fields.add(field)
+                book.updated_at = now
+                book._stats_snapshot = (book.author_id, book.publication_year)
+                changed.append(book)
+                moves.append((before, book._stats_snapshot))
+                results[index] = {'id': pk, 'status': 'updated'}
+
+            if changed:
+                fields.add('updated_at')
+                model.objects.bulk_update(
+                    changed, sorted(fields), batch_size=self.bulk_update_batch_size
+                )
+                apply_book_moves(moves)
+                bump_catalog_generation_on_commit()
+
+        updated = sum(1 for result in results if result['status'] == 'updated')
+        return Response({
+            'updated': updated,
+            'failed': len(results) - updated,
+            'results': results,
+        })
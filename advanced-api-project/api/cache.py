@@ -0,0 +1,173 @@
+"""
+Response cache for the anonymous catalog endpoints.
+
+Anonymous GETs to /api/books/ and /api/authors/ are cached per scheme and
+host (pages carry absolute links) on the normalized query string: parameters
+are sorted, blank values are dropped and values equal to the view's defaults
+(ordering, page size, first page) are folded away, so
+``?ordering=-publication_year,title&author=1`` and ``?author=1`` share an entry.
+
+Invalidation is generational. Every key embeds the current catalog generation,
+and any Book or Author write bumps the generation, both immediately and once
+the transaction commits (see api.signals). Old entries are never served again
+and simply expire.
+
+Authenticated requests always bypass the cache, so a client that just wrote
+through the API reads its own data straight from the database.
+
+Misses are rendered from ``default`` even on replica-routed views: a page read
+from a lagging replica right after a bump would be stored under the new
+generation and served, stale, until it expires.
+
+The generation and the hit/miss counters live in the default cache. With the
+per-process LocMemCache used in development each worker has its own copy;
+production deployments should point CACHES at a shared backend.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from dbkit.routing import primary
+
+
+CATALOG_GENERATION_KEY = 'catalog:generation'
+CATALOG_STATS_PREFIX = 'catalog:stats:'
+CATALOG_STATS = ('hits', 'misses', 'bypasses', 'invalidations')
+
+
+def get_catalog_generation():
+    """
+    Return the current catalog generation.
+
+    The counter is seeded from the clock rather than 1, so if the cache loses
+    it the new value never coincides with a generation already used in keys.
+    """
+    generation = cache.get(CATALOG_GENERATION_KEY)
+    if generation is None:
+        cache.add(CATALOG_GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(CATALOG_GENERATION_KEY)
+    return generation
+
+
+def bump_catalog_generation():
+    """Invalidate every cached catalog response."""
+    try:
+        cache.incr(CATALOG_GENERATION_KEY)
+    except ValueError:
+        cache.add(CATALOG_GENERATION_KEY, time.time_ns(), None)
+    record_cache_event('invalidations')
+
+
+def bump_catalog_generation_on_commit():
+    """
+    Bump the generation now and again once the current transaction commits.
+
+    The first bump stops readers from being served entries older than the
+    write. A concurrent anonymous read may still cache pre-commit rows under
+    the new generation; the second bump, after commit, discards them.
+    """
+    bump_catalog_generation()
+    transaction.on_commit(bump_catalog_generation)
+
+
+def record_cache_event(event):
+    key = CATALOG_STATS_PREFIX + event
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+
+
+def get_cache_stats():
+    """Return cache counters for the ops endpoint."""
+    values = cache.get_many([CATALOG_STATS_PREFIX + event for event in CATALOG_STATS])
+    stats = {event: values.get(CATALOG_STATS_PREFIX + event, 0) for event in CATALOG_STATS}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+    stats['generation'] = get_catalog_generation()
+    return stats
+
+
+def normalize_query(request, view):
+    """
+    Return the query string of the request in canonical form.
+
+    Blank values are dropped, parameters and repeated values are sorted, and
+    parameters equal to the view's defaults are removed.
+    """
+    defaults = {api_settings.ORDERING_PARAM: ','.join(getattr(view, 'ordering', None) or [])}
+    paginator = getattr(view, 'paginator', None)
+    if paginator is not None:
+        page_size_param = getattr(paginator, 'page_size_query_param', None)
+        if page_size_param:
+            defaults[page_size_param] = str(paginator.page_size)
+        page_param = getattr(paginator, 'page_query_param', None)
+        if page_param:
+            defaults[page_param] = '1'
+
+    params = []
+    for name in sorted(request.query_params):
+        values = sorted(value for value in request.query_params.getlist(name) if value != '')
+        if not values or (len(values) == 1 and defaults.get(name) == values[0]):
+            continue
+        params.extend((name, value) for value in values)
+    return urlencode(params)
+
+
+def catalog_cache_key(request, view):
+    raw = '|'.join([
+        request.scheme,
+        request.get_host(),
+        request.path,
+        normalize_query(request, view),
+    ])
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'catalog:{get_catalog_generation()}:{digest}'
+
+
+class CatalogCacheMixin:
+    """
+    Serve cached list responses to anonymous clients.
+
+    The serialized response data is cached rather than the rendered bytes, so
+    the same entry works for JSON and the browsable API. The ``X-Catalog-Cache``
+    response header reports HIT, MISS or BYPASS.
+
+    Set ``catalog_cache`` to False (e.g. ``as_view(catalog_cache=False)``) to
+    render from ``default`` without reading or filling the cache.
+    """
+    catalog_cache = True
+    catalog_cache_timeout = getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300)
+
+    def list(self, request, *args, **kwargs):
+        if not self.catalog_cache:
+            with primary():
+                return super().list(request, *args, **kwargs)
+
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            record_cache_event('bypasses')
+            response = super().list(request, *args, **kwargs)
+            response['X-Catalog-Cache'] = 'BYPASS'
+            return response
+
+        key = catalog_cache_key(request, self)
+        data = cache.get(key)
+        if data is not None:
+            record_cache_event('hits')
+            response = Response(data)
+            response['X-Catalog-Cache'] = 'HIT'
+            return response
+
+        record_cache_event('misses')
+        with primary():
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.catalog_cache_timeout)
+        response['X-Catalog-Cache'] = 'MISS'
+        return response
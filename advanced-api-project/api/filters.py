@@ -0,0 +1,87 @@
+"""
+FilterSets for the API list views.
+
+BookFilter extends the exact-match filters of BookListView with range
+filters on ``publication_year`` and a prefix filter on ``title``, each
+written so the database can answer it from an index on api_book:
+
+    ?author=3&publication_year__gte=1990&publication_year__lte=2000
+        -> (author, publication_year)
+    ?publication_year__range=1990,2000
+        -> (-publication_year, title, id), which is also the list view's
+           default ordering, so no sort step is needed
+    ?title__startswith=The%20Ho
+        -> (title)
+
+``title__startswith`` is deliberately not a bare LIKE: on SQLite LIKE is case
+insensitive and Django adds an ESCAPE clause, either of which keeps SQLite
+from using the title index, and PostgreSQL only uses a B-tree for LIKE under
+the C collation. The filter is a range, ``prefix <= title <
+successor(prefix)``, which every backend answers with an index seek, plus a
+``startswith`` recheck of the rows in the range. Under a linguistic collation
+(PostgreSQL's default outside C) strings are not ordered code point by code
+point, so the range alone can hold rows that do not start with the prefix;
+the recheck drops them. The range compares with the column's collation and
+the recheck is case sensitive, so on SQLite (BINARY) the filter is case
+sensitive.
+"""
+from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+
+from .models import Book
+
+
+def prefix_successor(prefix):
+    """
+    Return the smallest string greater than every string starting with
+    ``prefix``, or None if there is none.
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            successor = last + 1
+            # Skip the surrogate block, which cannot be encoded.
+            if 0xD800 <= successor <= 0xDFFF:
+                successor = 0xE000
+            return prefix[:-1] + chr(successor)
+        prefix = prefix[:-1]
+    return None
+
+
+class PrefixRangeFilter(filters.CharFilter):
+    """
+    Match values starting with the given prefix: a range lookup the index can
+    seek, rechecked with ``startswith`` so the match is exact in any collation.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        qs = qs.filter(**{f'{self.field_name}__gte': value, f'{self.field_name}__startswith': value})
+        successor = prefix_successor(value)
+        if successor is not None:
+            qs = qs.filter(**{f'{self.field_name}__lt': successor})
+        return qs.distinct() if self.distinct else qs
+
+
+class BookFilter(filters.FilterSet):
+    """
+    Filters for BookListView.
+
+    Query parameters:
+        - author: Author id (exact)
+        - title: Exact title
+        - title__startswith: Title prefix (case sensitive, index range scan)
+        - publication_year: Exact year
+        - publication_year__gte / publication_year__lte: Inclusive bounds
+        - publication_year__range: Inclusive "start,end" pair
+    """
+    title__startswith = PrefixRangeFilter(field_name='title')
+
+    class Meta:
+        model = Book
+        fields = {
+            'author': ['exact'],
+            'title': ['exact'],
+            'publication_year': ['exact', 'gte', 'lte', 'range'],
+        }
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.snapshots import build_all, refresh_changed, snapshot_root
+
+
+class Command(BaseCommand):
+    """
+    Render the catalog snapshots served by CatalogSnapshotMiddleware.
+
+    Writes the first list pages of /api/books/ and /api/authors/ for each
+    origin in CATALOG_SNAPSHOT_ORIGINS and the detail JSON of every book,
+    and removes snapshots of deleted books. With --changed it only rewrites
+    what the writes since the previous run touched; with --interval as well
+    it keeps doing so, as the worker that keeps the snapshots current.
+
+    Usage:
+        CATALOG_SNAPSHOT_ROOT=/var/lib/catalog-snapshots python manage.py build_catalog_snapshots
+        CATALOG_SNAPSHOT_ROOT=/var/lib/catalog-snapshots python manage.py build_catalog_snapshots --changed --interval 5
+    """
+    help = 'Precompute JSON snapshots of the public catalog endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lists-only',
+            action='store_true',
+            help='Only render the list pages, not the book details.',
+        )
+        parser.add_argument(
+            '--changed',
+            action='store_true',
+            help='Only refresh what changed since the previous run (a full build on the first).',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='With --changed, refresh again every INTERVAL seconds until stopped.',
+        )
+
+    def handle(self, *args, **options):
+        root = snapshot_root()
+        if root is None:
+            raise CommandError('CATALOG_SNAPSHOT_ROOT is not set.')
+        if options['interval'] is not None and not options['changed']:
+            raise CommandError('--interval requires --changed.')
+
+        if not options['changed']:
+            count = build_all(root, lists_only=options['lists_only'])
+            message = f'Wrote list snapshots to {root}'
+            if not options['lists_only']:
+                message += f' and {count} book snapshots'
+            self.stdout.write(self.style.SUCCESS(message + '.'))
+            return
+
+        while True:
+            count = refresh_changed(root)
+            self.stdout.write(self.style.SUCCESS(f'Refreshed {count} book snapshots in {root}.'))
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Tombstone
+
+
+class Command(BaseCommand):
+    """
+    Delete Tombstone rows older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+    Change feed cursors older than the retention period are rejected with
+    410 Gone, so the rows removed here can no longer be asked for. Run it
+    daily, e.g. from cron.
+
+    Usage:
+        python manage.py prune_tombstones
+    """
+    help = 'Delete change feed tombstones older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30),
+            help='Retention in days (default: SYNC_TOMBSTONE_RETENTION_DAYS).',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d %H:%M}.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from api.models import AuthorStat, PublicationYearStat
+from api.stats import rebuild_catalog_stats
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the catalog summary tables (PublicationYearStat, AuthorStat).
+
+    Use after bulk loads that bypass signals, or to repair drift.
+
+    Usage:
+        python manage.py rebuild_catalog_stats
+    """
+    help = 'Recompute the per-year and per-author book count summary tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to rebuild (default: "default").',
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        rebuild_catalog_stats(using=using)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt catalog stats: '
+            f'{PublicationYearStat.objects.using(using).count()} years, '
+            f'{AuthorStat.objects.using(using).count()} authors.'
+        ))
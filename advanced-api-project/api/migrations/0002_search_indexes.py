@@ -0,0 +1,130 @@
+"""
+Full-text indexes used by api.search.RankedSearchFilter.
+
+SQLite gets FTS5 tables (api_book_fts, api_author_fts) kept in sync by
+triggers, so rows written through the ORM, bulk_create, bulk_update or raw SQL
+are all indexed. PostgreSQL gets tsvector GIN indexes whose expressions match
+the ones generated by SearchVector(..., config='simple').
+"""
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE api_book_fts USING fts5(
+        title, author_name, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE api_author_fts USING fts5(
+        name, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER api_book_fts_insert AFTER INSERT ON api_book BEGIN
+        INSERT INTO api_book_fts (rowid, title, author_name)
+        SELECT new.id, new.title, name FROM api_author WHERE id = new.author_id;
+    END
+    """,
+    """
+    CREATE TRIGGER api_book_fts_update AFTER UPDATE OF title, author_id ON api_book BEGIN
+        DELETE FROM api_book_fts WHERE rowid = old.id;
+        INSERT INTO api_book_fts (rowid, title, author_name)
+        SELECT new.id, new.title, name FROM api_author WHERE id = new.author_id;
+    END
+    """,
+    """
+    CREATE TRIGGER api_book_fts_delete AFTER DELETE ON api_book BEGIN
+        DELETE FROM api_book_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER api_author_fts_insert AFTER INSERT ON api_author BEGIN
+        INSERT INTO api_author_fts (rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER api_author_fts_update AFTER UPDATE OF name ON api_author BEGIN
+        UPDATE api_author_fts SET name = new.name WHERE rowid = new.id;
+        UPDATE api_book_fts SET author_name = new.name
+        WHERE rowid IN (SELECT id FROM api_book WHERE author_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER api_author_fts_delete AFTER DELETE ON api_author BEGIN
+        DELETE FROM api_author_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    INSERT INTO api_book_fts (rowid, title, author_name)
+    SELECT api_book.id, api_book.title, api_author.name
+    FROM api_book INNER JOIN api_author ON api_author.id = api_book.author_id
+    """,
+    "INSERT INTO api_author_fts (rowid, name) SELECT id, name FROM api_author",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS api_book_fts_insert",
+    "DROP TRIGGER IF EXISTS api_book_fts_update",
+    "DROP TRIGGER IF EXISTS api_book_fts_delete",
+    "DROP TRIGGER IF EXISTS api_author_fts_insert",
+    "DROP TRIGGER IF EXISTS api_author_fts_update",
+    "DROP TRIGGER IF EXISTS api_author_fts_delete",
+    "DROP TABLE IF EXISTS api_book_fts",
+    "DROP TABLE IF EXISTS api_author_fts",
+]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX api_book_title_tsv_idx ON api_book
+    USING gin (to_tsvector('simple'::regconfig, COALESCE((title)::text, '')))
+    """,
+    """
+    CREATE INDEX api_author_name_tsv_idx ON api_author
+    USING gin (to_tsvector('simple'::regconfig, COALESCE((name)::text, '')))
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS api_book_title_tsv_idx",
+    "DROP INDEX IF EXISTS api_author_name_tsv_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FORWARD[:1])
+        except OperationalError:
+            # SQLite was built without FTS5; RankedSearchFilter falls back
+            # to SearchFilter when the table is missing.
+            return
+        _run(schema_editor, SQLITE_FORWARD[1:])
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
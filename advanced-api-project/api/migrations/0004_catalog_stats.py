@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_catalog_stats(apps, schema_editor):
+    Book = apps.get_model('api', 'Book')
+    PublicationYearStat = apps.get_model('api', 'PublicationYearStat')
+    AuthorStat = apps.get_model('api', 'AuthorStat')
+    db = schema_editor.connection.alias
+
+    PublicationYearStat.objects.using(db).bulk_create([
+        PublicationYearStat(publication_year=row['publication_year'], book_count=row['total'])
+        for row in Book.objects.using(db).order_by().values('publication_year').annotate(total=Count('id'))
+    ], batch_size=1000)
+    AuthorStat.objects.using(db).bulk_create([
+        AuthorStat(author_id=row['author_id'], book_count=row['total'])
+        for row in Book.objects.using(db).order_by().values('author_id').annotate(total=Count('id'))
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_book_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicationYearStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication_year', models.IntegerField(unique=True)),
+                ('book_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Publication year stats',
+                'ordering': ['publication_year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthorStat',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.author')),
+                ('book_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Author stats',
+                'ordering': ['-book_count', 'author_id'],
+                'indexes': [models.Index(fields=['-book_count', 'author'], name='api_authors_book_co_c97c46_idx')],
+            },
+        ),
+        migrations.RunPython(populate_catalog_stats, migrations.RunPython.noop),
+    ]
@@ -31,6 +31,8 @@ class Author(models.Model):
         verbose_name_plural = "Authors"
         indexes = [
             models.Index(fields=['name']),
+            # Change feed (api.sync) cursor order
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def __str__(self):
@@ -81,11 +83,45 @@ class Book(models.Model):
         indexes = [
             models.Index(fields=['author', 'publication_year']),
             models.Index(fields=['title']),
+            # Keyset pagination indexes: each one matches an ordering accepted
+            # by BookListView with the id tiebreaker appended
+            models.Index(fields=['-publication_year', 'title', 'id']),
+            models.Index(fields=['publication_year', 'id']),
+            models.Index(fields=['created_at', 'id']),
+            # Change feed (api.sync) cursor order
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def __str__(self):
         return f"{self.title} by {self.author.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the author and year a book was loaded with, so the statistics
+        signal handlers can move it between summary rows without re-reading it.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_stats()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # The stored author or year may have changed since the book was
+        # loaded; keeping the old snapshot would move the book twice.
+        if fields is None or {'author', 'author_id', 'publication_year'} & set(fields):
+            self._snapshot_stats()
+
+    def _snapshot_stats(self):
+        # Read __dict__, not the attributes: reading a deferred field would
+        # load it through refresh_from_db() and from_db() again. Without a
+        # snapshot the pre_save handler reads the stored values itself.
+        values = self.__dict__
+        if 'author_id' in values and 'publication_year' in values:
+            self._stats_snapshot = (values['author_id'], values['publication_year'])
+        else:
+            values.pop('_stats_snapshot', None)
+
     def clean(self):
         """
         Validate the book instance.
@@ -99,4 +135,85 @@ class Book(models.Model):
         if self.publication_year < 1000:
             raise ValidationError(
                 "Publication year must be a valid year (1000 or later)."
-            )
\ No newline at end of file
+            )
+
+
+class PublicationYearStat(models.Model):
+    """
+    Summary table holding the number of books per publication year.
+
+    Maintained incrementally by the Book signal handlers in api.signals and
+    rebuilt from scratch by ``manage.py rebuild_catalog_stats``. Dashboards
+    read this table instead of running GROUP BY over api_book.
+
+    Fields:
+        - publication_year: The year being counted (unique)
+        - book_count: Number of books published that year
+    """
+    publication_year = models.IntegerField(unique=True)
+    book_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['publication_year']
+        verbose_name_plural = "Publication year stats"
+
+    def __str__(self):
+        return f"{self.publication_year}: {self.book_count} books"
+
+
+class AuthorStat(models.Model):
+    """
+    Summary table holding the number of books per author.
+
+    Maintained alongside PublicationYearStat. The (book_count, author) index
+    serves the "top authors" query without sorting the table.
+
+    Fields:
+        - author: The author being counted (primary key)
+        - book_count: Number of books by the author
+    """
+    author = models.OneToOneField(
+        Author,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    book_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-book_count', 'author_id']
+        verbose_name_plural = "Author stats"
+        indexes = [
+            models.Index(fields=['-book_count', 'author']),
+        ]
+
+    def __str__(self):
+        return f"{self.author_id}: {self.book_count} books"
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted Book or Author, so deletions reach the change feed.
+
+    Written by the post_delete signal handlers in api.signals, including for
+    rows removed by cascade. Rows older than SYNC_TOMBSTONE_RETENTION_DAYS
+    are removed by ``manage.py prune_tombstones``; clients whose cursor is
+    older than that must resynchronise from scratch.
+
+    Fields:
+        - model: Model name of the deleted row ('book' or 'author')
+        - object_id: Primary key of the deleted row
+        - deleted_at: When the row was deleted
+    """
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted at {self.deleted_at}"
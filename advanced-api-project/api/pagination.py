@@ -0,0 +1,411 @@
+"""
+Pagination classes for the API list views.
+
+KeysetPagination replaces page-number pagination on BookListView. Page-number
+pagination costs a COUNT(*) on every request plus an OFFSET scan that grows
+with the page number. Keyset pagination instead remembers the sort key of the
+last row it returned and asks for rows strictly after it, which an index on
+the ordering columns answers with a seek.
+
+EstimatedCountPaginator is a django.core.paginator.Paginator for page-number
+UIs (the admin changelists) over tables too large to COUNT(*) on every page
+view. Counts are exact up to a limit and estimated beyond it.
+EstimatedCountPagination is the DRF page-number pagination built on it; it
+flags estimated counts in the response with ``count_is_estimate``.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that follows the queryset's multi-column ordering.
+
+    The ordering is read from the queryset after the filter backends have run,
+    so whatever OrderingFilter allowed (``?ordering=title,-publication_year``)
+    is honoured. The primary key is appended as a tiebreaker, in the same
+    direction as the last ordering column, so every row has a unique position.
+
+    Cursors are opaque base64 strings holding the sort key of the boundary row.
+    When the ordering uses something other than concrete model columns (for
+    example the relevance rank added by RankedSearchFilter), the cursor holds
+    an offset instead, since such values cannot be compared in a WHERE clause.
+
+    Ordering columns are assumed to be non-null.
+
+    Response format:
+        {
+            "next": "http://.../api/books/?cursor=...",
+            "previous": null,
+            "results": [...]
+        }
+    """
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.keyset = all(self._is_column(queryset.model, name) for name, _desc in self.ordering)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor.get('r'))
+
+        if self.keyset:
+            if reverse:
+                ordering = [(name, not desc) for name, desc in self.ordering]
+            else:
+                ordering = self.ordering
+            queryset = queryset.order_by(*(('-' if desc else '') + name for name, desc in ordering))
+            if cursor:
+                queryset = queryset.filter(self.build_keyset_filter(queryset.model, ordering, cursor['v']))
+            rows = list(queryset[:self.page_size + 1])
+        else:
+            offset = cursor['o'] if cursor else 0
+            if reverse:
+                start = max(offset - self.page_size - 1, 0)
+                rows = list(queryset[start:offset])
+                rows.reverse()
+            else:
+                rows = list(queryset[offset:offset + self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        if not self.keyset:
+            self.offset = (cursor['o'] if cursor else 0) - (len(rows) if reverse else 0)
+        return rows
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        """
+        Return the queryset ordering as (field name, descending) pairs, with
+        the primary key appended as a tiebreaker.
+        """
+        order_by = queryset.query.order_by or queryset.model._meta.ordering
+        ordering = []
+        for term in order_by:
+            if not isinstance(term, str):
+                # Expressions cannot be used in a keyset; force offset mode.
+                ordering.append((repr(term), False))
+                continue
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = queryset.model._meta.pk.name
+            ordering.append((name, descending))
+
+        pk_name = queryset.model._meta.pk.name
+        if pk_name not in (name for name, _desc in ordering):
+            last_descending = ordering[-1][1] if ordering else False
+            ordering.append((pk_name, last_descending))
+        return ordering
+
+    def _is_column(self, model, name):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return field.concrete and not field.is_relation
+
+    def build_keyset_filter(self, model, ordering, values):
+        """
+        Build the "strictly after this row" condition for the given ordering.
+
+        For ordering (a DESC, b ASC, id ASC) and boundary (x, y, z) this is:
+
+            a <= x AND (a < x OR (a = x AND b > y) OR (a = x AND b = y AND id > z))
+
+        The leading ``a <= x`` bound is redundant logically but gives the
+        database a range it can seek to on an index whose first column is a.
+        """
+        if len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = [
+            self._to_python(model, name, value) for (name, _desc), value in zip(ordering, values)
+        ]
+
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(ordering, values):
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        first_name, first_descending = ordering[0]
+        bound = Q(**{f'{first_name}__{"lte" if first_descending else "gte"}': values[0]})
+        return bound & condition
+
+    def _to_python(self, model, name, value):
+        field = model._meta.get_field(name)
+        try:
+            return field.to_python(value)
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position(self, row):
+        values = []
+        for name, _desc in self.ordering:
+            field = row._meta.get_field(name)
+            value = getattr(row, field.attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(cursor, dict) or cursor.get('k') != self._ordering_key():
+            raise NotFound(self.invalid_cursor_message)
+        if self.keyset and not isinstance(cursor.get('v'), list):
+            raise NotFound(self.invalid_cursor_message)
+        if not self.keyset and not isinstance(cursor.get('o'), int):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, cursor):
+        cursor['k'] = self._ordering_key()
+        encoded = urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode('utf-8'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def _ordering_key(self):
+        # Ties a cursor to the ordering it was issued for.
+        return ','.join(('-' if desc else '') + name for name, desc in self.ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.keyset:
+            return self.encode_cursor({'v': self._position(self.page[-1])})
+        return self.encode_cursor({'o': self.offset + len(self.page)})
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.keyset:
+            if not self.page:
+                return remove_query_param(self.base_url, self.cursor_query_param)
+            return self.encode_cursor({'v': self._position(self.page[0]), 'r': True})
+        if self.offset <= 0:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor({'o': self.offset, 'r': True})
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count stops being exact past ``exact_count_limit`` rows.
+
+    The count query is bounded with a LIMIT, so it reads at most
+    ``exact_count_limit + 1`` rows whatever the table size. When the bound is
+    hit, the count is replaced by an estimate and ``count_is_estimate`` is
+    set:
+
+        - unfiltered querysets use the table size the database already keeps
+          (pg_class.reltuples on PostgreSQL, sqlite_stat1 on SQLite once
+          ANALYZE has run, otherwise the highest primary key, which is one
+          index seek),
+        - filtered querysets on PostgreSQL use the planner's row estimate,
+        - any other filtered queryset reports the bound itself.
+
+    Estimates are never lower than the bound, so every page up to the limit
+    stays reachable. Past the bound page numbers are not checked against the
+    estimate, which may fall short (it is the bound itself for most filtered
+    querysets): any page with rows is served, and only a page past the real
+    end raises EmptyPage.
+    """
+    exact_count_limit = 10000
+
+    def __init__(self, *args, exact_count_limit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if exact_count_limit is not None:
+            self.exact_count_limit = exact_count_limit
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return len(queryset)
+        bounded = queryset.order_by()[:self.exact_count_limit + 1].count()
+        if bounded <= self.exact_count_limit:
+            return bounded
+        self.count_is_estimate = True
+        return max(self.estimate_count(queryset), bounded)
+
+    def validate_number(self, number):
+        self.count  # Sets count_is_estimate.
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        object_list = self.object_list[bottom:bottom + self.per_page]
+        if number > 1 and not object_list:
+            raise EmptyPage(self.error_messages['no_results'])
+        return self._get_page(object_list, number, self)
+
+    def estimate_count(self, queryset):
+        """Return an approximate row count for a queryset known to be large."""
+        query = queryset.query
+        connection = connections[queryset.db]
+        if not query.where and not query.distinct and not query.combinator:
+            return self.estimate_table_size(queryset.model, connection)
+        if connection.vendor == 'postgresql':
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        return 0
+
+    def estimate_table_size(self, model, connection):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 until the table has been vacuumed or analyzed.
+            if row and row[0] > 0:
+                return row[0]
+        elif connection.vendor == 'sqlite':
+            rows = self.sqlite_analyzed_rows(model, connection)
+            if rows:
+                return rows
+        return model._default_manager.using(connection.alias).aggregate(
+            highest=Max('pk')
+        )['highest'] or 0
+
+    def sqlite_analyzed_rows(self, model, connection):
+        """
+        Return the row count recorded by the last ANALYZE, or None.
+
+        The first number of every sqlite_stat1 entry for a table is its row
+        count. The table only exists once ANALYZE has run.
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                    [model._meta.db_table],
+                )
+                row = cursor.fetchone()
+        except DatabaseError:
+            return None
+        return int(row[0].split()[0]) if row else None
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page-number pagination that does not COUNT(*) large result sets.
+
+    Counts go through EstimatedCountPaginator: exact up to its
+    ``exact_count_limit`` rows, estimated from table statistics or the
+    query planner past it (subclass the paginator to change the limit).
+    Responses say which one they got:
+
+        {
+            "count": 120000,
+            "count_is_estimate": true,
+            "next": "http://.../api/authors/?page=3",
+            "previous": "http://.../api/authors/?page=1",
+            "results": [...]
+        }
+
+    An estimate can overshoot or fall short, so while the count is estimated
+    the next link follows the page itself: it is given for every full page
+    and dropped on the first short one, whatever the estimated page count.
+    """
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_next_link(self):
+        paginator = self.page.paginator
+        if not paginator.count_is_estimate:
+            return super().get_next_link()
+        if len(self.page) < paginator.per_page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page.number + 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_estimate': self.page.paginator.count_is_estimate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_estimate'] = {'type': 'boolean', 'example': False}
+        return response_schema
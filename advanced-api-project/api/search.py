@@ -0,0 +1,169 @@
+"""
+Index-backed, relevance-ranked search for the API list views.
+
+DRF's SearchFilter turns ``?search=`` into ``icontains`` lookups OR'ed across
+every search field. A leading-wildcard LIKE cannot use a B-tree index, so every
+search is a full scan of api_book joined to api_author.
+
+RankedSearchFilter keeps the same interface (``search_fields`` on the view and
+the ``?search=`` parameter) but resolves the terms against a full-text index:
+
+    - SQLite: an FTS5 table named ``<db_table>_fts`` kept in sync by triggers
+      (see migration 0002_search_indexes). Results are ranked with bm25.
+    - PostgreSQL: tsvector GIN indexes on each searched column. Results are
+      ranked with ts_rank.
+
+Any other database, or a SQLite build without FTS5, falls back to the stock
+SearchFilter behaviour.
+
+Matching is token-prefix based rather than substring based: ``?search=pott``
+matches "Harry Potter" but ``?search=otter`` does not. Every term must match
+at least one of the search fields, exactly like SearchFilter.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+
+# Tokens are reduced to word characters so user input can never inject
+# FTS5 or tsquery operators.
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Search config used for the PostgreSQL tsvector indexes. 'simple' avoids
+# stemming so prefix matching behaves the same as on SQLite.
+POSTGRES_SEARCH_CONFIG = 'simple'
+
+
+def fts_table_for(model):
+    """Return the name of the FTS5 table that indexes the given model."""
+    return f'{model._meta.db_table}_fts'
+
+
+# Introspection results per (database name, table), so the FTS5 lookup does
+# not cost an extra query on every request.
+_fts_tables = {}
+
+
+def _sqlite_has_table(connection, table_name):
+    key = (str(connection.settings_dict['NAME']), table_name)
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            _fts_tables[key] = table_name in connection.introspection.table_names(cursor)
+    return _fts_tables[key]
+
+
+def has_search_index(model, using=DEFAULT_DB_ALIAS):
+    """Return True if the database ``using`` has a full-text index for model."""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        return _sqlite_has_table(connection, fts_table_for(model))
+    return connection.vendor == 'postgresql'
+
+
+def search_tokens(text):
+    """Split free text into lower-cased index tokens."""
+    return [token.lower() for token in TOKEN_RE.findall(text)]
+
+
+class RankedSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for filters.SearchFilter that uses full-text indexes
+    and orders results by relevance.
+
+    Matching rows are annotated with ``search_rank`` (higher is more relevant).
+    When the request does not ask for an explicit ``?ordering=``, results are
+    ordered by ``search_rank`` with the queryset's existing ordering as the
+    tiebreaker. To let the ranking survive, list this backend *after*
+    OrderingFilter in ``filter_backends``.
+    """
+    rank_annotation = 'search_rank'
+
+    def get_search_tokens(self, request):
+        """Split the search terms into index tokens."""
+        tokens = []
+        for term in self.get_search_terms(request):
+            tokens.extend(search_tokens(term))
+        return tokens
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        if not search_fields:
+            return queryset
+
+        # queryset.db follows the read router, so a replica-routed search
+        # checks the replica's index.
+        if not has_search_index(queryset.model, queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        tokens = self.get_search_tokens(request)
+        if not tokens:
+            return queryset
+        queryset = self.filter_indexed(queryset, search_fields, tokens)
+
+        if api_settings.ORDERING_PARAM in request.query_params:
+            return queryset
+        return queryset.order_by(f'-{self.rank_annotation}', *queryset.query.order_by)
+
+    def filter_indexed(self, queryset, search_fields, tokens):
+        """
+        Restrict the queryset to rows matching every token, annotated with
+        the rank. Only call this when has_search_index() is true.
+        """
+        if connections[queryset.db].vendor == 'postgresql':
+            return self.filter_postgres(queryset, search_fields, tokens)
+        return self.filter_sqlite(queryset, tokens)
+
+    def filter_sqlite(self, queryset, tokens):
+        """
+        Join the queryset to the FTS5 index and keep only matching rows.
+
+        The FTS5 query is an implicit AND of quoted prefix tokens, so each
+        token must appear in some indexed column. The index is joined on
+        rowid rather than probed per row so the MATCH runs exactly once.
+        bm25 returns negative scores (lower is better), so the rank is negated
+        to match PostgreSQL.
+        """
+        table = fts_table_for(queryset.model)
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        pk_column = f'{queryset.model._meta.db_table}.{queryset.model._meta.pk.column}'
+        return queryset.extra(
+            tables=[table],
+            where=[f'{table}.rowid = {pk_column}', f'{table} MATCH %s'],
+            params=[match],
+            select={self.rank_annotation: f'-{table}.rank'},
+        )
+
+    def filter_postgres(self, queryset, search_fields, tokens):
+        """
+        Restrict the queryset with per-column tsvector matches.
+
+        Each column is matched on its own so the expression is identical to
+        the GIN index built in migration 0002_search_indexes. Columns on a
+        related model (``author__name``) are matched in a subquery against
+        that model's own index.
+        """
+        config = POSTGRES_SEARCH_CONFIG
+        condition = Q()
+        for token in tokens:
+            query = SearchQuery(f'{token}:*', search_type='raw', config=config)
+            term_condition = Q()
+            for field in search_fields:
+                term_condition |= self._postgres_field_match(queryset.model, field, query)
+            condition &= term_condition
+
+        full_query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens), search_type='raw', config=config
+        )
+        rank = SearchRank(SearchVector(*search_fields, config=config), full_query)
+        return queryset.filter(condition).annotate(**{self.rank_annotation: rank})
+
+    def _postgres_field_match(self, model, field, query):
+        relation, _, column = field.rpartition('__')
+        target = model._meta.get_field(relation).related_model if relation else model
+        matching_ids = target.objects.annotate(
+            _search_vector=SearchVector(column, config=POSTGRES_SEARCH_CONFIG)
+        ).filter(_search_vector=query).values('pk')
+        return Q(**{f'{relation}__in' if relation else 'pk__in': matching_ids})
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.utils import timezone
-from .models import Author, Book
+from .models import Author, AuthorStat, Book, PublicationYearStat
 
 
 class BookSerializer(serializers.ModelSerializer):
@@ -95,6 +95,58 @@ class BookSerializer(serializers.ModelSerializer):
         return value
 
 
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that resolves ids from a dict in the serializer
+    context instead of querying once per value.
+
+    The context key is given by ``context_key`` and must map primary keys to
+    instances (as returned by QuerySet.in_bulk()).
+    """
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instance = self.context[self.context_key].get(pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+
+class BookBulkUpdateSerializer(BookSerializer):
+    """
+    Serializer for one item of a bulk PATCH on the book list.
+
+    Identical to BookSerializer except that authors are looked up in the
+    ``authors`` dict supplied through the context, so validating thousands
+    of items costs a single author query.
+    """
+    author = PrefetchedPrimaryKeyRelatedField(
+        context_key='authors',
+        queryset=Author.objects.all(),
+        help_text="The author of the book"
+    )
+
+
+class BookSyncSerializer(BookSerializer):
+    """
+    Serializer for books in the change feed (api.sync).
+
+    BookSerializer plus ``updated_at``, so mirrors can tell how fresh
+    each row is.
+    """
+    class Meta(BookSerializer.Meta):
+        fields = BookSerializer.Meta.fields + ['updated_at']
+        read_only_fields = fields
+
+
 class AuthorSerializer(serializers.ModelSerializer):
     """
     Serializer for the Author model.
@@ -181,3 +233,50 @@ class AuthorSerializer(serializers.ModelSerializer):
             - Output: 7
         """
         return obj.books.count()
+
+
+class PublicationYearStatSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the per-year book count summary.
+
+    Fields:
+        - publication_year: The year being counted
+        - book_count: Number of books published that year
+    """
+    class Meta:
+        model = PublicationYearStat
+        fields = ['publication_year', 'book_count']
+        read_only_fields = fields
+
+
+class AuthorStatSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the per-author book count summary.
+
+    Fields:
+        - author: The author's ID
+        - author_name: The author's name (read-only, sourced from author.name)
+        - book_count: Number of books by the author
+    """
+    author_name = serializers.CharField(source='author.name', read_only=True)
+
+    class Meta:
+        model = AuthorStat
+        fields = ['author', 'author_name', 'book_count']
+        read_only_fields = fields
+
+
+class AuthorSyncSerializer(serializers.ModelSerializer):
+    """
+    Serializer for authors in the change feed (api.sync).
+
+    Flat, unlike AuthorSerializer: books travel in their own feed, and a
+    book change does not touch its author's ``updated_at``.
+
+    Fields:
+        - id, name, created_at, updated_at
+    """
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'created_at', 'updated_at']
+        read_only_fields = fields
@@ -0,0 +1,66 @@
+"""
+Signal handlers keeping derived catalog data in sync with Book and Author.
+
+Connected in ApiConfig.ready().
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_generation_on_commit
+from .models import Author, Book, Tombstone
+from .stats import apply_book_move
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Invalidate cached catalog responses after any Book or Author write."""
+    bump_catalog_generation_on_commit()
+
+
+@receiver(pre_save, sender=Book)
+def snapshot_book_before_save(sender, instance, raw=False, **kwargs):
+    """
+    Record the stored author and year of a book that was not loaded through
+    the ORM (e.g. constructed with an explicit pk), so its move can be counted.
+    """
+    if raw or instance._state.adding or hasattr(instance, '_stats_snapshot'):
+        return
+    instance._stats_snapshot = (
+        Book.objects.filter(pk=instance.pk).values_list('author_id', 'publication_year').first()
+    )
+
+
+@receiver(post_save, sender=Book)
+def update_stats_on_book_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Count a new book, or move an edited one between summary rows when its
+    author or publication year changed.
+    """
+    if raw:
+        return
+    # Snapshot first: reading a deferred field below reloads it, which
+    # re-snapshots the (already saved) values.
+    previous = None if created else getattr(instance, '_stats_snapshot', None)
+    current = (instance.author_id, instance.publication_year)
+    if created or previous is not None:
+        apply_book_move(previous, current)
+    instance._stats_snapshot = current
+
+
+@receiver(post_delete, sender=Book)
+def update_stats_on_book_delete(sender, instance, **kwargs):
+    """Uncount a deleted book, using the values it was loaded with."""
+    previous = getattr(instance, '_stats_snapshot', None)
+    if previous is None:
+        previous = (instance.author_id, instance.publication_year)
+    apply_book_move(previous, None)
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+def record_tombstone(sender, instance, **kwargs):
+    """Record the deletion for the change feed (api.sync)."""
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
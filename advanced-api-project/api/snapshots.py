@@ -0,0 +1,288 @@
+"""
+Precomputed JSON snapshots of the public catalog.
+
+In snapshot mode the anonymous catalog responses that most clients request
+are rendered ahead of time into files under CATALOG_SNAPSHOT_ROOT:
+
+    - the first CATALOG_SNAPSHOT_LIST_PAGES pages of /api/books/ and
+      /api/authors/, following each page's ``next`` link, once per origin in
+      CATALOG_SNAPSHOT_ORIGINS (the links in list pages are absolute);
+    - /api/books/<id>/ for every book.
+
+CatalogSnapshotMiddleware serves a matching file with FileResponse before
+the session, authentication or any view runs, so a hit costs no database
+query; under a WSGI server with ``wsgi.file_wrapper`` the body is sent with
+sendfile(). Anything without a snapshot (other query strings, later pages,
+clients with credentials or asking for the browsable API) falls through to
+the view and its response cache.
+
+``manage.py build_catalog_snapshots`` renders everything, and
+``manage.py build_catalog_snapshots --changed`` brings the files up to date
+with the writes since its previous run: the detail files of the books saved,
+deleted, or whose author was saved are rewritten or removed, and the list
+pages are rendered again. Run it every few seconds from cron or as a worker
+(``--interval``); requests never render snapshots, so a write costs nothing
+extra and a snapshot lags its row by at most the refresh period.
+
+Changes are found through the change feed's columns (api.sync): Book and
+Author ``updated_at`` and the Tombstone rows of deletions. The time of the
+last refresh is kept in CURSOR_FILE under the root, and each run looks
+SYNC_SAFETY_LAG_SECONDS further back than that, for rows stamped before it
+by transactions that committed after it. Writes that do not stamp
+``updated_at`` (QuerySet.update(), raw SQL) need a full rebuild.
+
+List pages are rendered past the response cache (api.cache): its generation
+is only bumped by the signals of the process that wrote, and with a
+per-process cache the builder would otherwise store pages it served itself
+before the write.
+
+Configuration:
+
+    CATALOG_SNAPSHOT_ROOT = '/var/lib/catalog-snapshots'   # None disables
+    CATALOG_SNAPSHOT_ORIGINS = ['https://books.example.com']
+    CATALOG_SNAPSHOT_LIST_PAGES = 5
+    MIDDLEWARE = [..., 'api.snapshots.CatalogSnapshotMiddleware', ...]
+
+Files are written to a temporary name and renamed into place, so readers
+never see a partial file.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from django.conf import settings
+from django.http import FileResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from rest_framework.renderers import JSONRenderer
+
+from .models import Author, Book, Tombstone
+from .views import BookDetailView
+
+
+LIST_PATHS = ('/api/books/', '/api/authors/')
+DETAIL_PATH = re.compile(r'^/api/books/(?P<pk>\d+)/$')
+CURSOR_FILE = 'refreshed-at'
+
+
+def snapshot_root():
+    root = getattr(settings, 'CATALOG_SNAPSHOT_ROOT', None)
+    return Path(root) if root else None
+
+
+def origin_dir(root, origin):
+    return root / 'lists' / quote(origin.rstrip('/'), safe='')
+
+
+def list_snapshot_path(root, origin, path, query_string=''):
+    directory = origin_dir(root, origin) / path.strip('/')
+    if not query_string:
+        return directory / 'index.json'
+    return directory / f'q-{hashlib.sha1(query_string.encode("utf-8")).hexdigest()}.json'
+
+
+def detail_snapshot_path(root, pk):
+    return root / 'books' / f'{pk}.json'
+
+
+def write_atomic(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def render_view(origin, path, query_string=''):
+    """
+    Render an anonymous JSON GET of ``path`` through its view, bypassing the
+    catalog response cache.
+    """
+    parts = urlsplit(origin)
+    request = RequestFactory().get(
+        f'{path}?{query_string}' if query_string else path,
+        HTTP_HOST=parts.netloc, HTTP_ACCEPT='application/json',
+        secure=parts.scheme == 'https',
+    )
+    match = resolve(path)
+    view = match.func
+    view_class = getattr(view, 'view_class', None)
+    if getattr(view_class, 'catalog_cache', False):
+        view = view_class.as_view(**view.view_initkwargs, catalog_cache=False)
+    response = view(request, *match.args, **match.kwargs)
+    response.render()
+    return response
+
+
+def build_lists(root=None):
+    """Render the first list pages for every configured origin."""
+    root = root or snapshot_root()
+    pages = getattr(settings, 'CATALOG_SNAPSHOT_LIST_PAGES', 5)
+    for origin in getattr(settings, 'CATALOG_SNAPSHOT_ORIGINS', []):
+        for path in LIST_PATHS:
+            written = set()
+            query_string = ''
+            for _ in range(pages):
+                response = render_view(origin, path, query_string)
+                if response.status_code != 200:
+                    break
+                target = list_snapshot_path(root, origin, path, query_string)
+                write_atomic(target, response.content)
+                written.add(target)
+                next_link = response.data.get('next')
+                if not next_link:
+                    break
+                query_string = urlsplit(next_link).query
+            # Drop pages left over from a longer list.
+            directory = origin_dir(root, origin) / path.strip('/')
+            for stale in directory.glob('*.json'):
+                if stale not in written:
+                    stale.unlink(missing_ok=True)
+
+
+def build_book_details(root=None, ids=None, chunk_size=2000):
+    """
+    Write the detail snapshot of the given books (all books by default) and
+    remove those of books that no longer exist.
+
+    Serializes straight from one query instead of calling the view per
+    book; the bytes are the ones BookDetailView renders.
+    """
+    root = root or snapshot_root()
+    queryset = BookDetailView.queryset.order_by()
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    serializer_class = BookDetailView.serializer_class
+    renderer = JSONRenderer()
+    found = set()
+    for book in queryset.iterator(chunk_size=chunk_size):
+        write_atomic(detail_snapshot_path(root, book.pk), renderer.render(serializer_class(book).data))
+        found.add(book.pk)
+
+    if ids is not None:
+        missing = set(ids) - found
+    else:
+        existing = {int(path.stem) for path in (root / 'books').glob('*.json')}
+        missing = existing - found
+    for pk in missing:
+        detail_snapshot_path(root, pk).unlink(missing_ok=True)
+    return len(found)
+
+
+def read_cursor(root):
+    """Return when the snapshots under ``root`` were last refreshed, or None."""
+    try:
+        return parse_datetime((root / CURSOR_FILE).read_text().strip())
+    except FileNotFoundError:
+        return None
+
+
+def build_all(root=None, lists_only=False):
+    """
+    Render every snapshot and record the refresh. Returns the number of book
+    snapshots written.
+    """
+    root = root or snapshot_root()
+    # Taken before reading, so writes during the build are picked up again.
+    started = timezone.now()
+    build_lists(root)
+    count = 0 if lists_only else build_book_details(root)
+    write_atomic(root / CURSOR_FILE, started.isoformat().encode())
+    return count
+
+
+def changed_book_ids(since):
+    """
+    Return the ids of the books saved or deleted at or after ``since``, or
+    whose author was saved, and whether any book or author changed at all.
+    """
+    authors = Author.objects.filter(updated_at__gte=since).values_list('pk', flat=True)
+    ids = set(Book.objects.filter(updated_at__gte=since).values_list('pk', flat=True))
+    ids.update(Book.objects.filter(author__in=list(authors)).values_list('pk', flat=True))
+    deleted = Tombstone.objects.filter(deleted_at__gte=since).values_list('model', 'object_id')
+    changed = bool(ids or authors)
+    for model, object_id in deleted:
+        changed = True
+        if model == 'book':
+            ids.add(object_id)
+    return ids, changed
+
+
+def refresh_changed(root=None):
+    """
+    Bring the snapshots up to date with the writes since the last refresh.
+
+    Falls back to build_all() when there is no cursor, or when it is older
+    than the tombstones still kept. Returns the number of book snapshots
+    rewritten or removed.
+    """
+    root = root or snapshot_root()
+    started = timezone.now()
+    since = read_cursor(root)
+    retention = timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    if since is None or since < started - retention:
+        return build_all(root)
+
+    since -= timedelta(seconds=getattr(settings, 'SYNC_SAFETY_LAG_SECONDS', 5))
+    ids, changed = changed_book_ids(since)
+    if ids:
+        build_book_details(root, ids=ids)
+    if changed:
+        build_lists(root)
+    write_atomic(root / CURSOR_FILE, started.isoformat().encode())
+    return len(ids)
+
+
+class CatalogSnapshotMiddleware:
+    """
+    Serve anonymous catalog GETs from CATALOG_SNAPSHOT_ROOT when a snapshot
+    exists. Place it after SecurityMiddleware and before SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.root = snapshot_root()
+
+    def __call__(self, request):
+        if self.root is not None and self.is_anonymous_json_get(request):
+            path = self.snapshot_path(request)
+            if path is not None:
+                try:
+                    file = open(path, 'rb')
+                except FileNotFoundError:
+                    pass
+                else:
+                    response = FileResponse(file, content_type='application/json')
+                    response['X-Catalog-Snapshot'] = 'HIT'
+                    patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+                    return response
+        return self.get_response(request)
+
+    def is_anonymous_json_get(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and 'text/html' not in request.META.get('HTTP_ACCEPT', '')
+        )
+
+    def snapshot_path(self, request):
+        query_string = request.META.get('QUERY_STRING', '')
+        if request.path in LIST_PATHS:
+            origin = f'{request.scheme}://{request.get_host()}'
+            return list_snapshot_path(self.root, origin, request.path, query_string)
+        match = DETAIL_PATH.match(request.path)
+        if match and not query_string:
+            return detail_snapshot_path(self.root, int(match['pk']))
+        return None
@@ -0,0 +1,14 @@
+'use strict';
+{
+    // Changelist filters rendered by api.admin.AutocompleteFilter: reload the
+    // changelist with the picked object, or without the filter when cleared.
+    const $ = django.jQuery;
+
+    $(document).on('change', 'select.admin-autocomplete-filter', function() {
+        const url = new URL(this.dataset.clearUrl, window.location.href);
+        if (this.value) {
+            url.searchParams.set(this.dataset.lookupKwarg, this.value);
+        }
+        window.location.href = url.href;
+    });
+}
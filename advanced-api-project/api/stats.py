@@ -0,0 +1,91 @@
+"""
+Incremental maintenance of the catalog summary tables.
+
+PublicationYearStat and AuthorStat hold per-year and per-author book counts.
+The Book signal handlers call apply_book_move() with the (author, year) a book
+left and the one it joined, and the counts are adjusted with F() expressions,
+so concurrent writers never overwrite each other's increments.
+
+Writes that bypass signals (bulk_create, bulk_update, raw SQL) must call
+apply_book_move() themselves or be followed by rebuild_catalog_stats().
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import AuthorStat, Book, PublicationYearStat
+
+
+def _increment(model, lookup, delta):
+    if not delta:
+        return
+    if delta < 0:
+        # Never below zero, even when the row has drifted (e.g. after a
+        # QuerySet.update()); rebuild_catalog_stats() repairs drift.
+        model.objects.filter(book_count__gte=-delta, **lookup).update(book_count=F('book_count') + delta)
+        return
+    if model.objects.filter(**lookup).update(book_count=F('book_count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(book_count=delta, **lookup)
+    except IntegrityError:
+        # Another writer created the row between our UPDATE and INSERT.
+        model.objects.filter(**lookup).update(book_count=F('book_count') + delta)
+
+
+def apply_book_moves(moves):
+    """
+    Apply a batch of book moves to the summary tables.
+
+    ``moves`` is an iterable of (old, new) pairs where each side is an
+    (author_id, publication_year) tuple, or None for a created or deleted
+    book. Deltas are aggregated first, so a batch touching thousands of books
+    issues one UPDATE per distinct author and year.
+    """
+    author_deltas = Counter()
+    year_deltas = Counter()
+    for old, new in moves:
+        if old == new:
+            continue
+        if old is not None:
+            author_deltas[old[0]] -= 1
+            year_deltas[old[1]] -= 1
+        if new is not None:
+            author_deltas[new[0]] += 1
+            year_deltas[new[1]] += 1
+
+    with transaction.atomic():
+        for author_id, delta in sorted(author_deltas.items()):
+            _increment(AuthorStat, {'author_id': author_id}, delta)
+        for year, delta in sorted(year_deltas.items()):
+            _increment(PublicationYearStat, {'publication_year': year}, delta)
+
+
+def apply_book_move(old, new):
+    """Apply a single book move. See apply_book_moves()."""
+    apply_book_moves([(old, new)])
+
+
+def rebuild_catalog_stats(using='default'):
+    """
+    Recompute both summary tables from api_book.
+
+    Runs one GROUP BY per table inside a transaction, so readers see either
+    the old or the new counts.
+    """
+    with transaction.atomic(using=using):
+        PublicationYearStat.objects.using(using).all().delete()
+        AuthorStat.objects.using(using).all().delete()
+
+        PublicationYearStat.objects.using(using).bulk_create([
+            PublicationYearStat(publication_year=row['publication_year'], book_count=row['total'])
+            for row in Book.objects.using(using).order_by().values('publication_year')
+            .annotate(total=Count('id'))
+        ], batch_size=1000)
+        AuthorStat.objects.using(using).bulk_create([
+            AuthorStat(author_id=row['author_id'], book_count=row['total'])
+            for row in Book.objects.using(using).order_by().values('author_id')
+            .annotate(total=Count('id'))
+        ], batch_size=1000)
@@ -0,0 +1,166 @@
+"""
+Incremental change feed for the catalog (``/api/books/sync/``,
+``/api/authors/sync/``).
+
+A mirror starts with a plain GET and then repeats the request with the
+``cursor`` from the previous response as ``?updated_since=``:
+
+    GET /api/books/sync/
+    GET /api/books/sync/?updated_since=eyJ1Ijpb...
+
+Each response lists the rows changed and the ids deleted since the cursor,
+oldest first:
+
+    {
+        "results": [...],           # created or updated rows, upsert these
+        "deleted": [12, 40],        # ids deleted, apply after the upserts
+        "cursor": "eyJ1Ijpb...",    # pass as ?updated_since= next time
+        "has_more": false           # true: call again straight away
+    }
+
+Changes are read in (updated_at, id) order and deletions in
+(deleted_at, id) order from Tombstone, both through an index, and the cursor
+records the position reached in each. Cursors only move forward.
+
+Rows written in the last SYNC_SAFETY_LAG_SECONDS are held back until the
+next call. ``updated_at`` is stamped when a row is saved, not when its
+transaction commits, so a row saved by a transaction still in flight can
+appear later with an older timestamp than rows already handed out; the lag
+keeps the cursor behind every such transaction. It must exceed the longest
+transaction writing books or authors.
+
+Deletions are kept for SYNC_TOMBSTONE_RETENTION_DAYS (see
+``manage.py prune_tombstones``). A cursor whose deletion position is older
+is answered with 410 Gone, and the mirror has to resynchronise from
+scratch. Only that position can expire: rows are never pruned, so an
+initial sync may page through rows of any age.
+
+The feed always reads from ``default``: a lagging replica could let the
+cursor pass rows it has not received yet.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework import generics, status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import _positive_int
+from rest_framework.response import Response
+
+from .models import Tombstone
+from .pagination import KeysetPagination
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = _('The cursor is older than the deletion log; resynchronise from scratch.')
+    default_code = 'cursor_expired'
+
+
+class ChangeFeedView(generics.GenericAPIView):
+    """
+    Read-only change feed over ``queryset`` and its Tombstone rows.
+
+    The serializer should include ``updated_at`` so mirrors can tell how
+    fresh each row is.
+
+    Attributes:
+        - cursor_query_param: Query parameter carrying the cursor
+        - limit_query_param: Query parameter overriding default_limit
+        - default_limit / max_limit: Rows (and deletions) per response
+    """
+    cursor_query_param = 'updated_since'
+    limit_query_param = 'limit'
+    default_limit = 500
+    max_limit = 5000
+    pagination_class = None
+    filter_backends = []
+    invalid_cursor_message = _('Invalid cursor')
+
+    def get(self, request, *args, **kwargs):
+        limit = self.get_limit(request)
+        now = timezone.now()
+        horizon = now - timedelta(seconds=getattr(settings, 'SYNC_SAFETY_LAG_SECONDS', 5))
+        cursor = self.decode_cursor(request)
+        if cursor:
+            retention = timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+            if cursor['d'][0] < now - retention:
+                raise CursorExpired()
+
+        queryset = self.get_queryset()
+        changed, changed_position = self.read_stream(
+            queryset, 'updated_at', cursor and cursor['u'], horizon, limit
+        )
+        tombstones = Tombstone.objects.filter(model=queryset.model._meta.model_name)
+        deleted, deleted_position = self.read_stream(
+            tombstones, 'deleted_at', cursor and cursor['d'], horizon, limit
+        )
+
+        return Response({
+            'results': self.get_serializer(changed, many=True).data,
+            'deleted': [tombstone.object_id for tombstone in deleted],
+            'cursor': self.encode_cursor({'u': changed_position, 'd': deleted_position}),
+            'has_more': len(changed) == limit or len(deleted) == limit,
+        })
+
+    def read_stream(self, queryset, timestamp_field, position, horizon, limit):
+        """
+        Return up to ``limit`` rows after ``position`` and no later than
+        ``horizon`` in (timestamp, id) order, with the position after them.
+
+        A position with no id means everything up to its timestamp was read.
+        Once a stream is caught up its position moves to the horizon, so idle
+        streams do not age towards expiry.
+        """
+        if position is None:
+            pass
+        elif position[1] is None:
+            queryset = queryset.filter(**{f'{timestamp_field}__gt': position[0]})
+        else:
+            ordering = [(timestamp_field, False), ('id', False)]
+            queryset = queryset.filter(
+                KeysetPagination().build_keyset_filter(queryset.model, ordering, position)
+            )
+        rows = list(
+            queryset.filter(**{f'{timestamp_field}__lte': horizon})
+            .order_by(timestamp_field, 'id')[:limit]
+        )
+        if len(rows) == limit:
+            return rows, [getattr(rows[-1], timestamp_field), rows[-1].pk]
+        return rows, [horizon, None]
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param], strict=True, cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            return {key: self._decode_position(cursor[key]) for key in ('u', 'd')}
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _decode_position(self, position):
+        timestamp, pk = position
+        timestamp = parse_datetime(timestamp)
+        if timestamp is None or timezone.is_naive(timestamp):
+            raise ValueError(position)
+        if pk is not None and (isinstance(pk, bool) or not isinstance(pk, int)):
+            raise ValueError(position)
+        return [timestamp, pk]
+
+    def encode_cursor(self, cursor):
+        cursor = {key: [timestamp.isoformat(), pk] for key, (timestamp, pk) in cursor.items()}
+        encoded = urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode('utf-8'))
+        return encoded.decode('ascii')
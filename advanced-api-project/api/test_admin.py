@@ -0,0 +1,164 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from .models import Author, Book
+from .pagination import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """
+    Test cases for EstimatedCountPaginator.
+
+    Covers exact counts below the limit and estimates above it, for
+    unfiltered and filtered querysets.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - One author with 30 books, ten per publication year
+        """
+        author = Author.objects.create(name='Prolific Author')
+        Book.objects.bulk_create([
+            Book(title=f'Book {i}', publication_year=2000 + i % 3, author=author)
+            for i in range(30)
+        ])
+
+    def test_exact_count_below_limit(self):
+        """
+        Verifies:
+        - Counts up to the limit are exact and not flagged as estimates
+        """
+        paginator = EstimatedCountPaginator(Book.objects.all(), 10, exact_count_limit=30)
+        self.assertEqual(paginator.count, 30)
+        self.assertFalse(paginator.count_is_estimate)
+
+    def test_unfiltered_count_above_limit_is_estimated(self):
+        """
+        Verifies:
+        - An unfiltered queryset past the limit reports the table size
+        - The count is flagged as an estimate
+        """
+        paginator = EstimatedCountPaginator(Book.objects.all(), 10, exact_count_limit=5)
+        self.assertGreaterEqual(paginator.count, 30)
+        self.assertTrue(paginator.count_is_estimate)
+        self.assertEqual(len(paginator.page(3).object_list), 10)
+
+    def test_filtered_count_is_bounded(self):
+        """
+        Verifies:
+        - A filtered count never reports less than the rows it has seen
+        - The count query reads at most limit + 1 rows
+        """
+        queryset = Book.objects.filter(publication_year=2000)
+        paginator = EstimatedCountPaginator(queryset, 5, exact_count_limit=5)
+        with CaptureQueriesContext(connection) as queries:
+            count = paginator.count
+        self.assertGreaterEqual(count, 6)
+        self.assertTrue(paginator.count_is_estimate)
+        self.assertIn('LIMIT 6', queries.captured_queries[0]['sql'])
+
+
+class CatalogAdminTestCase(TestCase):
+    """
+    Test cases for the Book and Author admin changelists.
+
+    Covers the autocomplete author filter, the stats-backed publication
+    year filter, full-text search and a query count that does not grow with
+    the number of rows or authors.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - A superuser logged into the test client
+        - Two named authors with one book each
+        - 20 filler authors with one book each
+        """
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.user)
+        self.rowling = Author.objects.create(name='J.K. Rowling')
+        self.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        Book.objects.create(title='Harry Potter', publication_year=1997, author=self.rowling)
+        Book.objects.create(title='The Hobbit', publication_year=1937, author=self.tolkien)
+        for i in range(20):
+            author = Author.objects.create(name=f'Filler Author {i}')
+            Book.objects.create(title=f'Filler {i}', publication_year=2001, author=author)
+
+    def test_book_changelist_does_not_list_authors(self):
+        """
+        Verifies:
+        - The changelist renders
+        - The author filter is an autocomplete box, not a link per author
+        - Publication years come from the statistics table
+        """
+        response = self.client.get('/admin/api/book/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'admin-autocomplete-filter')
+        self.assertNotContains(response, 'author__id__exact=')
+        self.assertContains(response, '?publication_year=1937')
+
+    def test_book_changelist_query_count_is_constant(self):
+        """
+        Verifies:
+        - Adding books and authors does not add changelist queries
+        """
+        with CaptureQueriesContext(connection) as before:
+            self.client.get('/admin/api/book/')
+        for i in range(20):
+            author = Author.objects.create(name=f'Extra Author {i}')
+            Book.objects.create(title=f'Extra {i}', publication_year=2002 + i, author=author)
+        with CaptureQueriesContext(connection) as after:
+            self.client.get('/admin/api/book/')
+        self.assertEqual(len(after), len(before))
+
+    def test_author_filter_renders_only_selected_author(self):
+        """
+        Verifies:
+        - Filtering by author restricts the changelist
+        - The selected author is the only option rendered
+        """
+        response = self.client.get(f'/admin/api/book/?author__id__exact={self.rowling.pk}')
+        self.assertContains(response, 'Harry Potter')
+        self.assertNotContains(response, 'The Hobbit')
+        self.assertContains(response, f'<option value="{self.rowling.pk}" selected>J.K. Rowling</option>', html=True)
+        self.assertNotContains(response, 'Filler Author')
+
+    def test_invalid_author_filter(self):
+        """
+        Verifies:
+        - A malformed author id is reported like any invalid lookup
+        """
+        response = self.client.get('/admin/api/book/?author__id__exact=abc')
+        self.assertRedirects(response, '/admin/api/book/?e=1')
+
+    def test_search_uses_full_text_index(self):
+        """
+        Verifies:
+        - Admin search matches word prefixes across title and author name
+        - Matching is prefix based, like the API search
+        """
+        response = self.client.get('/admin/api/book/?q=pott')
+        self.assertContains(response, 'Harry Potter')
+        self.assertNotContains(response, 'The Hobbit')
+        response = self.client.get('/admin/api/book/?q=tolk')
+        self.assertContains(response, 'The Hobbit')
+        response = self.client.get('/admin/api/book/?q=otter')
+        self.assertNotContains(response, 'Harry Potter')
+
+    def test_author_autocomplete(self):
+        """
+        Verifies:
+        - The autocomplete endpoint behind the filter searches authors
+        """
+        response = self.client.get('/admin/autocomplete/', {
+            'app_label': 'api', 'model_name': 'book', 'field_name': 'author', 'term': 'rowl',
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results, [{'id': str(self.rowling.pk), 'text': 'J.K. Rowling'}])
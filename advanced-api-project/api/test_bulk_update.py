@@ -0,0 +1,240 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, AuthorStat, Book, PublicationYearStat
+
+
+class BookBulkUpdateTestCase(TestCase):
+    """
+    Test cases for list-level PATCH on BookListView.
+
+    Covers per-item results, partial success, updated_at semantics, the
+    statistics and cache side effects, and the query count of large batches.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - An authenticated client
+        - Two authors
+        - 20 books by the first author, all published in 1950
+        """
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='editor', password='pass12345')
+        self.client.force_authenticate(user=self.user)
+        self.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        self.lewis = Author.objects.create(name='C.S. Lewis')
+        self.books = [
+            Book.objects.create(title=f'Book {i}', publication_year=1950, author=self.tolkien)
+            for i in range(20)
+        ]
+
+    def test_bulk_patch_updates_books(self):
+        """
+        Verifies:
+        - Every listed book receives its own partial update
+        - Fields not mentioned are left alone
+        - updated_at is bumped on changed books only
+        """
+        first, second, untouched = self.books[:3]
+        before = {book.pk: book.updated_at for book in (first, second, untouched)}
+        response = self.client.patch('/api/books/', [
+            {'id': first.pk, 'publication_year': 1954},
+            {'id': second.pk, 'title': 'The Two Towers', 'author': self.lewis.pk},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']], ['updated', 'updated']
+        )
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertEqual((first.title, first.publication_year), ('Book 0', 1954))
+        self.assertEqual((second.title, second.author_id), ('The Two Towers', self.lewis.pk))
+        self.assertGreater(first.updated_at, before[first.pk])
+        self.assertGreater(second.updated_at, before[second.pk])
+        self.assertEqual(untouched.updated_at, before[untouched.pk])
+
+    def test_invalid_items_are_reported_and_skipped(self):
+        """
+        Verifies:
+        - Invalid, missing and duplicate items are reported per item
+        - Valid items in the same batch are still applied
+        """
+        book = self.books[0]
+        response = self.client.patch('/api/books/', [
+            {'id': book.pk, 'title': 'Renamed'},
+            {'id': self.books[1].pk, 'publication_year': 3000},
+            {'id': self.books[2].pk, 'author': 999999},
+            {'id': 999999, 'title': 'Ghost'},
+            {'id': book.pk, 'title': 'Again'},
+            {'title': 'No id'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['updated', 'invalid', 'invalid', 'not_found', 'invalid', 'invalid'],
+        )
+        self.assertIn('publication_year', response.data['results'][1]['errors'])
+        self.assertIn('author', response.data['results'][2]['errors'])
+        self.assertEqual((response.data['updated'], response.data['failed']), (1, 5))
+        book.refresh_from_db()
+        self.assertEqual(book.title, 'Renamed')
+        self.assertEqual(Book.objects.get(pk=self.books[1].pk).publication_year, 1950)
+
+    def test_rejects_malformed_payloads(self):
+        """
+        Verifies:
+        - Non-list and empty payloads return 400
+        - Anonymous clients cannot bulk update
+        """
+        self.assertEqual(
+            self.client.patch('/api/books/', {'id': 1}, format='json').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.patch('/api/books/', [], format='json').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        anonymous = APIClient()
+        response = anonymous.patch('/api/books/', [{'id': self.books[0].pk}], format='json')
+        self.assertIn(
+            response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+        )
+
+    def test_only_the_list_endpoint_bulk_updates(self):
+        """
+        Verifies:
+        - The create endpoint, which shares the list view's code, refuses
+          PATCH instead of applying a bulk update
+        """
+        response = self.client.patch(
+            '/api/books/create/', [{'id': self.books[0].pk, 'title': 'Changed'}], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.books[0].refresh_from_db()
+        self.assertNotEqual(self.books[0].title, 'Changed')
+
+    def test_statistics_follow_bulk_updates(self):
+        """
+        Verifies:
+        - Moving books between authors and years updates the summary tables
+          even though bulk_update sends no signals
+        """
+        self.client.patch('/api/books/', [
+            {'id': book.pk, 'author': self.lewis.pk, 'publication_year': 1956}
+            for book in self.books[:5]
+        ], format='json')
+        self.assertEqual(AuthorStat.objects.get(author=self.tolkien).book_count, 15)
+        self.assertEqual(AuthorStat.objects.get(author=self.lewis).book_count, 5)
+        self.assertEqual(PublicationYearStat.objects.get(publication_year=1950).book_count, 15)
+        self.assertEqual(PublicationYearStat.objects.get(publication_year=1956).book_count, 5)
+
+    def test_cached_list_is_invalidated(self):
+        """
+        Verifies:
+        - Anonymous readers see bulk updated titles straight away
+        """
+        anonymous = APIClient()
+        anonymous.get('/api/books/?search=book')
+        self.client.patch('/api/books/', [
+            {'id': book.pk, 'title': f'Volume {book.pk}'} for book in self.books
+        ], format='json')
+        response = anonymous.get('/api/books/?search=book')
+        self.assertEqual(response.data['results'], [])
+
+    def test_query_count_does_not_grow_with_batch(self):
+        """
+        Verifies:
+        - Locking, validation and author lookups do not issue a query per item
+        """
+        def patch(books):
+            payload = [{'id': book.pk, 'author': self.lewis.pk} for book in books]
+            with CaptureQueriesContext(connection) as queries:
+                self.client.patch('/api/books/', payload, format='json')
+            return len(queries)
+
+        patch(self.books[:1])  # creates the AuthorStat row for the new author
+        self.assertEqual(patch(self.books[1:3]), patch(self.books[3:20]))
+
+
+class BulkLookupTestCase(TestCase):
+    """
+    Test cases for ?ids= batch lookups on BookListView and AuthorListView.
+
+    Covers input order, missing and duplicate ids, invalid input and the
+    query count.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - An anonymous client
+        - Two authors with five books each
+        """
+        self.client = APIClient()
+        self.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        self.lewis = Author.objects.create(name='C.S. Lewis')
+        self.books = [
+            Book.objects.create(title=f'Book {i}', publication_year=1950 + i, author=author)
+            for author in (self.tolkien, self.lewis)
+            for i in range(5)
+        ]
+
+    def test_books_in_input_order(self):
+        """
+        Verifies:
+        - Books come back in the order of the ids, not the list ordering
+        - Missing ids are reported in input order
+        - Duplicate ids are returned once
+        """
+        ids = [self.books[7].pk, 9999, self.books[0].pk, self.books[3].pk, self.books[0].pk, 8888]
+        response = self.client.get('/api/books/', {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book['id'] for book in response.data['results']],
+            [self.books[7].pk, self.books[0].pk, self.books[3].pk]
+        )
+        self.assertEqual(response.data['results'][0]['author_name'], 'C.S. Lewis')
+        self.assertEqual(response.data['missing'], [9999, 8888])
+
+    def test_lookup_is_a_single_query(self):
+        """
+        Verifies:
+        - Books and their authors are fetched in one query
+        - Authors and their books in two (author rows plus one prefetch)
+        """
+        ids = ','.join(str(book.pk) for book in self.books)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/books/', {'ids': ids})
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(queries), 1)
+
+        ids = f'{self.lewis.pk},{self.tolkien.pk}'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/authors/', {'ids': ids})
+        self.assertEqual([author['name'] for author in response.data['results']], ['C.S. Lewis', 'J.R.R. Tolkien'])
+        self.assertEqual(response.data['results'][0]['books_count'], 5)
+        self.assertEqual(len(queries), 2)
+
+    def test_invalid_ids(self):
+        """
+        Verifies:
+        - Non-integer ids and oversized batches are rejected with 400
+        - A blank ?ids= falls back to the normal list
+        """
+        response = self.client.get('/api/books/', {'ids': '1,abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/books/', {'ids': ','.join(['1'] * 5001)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/books/', {'ids': ''})
+        self.assertIn('next', response.data)
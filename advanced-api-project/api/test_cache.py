@@ -0,0 +1,126 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, Book
+
+
+class CatalogCacheTestCase(TestCase):
+    """
+    Test cases for the anonymous catalog response cache.
+
+    Covers cache hits, query normalization, invalidation on writes,
+    authenticated bypass and the stats endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - A regular user and an admin user
+        - One author with one book
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='reader', password='testpass123')
+        self.admin = User.objects.create_superuser(
+            username='ops', password='testpass123', email='ops@example.com'
+        )
+        self.author = Author.objects.create(name='Octavia E. Butler')
+        self.book = Book.objects.create(title='Kindred', publication_year=1979, author=self.author)
+
+    def test_second_anonymous_request_is_a_hit(self):
+        """
+        Verifies:
+        - The first request misses and the second hits without any query
+        """
+        first = self.client.get('/api/books/')
+        self.assertEqual(first['X-Catalog-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/books/')
+        self.assertEqual(second['X-Catalog-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_equivalent_queries_share_an_entry(self):
+        """
+        Verifies:
+        - Parameter order, blank values and default values do not
+          fragment the cache
+        """
+        self.client.get(f'/api/books/?publication_year=1979&author={self.author.id}')
+        response = self.client.get(
+            f'/api/books/?author={self.author.id}&title=&ordering=-publication_year,title'
+            '&publication_year=1979'
+        )
+        self.assertEqual(response['X-Catalog-Cache'], 'HIT')
+
+        response = self.client.get('/api/authors/?page=1')
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+        response = self.client.get('/api/authors/')
+        self.assertEqual(response['X-Catalog-Cache'], 'HIT')
+
+    def test_schemes_do_not_share_entries(self):
+        """
+        Verifies:
+        - An https client is not served the absolute http links of an
+          entry filled over http
+        """
+        self.client.get('/api/authors/?page_size=1')
+        response = self.client.get('/api/authors/?page_size=1', secure=True)
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+
+    def test_writes_invalidate_books_and_authors(self):
+        """
+        Verifies:
+        - Saving a book invalidates both list endpoints
+        - Deleting a book invalidates the cache
+        """
+        self.client.get('/api/books/')
+        self.client.get('/api/authors/')
+
+        self.book.title = 'Kindred (Anniversary Edition)'
+        self.book.save()
+        response = self.client.get('/api/books/')
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Kindred (Anniversary Edition)')
+        response = self.client.get('/api/authors/')
+        self.assertEqual(response.data['results'][0]['books'][0]['title'],
+                         'Kindred (Anniversary Edition)')
+
+        self.book.delete()
+        response = self.client.get('/api/books/')
+        self.assertEqual(response.data['results'], [])
+
+    def test_authenticated_requests_bypass_cache(self):
+        """
+        Verifies:
+        - Authenticated clients read from the database after their own writes
+        """
+        self.client.get('/api/books/')
+        self.client.force_authenticate(user=self.user)
+        self.client.post('/api/books/', {
+            'title': 'Parable of the Sower', 'publication_year': 1993, 'author': self.author.id
+        })
+        response = self.client.get('/api/books/')
+        self.assertEqual(response['X-Catalog-Cache'], 'BYPASS')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_stats_endpoint(self):
+        """
+        Verifies:
+        - Stats are restricted to admin users
+        - Hits, misses and the hit ratio are reported
+        """
+        self.client.get('/api/books/')
+        self.client.get('/api/books/')
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['hits'], 1)
+        self.assertEqual(response.data['misses'], 1)
+        self.assertEqual(response.data['hit_ratio'], 0.5)
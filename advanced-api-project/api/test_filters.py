@@ -0,0 +1,119 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from .filters import BookFilter, prefix_successor
+from .models import Author, Book
+from .views import BookListView
+
+
+class BookFilterTestCase(TestCase):
+    """
+    Test cases for BookFilter on BookListView.
+
+    Covers publication_year ranges, author and year combinations, title
+    prefixes, and (on SQLite) that each filter is answered from an index.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - An anonymous client
+        - Two authors with books published between 1985 and 2005
+        """
+        self.client = APIClient()
+        self.king = Author.objects.create(name='Stephen King')
+        self.pratchett = Author.objects.create(name='Terry Pratchett')
+        for year in range(1985, 2006, 5):
+            Book.objects.create(title=f'King {year}', publication_year=year, author=self.king)
+            Book.objects.create(title=f'Discworld {year}', publication_year=year, author=self.pratchett)
+        Book.objects.create(title='The Colour of Magic', publication_year=1983, author=self.pratchett)
+        Book.objects.create(title='The Light Fantastic', publication_year=1986, author=self.pratchett)
+        Book.objects.create(title='Thief of Time', publication_year=2001, author=self.pratchett)
+
+    def titles(self, params):
+        response = self.client.get('/api/books/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(book['title'] for book in response.data['results'])
+
+    def explain(self, query):
+        queryset = BookFilter(QueryDict(query), queryset=BookListView.queryset).qs
+        return queryset.order_by(*BookListView.ordering).explain()
+
+    def test_year_bounds(self):
+        """
+        Verifies:
+        - publication_year__gte and __lte are inclusive
+        - publication_year__range takes an inclusive "start,end" pair
+        """
+        self.assertEqual(
+            self.titles({'publication_year__gte': 2001, 'publication_year__lte': 2005}),
+            ['Discworld 2005', 'King 2005', 'Thief of Time']
+        )
+        self.assertEqual(
+            self.titles({'publication_year__range': '1983,1985'}),
+            ['Discworld 1985', 'King 1985', 'The Colour of Magic']
+        )
+
+    def test_author_and_year_range(self):
+        """
+        Verifies:
+        - Author and year range filters combine
+        - A malformed range is rejected
+        """
+        self.assertEqual(
+            self.titles({'author': self.king.pk, 'publication_year__range': '1990,2000'}),
+            ['King 1990', 'King 1995', 'King 2000']
+        )
+        response = self.client.get('/api/books/', {'publication_year__range': '1990'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_title_prefix(self):
+        """
+        Verifies:
+        - title__startswith matches prefixes only, case sensitively
+        - The range is rechecked with LIKE, for collations where a range is
+          not a prefix match
+        - Exact title matches still work
+        """
+        self.assertEqual(self.titles({'title__startswith': 'The '}), ['The Colour of Magic', 'The Light Fantastic'])
+        self.assertEqual(self.titles({'title__startswith': 'Th'}), ['The Colour of Magic', 'The Light Fantastic', 'Thief of Time'])
+        self.assertEqual(self.titles({'title__startswith': 'th'}), [])
+        self.assertEqual(self.titles({'title': 'Thief of Time'}), ['Thief of Time'])
+        sql = str(BookFilter(QueryDict('title__startswith=Th'), queryset=Book.objects.all()).qs.query)
+        self.assertIn('"api_book"."title" >= Th', sql)
+        self.assertIn('"api_book"."title" LIKE Th%', sql)
+
+    def test_prefix_successor(self):
+        """
+        Verifies:
+        - The successor is the prefix with its last character incremented
+        - Trailing maximal characters are dropped
+        - Surrogate code points are skipped
+        """
+        self.assertEqual(prefix_successor('abc'), 'abd')
+        self.assertEqual(prefix_successor('ab\U0010ffff'), 'ac')
+        self.assertEqual(prefix_successor('a\ud7ff'), 'a\ue000')
+        self.assertIsNone(prefix_successor('\U0010ffff'))
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+    def test_filters_use_indexes(self):
+        """
+        Verifies (EXPLAIN QUERY PLAN, with the list view's ordering):
+        - Author plus year range seeks the (author, publication_year) index
+        - A year range alone seeks the (-publication_year, title, id) index,
+          which also gives the view's default ordering
+        - A title prefix seeks the title index instead of scanning with LIKE
+        """
+        plan = self.explain('author=1&publication_year__range=1990,2000')
+        self.assertIn('USING INDEX api_book_author__e0f153_idx (author_id=? AND publication_year>? AND publication_year<?)', plan)
+        plan = self.explain('publication_year__gte=1990&publication_year__lte=2000')
+        self.assertIn('USING INDEX api_book_publica_b3e136_idx (publication_year>? AND publication_year<?)', plan)
+        plan = self.explain('title__startswith=The')
+        self.assertIn('USING INDEX api_book_title_dc9757_idx (title>? AND title<?)', plan)
+        self.assertNotIn('SCAN api_book', plan)
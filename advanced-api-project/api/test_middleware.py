@@ -0,0 +1,110 @@
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+from dbkit.instrumentation import SQLInstrumentationMiddleware, fingerprint
+from .models import Author, Book
+
+
+class SQLInstrumentationMiddlewareTestCase(TestCase):
+    """
+    Test cases for SQLInstrumentationMiddleware.
+
+    Covers query fingerprinting, the Server-Timing header, N+1 detection,
+    sampling, and the absence of N+1 patterns in the catalog endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - Six authors with two books each
+        """
+        self.factory = RequestFactory()
+        for i in range(6):
+            author = Author.objects.create(name=f'Author {i}')
+            Book.objects.create(title=f'First {i}', publication_year=2000, author=author)
+            Book.objects.create(title=f'Second {i}', publication_year=2001, author=author)
+
+    def run_middleware(self, view):
+        return SQLInstrumentationMiddleware(view)(self.factory.get('/probe/'))
+
+    def test_fingerprint_groups_statements_by_shape(self):
+        """
+        Verifies:
+        - IN lists of different lengths share a fingerprint
+        - Literal numbers and strings are replaced
+        """
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s,  %s, %s, %s)'),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE name = 'a' LIMIT 21"),
+            "SELECT * FROM t WHERE name = ? LIMIT ?",
+        )
+
+    def test_server_timing_header(self):
+        """
+        Verifies:
+        - The header reports database time and the query count
+        """
+        def view(request):
+            list(Author.objects.all())
+            list(Book.objects.all())
+            return HttpResponse('ok')
+
+        response = self.run_middleware(view)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.assertIn('app;dur=', response['Server-Timing'])
+
+    def test_n_plus_one_is_logged(self):
+        """
+        Verifies:
+        - A statement repeated per row is reported once, with its count
+        - The log line is JSON and logged at WARNING
+        """
+        def view(request):
+            for author in Author.objects.all():
+                list(author.books.all())
+            return HttpResponse('ok')
+
+        with self.assertLogs('dbkit.sql', level='WARNING') as logs:
+            response = self.run_middleware(view)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['queries'], 7)
+        self.assertEqual(len(record['n_plus_one']), 1)
+        self.assertEqual(record['n_plus_one'][0]['count'], 6)
+        self.assertIn('api_book', record['n_plus_one'][0]['sql'])
+        self.assertIn('n-plus-one', response['Server-Timing'])
+
+    @override_settings(SQL_INSTRUMENTATION={'SAMPLE_RATE': 0})
+    def test_unsampled_requests_are_untouched(self):
+        """
+        Verifies:
+        - With sampling disabled no header is added and nothing is logged
+        """
+        def view(request):
+            list(Author.objects.all())
+            return HttpResponse('ok')
+
+        with self.assertNoLogs('dbkit.sql', level='INFO'):
+            response = self.run_middleware(view)
+        self.assertNotIn('Server-Timing', response)
+
+    def test_catalog_endpoints_have_no_n_plus_one(self):
+        """
+        Verifies:
+        - Book and author lists (including nested books and books_count)
+          issue no repeated per-row queries
+        """
+        client = APIClient()
+        for url in ['/api/books/', '/api/authors/', '/api/stats/authors/']:
+            with self.assertLogs('dbkit.sql', level='INFO') as logs:
+                response = client.get(url)
+            self.assertIn('Server-Timing', response)
+            record = json.loads(logs.records[-1].getMessage())
+            self.assertEqual(record['n_plus_one'], [], url)
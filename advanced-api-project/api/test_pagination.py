@@ -0,0 +1,220 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, Book
+from .pagination import EstimatedCountPaginator
+
+
+class KeysetPaginationTestCase(TestCase):
+    """
+    Test cases for keyset (cursor) pagination on BookListView.
+
+    Covers walking the full result set in both directions, honouring
+    OrderingFilter, cursor validation and the absence of COUNT queries.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - One author
+        - 25 books spread over 5 publication years, with duplicate
+          (year, title) pairs so the id tiebreaker matters
+        """
+        self.client = APIClient()
+        author = Author.objects.create(name='Ursula K. Le Guin')
+        for i in range(25):
+            Book.objects.create(
+                title=f'Book {i % 3}',
+                publication_year=1960 + i % 5,
+                author=author,
+            )
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(book['id'] for book in response.data['results'])
+            url = response.data['next']
+        return ids, response
+
+    def test_walk_default_ordering(self):
+        """
+        Verifies:
+        - Following "next" links returns every book exactly once
+        - The order matches the default ordering with id as tiebreaker
+        """
+        ids, _ = self.walk('/api/books/')
+        expected = list(
+            Book.objects.order_by('-publication_year', 'title', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_walk_requested_ordering(self):
+        """
+        Verifies:
+        - Multi-column ?ordering= is honoured across pages
+        """
+        ids, _ = self.walk('/api/books/?ordering=title,-publication_year&page_size=4')
+        expected = list(
+            Book.objects.order_by('title', '-publication_year', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_preceding_page(self):
+        """
+        Verifies:
+        - The "previous" link of page 2 returns page 1
+        - The first page has no "previous" link
+        """
+        first = self.client.get('/api/books/')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [book['id'] for book in back.data['results']],
+            [book['id'] for book in first.data['results']],
+        )
+
+    def test_no_count_or_offset_queries(self):
+        """
+        Verifies:
+        - Deep pages use a single keyset query with no COUNT or OFFSET
+        """
+        response = self.client.get('/api/books/?page_size=5')
+        for _ in range(3):
+            response = self.client.get(response.data['next'])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data['next'])
+        sql = [query['sql'].upper() for query in queries]
+        self.assertEqual(len(sql), 1)
+        self.assertNotIn('COUNT(', sql[0])
+        self.assertNotIn('OFFSET', sql[0])
+
+    def test_invalid_cursor(self):
+        """
+        Verifies:
+        - Garbage cursors return 404
+        - A cursor issued for another ordering is rejected
+        """
+        response = self.client.get('/api/books/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        next_url = self.client.get('/api/books/').data['next']
+        response = self.client.get(next_url + '&ordering=title')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_results_fall_back_to_offset_cursor(self):
+        """
+        Verifies:
+        - Results ordered by search relevance can still be paged through
+        """
+        ids, _ = self.walk('/api/books/?search=book&page_size=7')
+        self.assertEqual(sorted(ids), sorted(Book.objects.values_list('id', flat=True)))
+
+
+class EstimatedCountPaginationTestCase(TestCase):
+    """
+    Test cases for EstimatedCountPagination on AuthorListView.
+
+    Covers exact counts below the limit, flagged estimates above it, the
+    SQLite statistics estimate and the next link of an overshooting estimate.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - 25 authors
+
+        The author list is behind the catalog response cache, which is
+        cleared so every test sees its own pagination.
+        """
+        cache.clear()
+        self.client = APIClient()
+        Author.objects.bulk_create([Author(name=f'Author {i:02}') for i in range(25)])
+
+    def test_exact_count(self):
+        """
+        Verifies:
+        - Small result sets report an exact count
+        """
+        response = self.client.get('/api/authors/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 25)
+        self.assertFalse(response.data['count_is_estimate'])
+        self.assertEqual(len(response.data['results']), 10)
+
+    @mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 5)
+    def test_count_above_limit_is_flagged(self):
+        """
+        Verifies:
+        - Past the limit the count is an estimate and says so
+        - No unbounded COUNT(*) is issued
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/authors/')
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertGreaterEqual(response.data['count'], 25)
+        counts = [q['sql'] for q in queries.captured_queries if 'COUNT(' in q['sql']]
+        self.assertTrue(all('LIMIT 6' in sql for sql in counts))
+
+    @mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 5)
+    def test_estimate_uses_sqlite_statistics(self):
+        """
+        Verifies:
+        - After ANALYZE, the estimate is the row count in sqlite_stat1
+        """
+        if connection.vendor != 'sqlite':
+            self.skipTest('sqlite_stat1 is SQLite specific')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE api_author')
+        Author.objects.create(name='Written after ANALYZE')
+        response = self.client.get('/api/authors/')
+        self.assertEqual(response.data['count'], 25)
+
+    @mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 5)
+    def test_overshooting_estimate_stops_at_short_page(self):
+        """
+        Verifies:
+        - A short page has no next link even when the estimated page count
+          is larger
+        """
+        oldest = list(Author.objects.order_by('pk').values_list('pk', flat=True)[:12])
+        Author.objects.filter(pk__in=oldest).delete()
+        response = self.client.get('/api/authors/?page=2')
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertGreater(response.data['count'], 13)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNone(response.data['next'])
+
+    @mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 5)
+    def test_pages_past_a_short_estimate(self):
+        """
+        Verifies:
+        - A filtered list estimated below its real size (the bound, on
+          SQLite) still pages to its end by following the next links
+        - The page after the end is a 404
+        """
+        response = self.client.get('/api/authors/?search=Author')
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertLess(response.data['count'], 25)
+        names = []
+        while True:
+            names.extend(author['name'] for author in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(names), 25)
+        self.assertEqual(len(set(names)), 25)
+        response = self.client.get('/api/authors/?search=Author&page=4')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
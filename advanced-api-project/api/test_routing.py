@@ -0,0 +1,243 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import ignore_warnings
+from django.views import View
+from rest_framework.request import Request
+from rest_framework.response import Response
+from dbkit.routing import PIN_COOKIE, ReplicaRoutingMiddleware, primary, replica
+from .cache import CatalogCacheMixin
+from .models import Book
+from .views import BookListView
+
+
+REPLICA_DATABASES = {
+    **settings.DATABASES,
+    'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'replica.sqlite3'},
+}
+
+
+class ReadAliasView(View):
+    """Reports the alias Book reads are routed to."""
+    replica_reads = True
+
+    def dispatch(self, request, *args, **kwargs):
+        response = HttpResponse(Book.objects.all().db)
+        response.status_code = int(request.GET.get('status', 200))
+        return response
+
+
+class PrimaryOnlyView(ReadAliasView):
+    replica_reads = False
+
+
+class AliasList:
+    def list(self, request, *args, **kwargs):
+        return Response(Book.objects.all().db)
+
+
+class CachedAliasList(CatalogCacheMixin, AliasList):
+    """Reports the alias a catalog cache miss reads Books from."""
+
+
+# Only the middleware reads DATABASES here; no connection is opened, so the
+# replica does not count as a test mirror of default either.
+@ignore_warnings(message='Overriding setting DATABASES')
+@override_settings(DATABASES=REPLICA_DATABASES, REPLICA_PIN_SECONDS=5)
+@mock.patch.object(ReplicaRoutingMiddleware, 'is_mirror', lambda self: False)
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """
+    Test cases for ReplicaRouter and ReplicaRoutingMiddleware.
+
+    Covers which requests read from the replica, read-your-writes pinning
+    by cookie and by credentials, and the primary() override. Only the
+    routing decision is checked (QuerySet.db), so no replica database is
+    needed.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - A request factory
+        - An empty cache, so no pins leak between tests
+        """
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def request(self, method, view_class, path='/probe/', **extra):
+        request = getattr(self.factory, method)(path, **extra)
+        middleware = ReplicaRoutingMiddleware(lambda request: self.dispatch(middleware, request, view_class))
+        return middleware(request)
+
+    def dispatch(self, middleware, request, view_class):
+        view = view_class.as_view()
+        middleware.process_view(request, view, (), {})
+        return view(request)
+
+    def test_safe_request_reads_from_replica(self):
+        """
+        Verifies:
+        - GETs to opted-in views read from the replica
+        - Other views keep reading from default
+        """
+        self.assertEqual(self.request('get', ReadAliasView).content, b'replica')
+        self.assertEqual(self.request('get', PrimaryOnlyView).content, b'default')
+
+    def test_writes_use_default_and_pin_the_client(self):
+        """
+        Verifies:
+        - Unsafe requests never read from the replica
+        - A successful write sets the pin cookie
+        - A failed write does not
+        """
+        response = self.request('post', ReadAliasView)
+        self.assertEqual(response.content, b'default')
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 5)
+
+        response = self.request('post', ReadAliasView, path='/probe/?status=400')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_cookie_keeps_reads_on_default(self):
+        """
+        Verifies:
+        - A client holding the pin cookie reads from default
+        """
+        self.factory.cookies[PIN_COOKIE] = '1'
+        self.assertEqual(self.request('get', ReadAliasView).content, b'default')
+
+    def test_pin_follows_credentials_without_cookies(self):
+        """
+        Verifies:
+        - A token client that drops cookies is pinned by its credentials
+        - Other clients are not affected by the pin
+        """
+        self.request('post', ReadAliasView, HTTP_AUTHORIZATION='Token abc')
+        response = self.request('get', ReadAliasView, HTTP_AUTHORIZATION='Token abc')
+        self.assertEqual(response.content, b'default')
+        response = self.request('get', ReadAliasView, HTTP_AUTHORIZATION='Token xyz')
+        self.assertEqual(response.content, b'replica')
+
+    def test_primary_override(self):
+        """
+        Verifies:
+        - primary() routes reads to default inside a replica block
+        - The alias is restored afterwards
+        """
+        with replica():
+            self.assertEqual(Book.objects.all().db, 'replica')
+            with primary():
+                self.assertEqual(Book.objects.all().db, 'default')
+            self.assertEqual(Book.objects.all().db, 'replica')
+        self.assertEqual(Book.objects.all().db, 'default')
+
+    def test_credentials_always_read_from_default(self):
+        """
+        Verifies:
+        - Users and sessions are read from default inside a replica block,
+          so fresh credentials authenticate while the replica lags
+        """
+        with replica():
+            self.assertEqual(User.objects.all().db, 'default')
+            self.assertEqual(Session.objects.all().db, 'default')
+
+    def test_catalog_views_opt_in(self):
+        """
+        Verifies:
+        - The catalog list view is routed to the replica
+        """
+        self.assertTrue(BookListView.replica_reads)
+
+    def test_catalog_cache_misses_read_from_default(self):
+        """
+        Verifies:
+        - A catalog cache miss in a replica-routed request reads from default,
+          so a lagging replica is never stored in the cache
+        - The request's reads are back on the replica afterwards
+        """
+        request = Request(self.factory.get('/api/books/'))
+        request.user = AnonymousUser()
+        with replica():
+            response = CachedAliasList().list(request)
+            self.assertEqual(Book.objects.all().db, 'replica')
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+        self.assertEqual(response.data, 'default')
+
+    @override_settings(DATABASES={'default': settings.DATABASES['default']})
+    def test_no_replica_configured(self):
+        """
+        Verifies:
+        - Without a replica alias everything reads from default
+        """
+        self.assertEqual(self.request('get', ReadAliasView).content, b'default')
+
+
+class SyncReplicaTestCase(SimpleTestCase):
+    """
+    Test cases for the sync_replica command.
+
+    The command works on the files named in settings.DATABASES, so the
+    tests point both aliases at throwaway SQLite files.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - A source SQLite file holding one row
+        - An empty replica SQLite file
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source = os.path.join(directory.name, 'default.sqlite3')
+        self.target = os.path.join(directory.name, 'replica.sqlite3')
+        with closing(sqlite3.connect(self.source)) as db:
+            db.execute('CREATE TABLE probe (value TEXT)')
+            db.execute("INSERT INTO probe VALUES ('copied')")
+            db.commit()
+
+    def database_settings(self, **replica):
+        sqlite = 'django.db.backends.sqlite3'
+        return {
+            'default': {'ENGINE': sqlite, 'NAME': self.source},
+            'replica': {'ENGINE': sqlite, 'NAME': self.target, **replica},
+        }
+
+    @ignore_warnings(message='Overriding setting DATABASES')
+    def test_copies_default_onto_replica(self):
+        """
+        Verifies:
+        - The replica file holds the rows of default after a sync
+        """
+        with override_settings(DATABASES=self.database_settings()):
+            call_command('sync_replica', stdout=StringIO())
+        with closing(sqlite3.connect(self.target)) as db:
+            self.assertEqual(db.execute('SELECT value FROM probe').fetchall(), [('copied',)])
+
+    @ignore_warnings(message='Overriding setting DATABASES')
+    def test_rejects_missing_or_non_sqlite_replica(self):
+        """
+        Verifies:
+        - Without a replica alias the command fails
+        - A non-SQLite replica is refused rather than overwritten
+        """
+        with override_settings(DATABASES={'default': self.database_settings()['default']}):
+            with self.assertRaises(CommandError):
+                call_command('sync_replica')
+        databases = self.database_settings(ENGINE='django.db.backends.postgresql')
+        with override_settings(DATABASES=databases):
+            with self.assertRaises(CommandError):
+                call_command('sync_replica')
@@ -0,0 +1,175 @@
+import os
+import time
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, Book
+
+
+class RankedSearchTestCase(TestCase):
+    """
+    Test cases for the full-text search backend (RankedSearchFilter).
+
+    Covers matching, relevance ranking, index maintenance on writes and
+    interaction with the ordering parameter.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - Two authors
+        - Three books, two of which mention "dragon"
+        """
+        self.client = APIClient()
+        self.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        self.martin = Author.objects.create(name='George R.R. Martin')
+        self.hobbit = Book.objects.create(
+            title='The Hobbit', publication_year=1937, author=self.tolkien
+        )
+        self.dragons = Book.objects.create(
+            title='A Dance with Dragons', publication_year=2011, author=self.martin
+        )
+        self.dragon_dragon = Book.objects.create(
+            title='Dragon Dragon Dragon', publication_year=1990, author=self.tolkien
+        )
+
+    def test_search_uses_prefix_tokens(self):
+        """
+        Verifies:
+        - A token prefix matches the whole word
+        - Matching is case-insensitive
+        """
+        response = self.client.get('/api/books/?search=hob')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [book['title'] for book in response.data['results']]
+        self.assertEqual(titles, ['The Hobbit'])
+
+    def test_search_requires_every_term(self):
+        """
+        Verifies:
+        - Each term must match a title or author name
+        - Terms may match different fields
+        """
+        response = self.client.get('/api/books/?search=dragon martin')
+        titles = [book['title'] for book in response.data['results']]
+        self.assertEqual(titles, ['A Dance with Dragons'])
+
+    def test_search_results_ranked_by_relevance(self):
+        """
+        Verifies:
+        - Without ?ordering=, the most relevant book comes first even though
+          the default ordering would put it last
+        """
+        response = self.client.get('/api/books/?search=dragon')
+        titles = [book['title'] for book in response.data['results']]
+        self.assertEqual(titles, ['Dragon Dragon Dragon', 'A Dance with Dragons'])
+
+    def test_explicit_ordering_overrides_rank(self):
+        """
+        Verifies:
+        - ?ordering= still controls the order of search results
+        """
+        response = self.client.get('/api/books/?search=dragon&ordering=-publication_year')
+        years = [book['publication_year'] for book in response.data['results']]
+        self.assertEqual(years, [2011, 1990])
+
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Verifies:
+        - Renamed titles are searchable immediately
+        - Renaming an author updates the index of their books
+        - Deleted books disappear from results
+        """
+        self.hobbit.title = 'There and Back Again'
+        self.hobbit.save()
+        self.assertEqual(
+            len(self.client.get('/api/books/?search=hobbit').data['results']), 0
+        )
+        self.assertEqual(
+            len(self.client.get('/api/books/?search=back again').data['results']), 1
+        )
+
+        self.martin.name = 'GRRM'
+        self.martin.save()
+        response = self.client.get('/api/books/?search=grrm')
+        self.assertEqual(len(response.data['results']), 1)
+
+        self.dragons.delete()
+        response = self.client.get('/api/books/?search=dance')
+        self.assertEqual(len(response.data['results']), 0)
+
+    def test_search_operators_are_not_interpreted(self):
+        """
+        Verifies:
+        - FTS5 syntax in the search term does not raise a database error
+        - Operators are treated as plain terms
+        """
+        response = self.client.get('/api/books/?search="hobbit" OR NEAR(*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 0)
+        response = self.client.get('/api/books/?search="hobbit"*')
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_author_search(self):
+        """
+        Verifies:
+        - AuthorListView uses the author index
+        """
+        response = self.client.get('/api/authors/?search=tolk')
+        names = [author['name'] for author in response.data['results']]
+        self.assertEqual(names, ['J.R.R. Tolkien'])
+
+
+@unittest.skipUnless(
+    os.environ.get('API_SEARCH_BENCHMARK_ROWS'),
+    'Set API_SEARCH_BENCHMARK_ROWS (e.g. 1000000) to run the search latency test',
+)
+class RankedSearchLatencyTestCase(TestCase):
+    """
+    Latency check for the search endpoint on a large synthetic catalog.
+
+    The row count comes from API_SEARCH_BENCHMARK_ROWS and the p95 budget in
+    milliseconds from API_SEARCH_BENCHMARK_P95_MS (default 250).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        rows = int(os.environ['API_SEARCH_BENCHMARK_ROWS'])
+        words = ['river', 'shadow', 'garden', 'winter', 'empire', 'silver', 'storm', 'glass']
+        authors = Author.objects.bulk_create(
+            [Author(name=f'Author {i} {words[i % len(words)]}') for i in range(max(rows // 20, 1))]
+        )
+        batch = []
+        for i in range(rows):
+            batch.append(Book(
+                title=f'{words[i % 8]} {words[(i // 8) % 8]} volume {i}',
+                publication_year=1900 + i % 120,
+                author=authors[i % len(authors)],
+            ))
+            if len(batch) == 10000:
+                Book.objects.bulk_create(batch)
+                batch = []
+        Book.objects.bulk_create(batch)
+
+    def test_search_p95_latency(self):
+        client = APIClient()
+        budget_ms = float(os.environ.get('API_SEARCH_BENCHMARK_P95_MS', 250))
+        queries = ['river', 'shadow garden', 'silv', 'winter empire', 'storm 42']
+        timings = []
+        for _ in range(5):
+            for query in queries:
+                start = time.perf_counter()
+                response = client.get('/api/books/', {'search': query})
+                timings.append((time.perf_counter() - start) * 1000)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.assertLess(
+            p95, budget_ms,
+            f'search p95 over {Book.objects.count()} books on {connection.vendor}: {p95:.1f} ms',
+        )
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from .models import Author, AuthorStat, Book, PublicationYearStat
+
+
+class SeedCommandTestCase(TestCase):
+    """
+    Test cases for the seed management command.
+
+    Covers row counts, reproducibility and the follow-up statistics rebuild.
+    """
+
+    def seed(self, **options):
+        call_command('seed', stdout=StringIO(), batch_size=70, **options)
+
+    def snapshot(self):
+        return list(
+            Book.objects.order_by('pk').values_list(
+                'title', 'publication_year', 'author__name', 'created_at'
+            )
+        )
+
+    def test_creates_requested_rows(self):
+        """
+        Verifies:
+        - Explicit counts override the scaled defaults
+        - Generated publication years pass model validation
+        """
+        self.seed(authors=12, books=300)
+        self.assertEqual(Author.objects.count(), 12)
+        self.assertEqual(Book.objects.count(), 300)
+        for book in Book.objects.all()[:50]:
+            book.full_clean()
+
+    def test_same_seed_reproduces_data(self):
+        """
+        Verifies:
+        - The same --seed generates identical rows, timestamps aside from
+          their common reference point
+        - A different seed generates different rows
+        """
+        self.seed(authors=5, books=100, seed=3)
+        first = [row[:3] for row in self.snapshot()]
+        Author.objects.all().delete()
+        self.seed(authors=5, books=100, seed=3)
+        self.assertEqual([row[:3] for row in self.snapshot()], first)
+        Author.objects.all().delete()
+        self.seed(authors=5, books=100, seed=4)
+        self.assertNotEqual([row[:3] for row in self.snapshot()], first)
+
+    def test_statistics_are_rebuilt(self):
+        """
+        Verifies:
+        - Summary tables match the seeded books despite bulk_create()
+        """
+        self.seed(authors=8, books=200)
+        self.assertEqual(
+            sum(AuthorStat.objects.values_list('book_count', flat=True)), 200
+        )
+        self.assertEqual(
+            sum(PublicationYearStat.objects.values_list('book_count', flat=True)), 200
+        )
@@ -0,0 +1,199 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, Book
+from .snapshots import CURSOR_FILE, detail_snapshot_path, list_snapshot_path, render_view, snapshot_root
+from .views import BookListView
+
+
+class CatalogSnapshotTestCase(TestCase):
+    """
+    Test cases for snapshot mode (api.snapshots).
+
+    Covers the build command, serving list and detail snapshots without
+    database queries, which requests fall through to the views, and
+    incremental refreshes after writes.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - A temporary CATALOG_SNAPSHOT_ROOT, removed after the test
+        - An anonymous client
+        - One author with 25 books
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(
+            CATALOG_SNAPSHOT_ROOT=root,
+            CATALOG_SNAPSHOT_ORIGINS=['http://testserver'],
+            CATALOG_SNAPSHOT_LIST_PAGES=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.author = Author.objects.create(name='Terry Pratchett')
+        self.books = [
+            Book.objects.create(title=f'Discworld {i:02}', publication_year=1983 + i, author=self.author)
+            for i in range(25)
+        ]
+        call_command('build_catalog_snapshots', stdout=StringIO())
+
+    def get(self, path, **extra):
+        """GET ``path``, returning the response and its body."""
+        response = self.client.get(path, **extra)
+        if response.streaming:
+            return response, b''.join(response.streaming_content)
+        return response, response.content
+
+    def test_list_pages_are_served_without_queries(self):
+        """
+        Verifies:
+        - The first list page is served from its snapshot with no query
+        - The body is what the view renders
+        - Following the next link hits the second page's snapshot
+        - The page after the last snapshotted one falls through to the view
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response, body = self.get('/api/books/')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response['X-Catalog-Snapshot'], 'HIT')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        live = render_view('http://testserver', '/api/books/')
+        self.assertEqual(body, live.content)
+
+        second, body = self.get(json.loads(body)['next'])
+        self.assertEqual(second['X-Catalog-Snapshot'], 'HIT')
+        third, _ = self.get(json.loads(body)['next'])
+        self.assertNotIn('X-Catalog-Snapshot', third)
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+
+        response, _ = self.get('/api/authors/')
+        self.assertEqual(response['X-Catalog-Snapshot'], 'HIT')
+
+    def test_book_detail_is_served_without_queries(self):
+        """
+        Verifies:
+        - A book's detail is served from its snapshot with no query
+        - The bytes are exactly what BookDetailView renders
+        """
+        book = self.books[3]
+        with CaptureQueriesContext(connection) as queries:
+            response, body = self.get(f'/api/books/{book.pk}/')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response['X-Catalog-Snapshot'], 'HIT')
+        self.assertEqual(body, render_view('http://testserver', f'/api/books/{book.pk}/').content)
+
+    def test_requests_that_bypass_snapshots(self):
+        """
+        Verifies:
+        - Clients with credentials or a session reach the view
+        - The browsable API and unknown query strings reach the view
+        """
+        book = self.books[0]
+        for extra in (
+            {'HTTP_AUTHORIZATION': 'Basic Zm9vOmJhcg=='},
+            {'HTTP_ACCEPT': 'text/html'},
+        ):
+            response, _ = self.get(f'/api/books/{book.pk}/', **extra)
+            self.assertNotIn('X-Catalog-Snapshot', response)
+        self.client.cookies['sessionid'] = 'abc'
+        response, _ = self.get('/api/books/')
+        self.assertNotIn('X-Catalog-Snapshot', response)
+        del self.client.cookies['sessionid']
+        response, _ = self.get('/api/books/?search=discworld')
+        self.assertNotIn('X-Catalog-Snapshot', response)
+
+    def refresh(self):
+        call_command('build_catalog_snapshots', '--changed', stdout=StringIO())
+
+    def test_writes_refresh_snapshots(self):
+        """
+        Verifies:
+        - A write renders nothing itself, in the request or on commit
+        - The refresh rewrites an updated book's snapshot and the list pages
+        - Renaming an author rewrites the snapshots of their books
+        - Deleting a book removes its snapshot, so the view answers 404
+        """
+        book = self.books[-1]
+        with self.captureOnCommitCallbacks(execute=True):
+            book.title = 'Raising Steam'
+            book.save()
+        _, body = self.get(f'/api/books/{book.pk}/')
+        self.assertEqual(json.loads(body)['title'], 'Discworld 24')
+
+        self.refresh()
+        _, body = self.get(f'/api/books/{book.pk}/')
+        self.assertEqual(json.loads(body)['title'], 'Raising Steam')
+        _, body = self.get('/api/books/')
+        self.assertEqual(json.loads(body)['results'][0]['title'], 'Raising Steam')
+
+        self.author.name = 'Sir Terry Pratchett'
+        self.author.save()
+        self.refresh()
+        _, body = self.get(f'/api/books/{self.books[0].pk}/')
+        self.assertEqual(json.loads(body)['author_name'], 'Sir Terry Pratchett')
+
+        book_id = book.pk
+        book.delete()
+        self.refresh()
+        self.assertFalse(detail_snapshot_path(snapshot_root(), book_id).exists())
+        response, _ = self.get(f'/api/books/{book_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_lists_are_not_rendered_from_the_response_cache(self):
+        """
+        Verifies:
+        - A write from another process (no signals here, so the catalog
+          generation is not bumped) reaches the list snapshot even though
+          the builder's own cache holds the page from before the write
+        """
+        cache.clear()
+        request = RequestFactory().get('/api/books/', HTTP_ACCEPT='application/json')
+        response = BookListView.as_view()(request)
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+
+        book = self.books[-1]
+        Book.objects.filter(pk=book.pk).update(title='Raising Steam', updated_at=timezone.now())
+        self.refresh()
+        path = list_snapshot_path(snapshot_root(), 'http://testserver', '/api/books/')
+        self.assertEqual(json.loads(path.read_bytes())['results'][0]['title'], 'Raising Steam')
+
+    @override_settings(SYNC_SAFETY_LAG_SECONDS=0)
+    def test_refresh_only_renders_changes(self):
+        """
+        Verifies:
+        - Without writes since the last run, nothing is rendered: the run
+          only looks for changed books, authors and deletions
+        - Without a previous run, everything is built
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.refresh()
+        self.assertEqual(len(queries), 3)
+
+        (snapshot_root() / CURSOR_FILE).unlink()
+        detail_snapshot_path(snapshot_root(), self.books[0].pk).unlink()
+        self.refresh()
+        self.assertTrue(detail_snapshot_path(snapshot_root(), self.books[0].pk).exists())
+
+    @override_settings(CATALOG_SNAPSHOT_ROOT=None)
+    def test_disabled_without_root(self):
+        """
+        Verifies:
+        - Without CATALOG_SNAPSHOT_ROOT every request reaches the view
+        """
+        response, _ = self.get('/api/books/')
+        self.assertNotIn('X-Catalog-Snapshot', response)
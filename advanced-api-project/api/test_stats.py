@@ -0,0 +1,179 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, AuthorStat, Book, PublicationYearStat
+
+
+class CatalogStatsTestCase(TestCase):
+    """
+    Test cases for the incrementally maintained catalog summary tables.
+
+    Covers create, update (author reassignment and year change), delete,
+    cascade delete, the rebuild command and the /api/stats/ endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - Two authors
+        - Three books across two publication years
+        """
+        self.client = APIClient()
+        self.pratchett = Author.objects.create(name='Terry Pratchett')
+        self.gaiman = Author.objects.create(name='Neil Gaiman')
+        self.colour = Book.objects.create(
+            title='The Colour of Magic', publication_year=1983, author=self.pratchett
+        )
+        self.light = Book.objects.create(
+            title='The Light Fantastic', publication_year=1986, author=self.pratchett
+        )
+        self.omens = Book.objects.create(
+            title='Good Omens', publication_year=1990, author=self.gaiman
+        )
+
+    def assertStatsMatchBooks(self):
+        """Assert that both summary tables equal a GROUP BY over api_book."""
+        years = {
+            row['publication_year']: row['total']
+            for row in Book.objects.order_by().values('publication_year').annotate(total=Count('id'))
+        }
+        authors = {
+            row['author_id']: row['total']
+            for row in Book.objects.order_by().values('author_id').annotate(total=Count('id'))
+        }
+        self.assertEqual(
+            dict(PublicationYearStat.objects.filter(book_count__gt=0)
+                 .values_list('publication_year', 'book_count')),
+            years,
+        )
+        self.assertEqual(
+            dict(AuthorStat.objects.filter(book_count__gt=0).values_list('author_id', 'book_count')),
+            authors,
+        )
+
+    def test_create_counts_book(self):
+        self.assertStatsMatchBooks()
+        self.assertEqual(AuthorStat.objects.get(author=self.pratchett).book_count, 2)
+
+    def test_update_moves_book_between_rows(self):
+        """
+        Verifies:
+        - Changing the year moves the count between year rows
+        - Reassigning the author moves the count between author rows
+        - Saving without changes leaves counts alone
+        """
+        self.light.publication_year = 1990
+        self.light.save()
+        self.assertStatsMatchBooks()
+
+        book = Book.objects.get(pk=self.omens.pk)
+        book.author = self.pratchett
+        book.save()
+        book.save()
+        self.assertStatsMatchBooks()
+        self.assertEqual(AuthorStat.objects.get(author=self.gaiman).book_count, 0)
+
+    def test_update_deferred_books(self):
+        """
+        Verifies:
+        - Books loaded with only() or partly refreshed load and save without
+          recursing, and still move between rows
+        - Refreshing after an update elsewhere does not move a book twice
+        """
+        book = Book.objects.only('title').get(pk=self.light.pk)
+        book.publication_year = 1990
+        book.save()
+        self.assertStatsMatchBooks()
+
+        book = Book.objects.get(pk=self.omens.pk)
+        book.refresh_from_db(fields=['title'])
+        book.author = self.pratchett
+        book.save()
+        self.assertStatsMatchBooks()
+
+        stale = Book.objects.get(pk=self.colour.pk)
+        self.colour.publication_year = 1995
+        self.colour.save()
+        stale.refresh_from_db()
+        stale.save()
+        self.assertStatsMatchBooks()
+
+    def test_update_through_api(self):
+        """
+        Verifies:
+        - PATCH through BookDetailView keeps the summaries in sync
+        """
+        from django.contrib.auth.models import User
+        self.client.force_authenticate(User.objects.create_user('editor', password='pw'))
+        response = self.client.patch(
+            f'/api/books/{self.colour.pk}/', {'publication_year': 1986, 'author': self.gaiman.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertStatsMatchBooks()
+
+    def test_delete_and_cascade(self):
+        """
+        Verifies:
+        - Deleting a book decrements its rows
+        - Deleting an author removes all their books from the counts
+        """
+        self.omens.delete()
+        self.assertStatsMatchBooks()
+        self.pratchett.delete()
+        self.assertStatsMatchBooks()
+        self.assertFalse(PublicationYearStat.objects.filter(book_count__gt=0).exists())
+
+    def test_delete_with_drifted_counts(self):
+        """
+        Verifies:
+        - A delete never drives a drifted count below zero or fails the
+          user's delete; the rebuild command repairs the drift
+        """
+        AuthorStat.objects.filter(author=self.gaiman).update(book_count=0)
+        PublicationYearStat.objects.filter(publication_year=1990).update(book_count=0)
+        self.omens.delete()
+        self.assertEqual(AuthorStat.objects.get(author=self.gaiman).book_count, 0)
+        call_command('rebuild_catalog_stats', stdout=StringIO())
+        self.assertStatsMatchBooks()
+
+    def test_rebuild_command(self):
+        """
+        Verifies:
+        - Rows written with bulk_create (no signals) are counted after a rebuild
+        """
+        Book.objects.bulk_create([
+            Book(title=f'Discworld {i}', publication_year=2000, author=self.pratchett)
+            for i in range(5)
+        ])
+        call_command('rebuild_catalog_stats', stdout=StringIO())
+        self.assertStatsMatchBooks()
+
+    def test_stats_endpoints_read_only_summaries(self):
+        """
+        Verifies:
+        - Endpoints return the summary rows
+        - No query touches api_book
+        """
+        for url in ('/api/stats/years/', '/api/stats/authors/', '/api/stats/top-authors/?limit=1'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            for query in queries.captured_queries:
+                self.assertNotIn('"api_book"', query['sql'])
+
+        response = self.client.get('/api/stats/years/')
+        self.assertEqual(
+            [(row['publication_year'], row['book_count']) for row in response.data],
+            [(1983, 1), (1986, 1), (1990, 1)],
+        )
+        response = self.client.get('/api/stats/top-authors/?limit=1')
+        self.assertEqual(response.data[0]['author_name'], 'Terry Pratchett')
+        self.assertEqual(response.data[0]['book_count'], 2)
@@ -0,0 +1,190 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from .models import Author, Book, Tombstone
+
+
+@override_settings(SYNC_SAFETY_LAG_SECONDS=5, SYNC_TOMBSTONE_RETENTION_DAYS=30)
+class ChangeFeedTestCase(TestCase):
+    """
+    Test cases for the book and author change feeds (api.sync).
+
+    Covers full and incremental syncs, deletions through tombstones
+    (including cascades), cursor stability across pages and concurrent
+    writes, the safety lag and expired cursors.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - An anonymous client
+        - Two authors with two books each, all last updated a minute ago
+        """
+        self.client = APIClient()
+        self.tolkien = Author.objects.create(name='J.R.R. Tolkien')
+        self.lewis = Author.objects.create(name='C.S. Lewis')
+        self.books = [
+            Book.objects.create(title='The Hobbit', publication_year=1937, author=self.tolkien),
+            Book.objects.create(title='The Silmarillion', publication_year=1977, author=self.tolkien),
+            Book.objects.create(title='Out of the Silent Planet', publication_year=1938, author=self.lewis),
+            Book.objects.create(title='Perelandra', publication_year=1943, author=self.lewis),
+        ]
+        self.backdate(Book.objects.all(), seconds=60)
+        self.backdate(Author.objects.all(), seconds=60)
+
+    def backdate(self, queryset, seconds):
+        queryset.update(updated_at=timezone.now() - timedelta(seconds=seconds))
+
+    def sync(self, url='/api/books/sync/', cursor=None, later=0, **params):
+        """GET the feed, as if ``later`` seconds from now."""
+        if cursor is not None:
+            params['updated_since'] = cursor
+        now = timezone.now() + timedelta(seconds=later)
+        with mock.patch('api.sync.timezone.now', return_value=now):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_initial_sync_returns_everything(self):
+        """
+        Verifies:
+        - A sync without a cursor lists every row in (updated_at, id) order
+        - Rows carry updated_at
+        - Nothing is reported deleted and nothing is left
+        """
+        data = self.sync()
+        self.assertEqual([row['id'] for row in data['results']], [book.pk for book in self.books])
+        self.assertIn('updated_at', data['results'][0])
+        self.assertEqual(data['deleted'], [])
+        self.assertFalse(data['has_more'])
+
+    def test_incremental_sync_returns_only_changes(self):
+        """
+        Verifies:
+        - A sync with the previous cursor is empty when nothing changed
+        - It then returns exactly the rows created or updated since
+        """
+        cursor = self.sync()['cursor']
+        self.assertEqual(self.sync(cursor=cursor)['results'], [])
+
+        hobbit = self.books[0]
+        hobbit.title = 'The Hobbit, or There and Back Again'
+        hobbit.save()
+        new = Book.objects.create(title='That Hideous Strength', publication_year=1945, author=self.lewis)
+
+        data = self.sync(cursor=cursor, later=10)
+        self.assertEqual({row['id'] for row in data['results']}, {hobbit.pk, new.pk})
+        self.assertEqual(self.sync(cursor=data['cursor'], later=20)['results'], [])
+
+    def test_deletions_are_reported(self):
+        """
+        Verifies:
+        - Deleting a book reports its id in the book feed
+        - Deleting an author reports it and its cascaded books
+        """
+        cursor = self.sync()['cursor']
+        author_cursor = self.sync('/api/authors/sync/')['cursor']
+        book_ids = [book.pk for book in self.books]
+        lewis_id = self.lewis.pk
+        self.books[0].delete()
+        self.lewis.delete()
+
+        data = self.sync(cursor=cursor, later=10)
+        self.assertEqual(sorted(data['deleted']), [book_ids[0], book_ids[2], book_ids[3]])
+        self.assertEqual(self.sync(cursor=data['cursor'], later=20)['deleted'], [])
+        data = self.sync('/api/authors/sync/', cursor=author_cursor, later=10)
+        self.assertEqual(data['deleted'], [lewis_id])
+
+    def test_paging_with_limit(self):
+        """
+        Verifies:
+        - ?limit= splits a sync into pages that together return every row once
+        - has_more is false once the feed is caught up
+        """
+        seen = []
+        cursor = None
+        for _ in range(5):
+            data = self.sync(cursor=cursor, limit=3)
+            seen.extend(row['id'] for row in data['results'])
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, [book.pk for book in self.books])
+
+    def test_rows_with_equal_timestamps_are_not_skipped(self):
+        """
+        Verifies:
+        - A page boundary inside a group of equal updated_at values neither
+          skips nor repeats rows
+        """
+        Book.objects.update(updated_at=timezone.now() - timedelta(seconds=30))
+        first = self.sync(limit=2)
+        second = self.sync(cursor=first['cursor'], limit=2)
+        ids = [row['id'] for row in first['results'] + second['results']]
+        self.assertEqual(ids, [book.pk for book in self.books])
+
+    def test_recent_writes_wait_for_the_safety_lag(self):
+        """
+        Verifies:
+        - A row written inside the safety lag is held back
+        - The cursor stays behind it, so it is returned once the lag passes
+        """
+        cursor = self.sync()['cursor']
+        late = Book.objects.create(title='Till We Have Faces', publication_year=1956, author=self.lewis)
+        data = self.sync(cursor=cursor)
+        self.assertEqual(data['results'], [])
+
+        data = self.sync(cursor=data['cursor'], later=10)
+        self.assertEqual([row['id'] for row in data['results']], [late.pk])
+
+    def test_paging_through_rows_older_than_the_retention(self):
+        """
+        Verifies:
+        - An initial sync over rows older than the tombstone retention pages
+          through to the end instead of expiring its own cursor
+        """
+        self.backdate(Book.objects.all(), seconds=90 * 24 * 3600)
+        seen = []
+        cursor = None
+        for _ in range(5):
+            data = self.sync(cursor=cursor, limit=2)
+            seen.extend(row['id'] for row in data['results'])
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, [book.pk for book in self.books])
+
+    def test_expired_and_invalid_cursors(self):
+        """
+        Verifies:
+        - A cursor older than the tombstone retention gets 410 Gone
+        - A malformed cursor gets 404
+        """
+        cursor = self.sync()['cursor']
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=0):
+            response = self.client.get('/api/books/sync/', {'updated_since': cursor})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        response = self.client.get('/api/books/sync/', {'updated_since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_prune_tombstones(self):
+        """
+        Verifies:
+        - prune_tombstones removes only tombstones past the retention period
+        """
+        old_id, recent_id = self.books[0].pk, self.books[1].pk
+        self.books[0].delete()
+        self.books[1].delete()
+        Tombstone.objects.filter(object_id=old_id).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [recent_id])
@@ -4,6 +4,12 @@ from .views import (
     BookDetailView,
     AuthorListView,
     AuthorDetailView,
+    BookSyncView,
+    AuthorSyncView,
+    PublicationYearStatsView,
+    AuthorStatsView,
+    TopAuthorsView,
+    catalog_cache_stats,
     CreateView,
     UpdateView,
     DeleteView,
@@ -28,4 +34,16 @@ urlpatterns = [
     # Author endpoints with searching and ordering
     path('authors/', AuthorListView.as_view(), name='author-list'),
     path('authors/<int:pk>/', AuthorDetailView.as_view(), name='author-detail'),
+    
+    # Incremental change feeds for mirrors
+    path('books/sync/', BookSyncView.as_view(), name='book-sync'),
+    path('authors/sync/', AuthorSyncView.as_view(), name='author-sync'),
+    
+    # Statistics endpoints backed by summary tables
+    path('stats/years/', PublicationYearStatsView.as_view(), name='stats-years'),
+    path('stats/authors/', AuthorStatsView.as_view(), name='stats-authors'),
+    path('stats/top-authors/', TopAuthorsView.as_view(), name='stats-top-authors'),
+    
+    # Operations endpoints (admin only)
+    path('cache/stats/', catalog_cache_stats, name='catalog-cache-stats'),
 ]
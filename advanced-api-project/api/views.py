@@ -1,11 +1,25 @@
 from django.shortcuts import render
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import generics, filters, status
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Author, Book
-from .serializers import AuthorSerializer, BookSerializer
+from .models import Author, AuthorStat, Book, PublicationYearStat
+from .serializers import (
+    AuthorSerializer,
+    AuthorStatSerializer,
+    AuthorSyncSerializer,
+    BookBulkUpdateSerializer,
+    BookSerializer,
+    BookSyncSerializer,
+    PublicationYearStatSerializer,
+)
+from .filters import BookFilter
+from .search import RankedSearchFilter
+from .pagination import KeysetPagination
+from .cache import CatalogCacheMixin, get_cache_stats
+from .bulk import BulkLookupMixin, BulkPartialUpdateMixin
+from .sync import ChangeFeedView
 from django_filters import rest_framework
 
 @api_view(['GET'])
@@ -18,12 +32,15 @@ def api_root(request):
         'endpoints': {
             'books': request.build_absolute_uri('/api/books/'),
             'authors': request.build_absolute_uri('/api/authors/'),
+            'stats': request.build_absolute_uri('/api/stats/years/'),
             'admin': request.build_absolute_uri('/admin/'),
         },
         'documentation': {
             'filtering': 'Add ?author=1 or ?publication_year=1997',
             'searching': 'Add ?search=keyword',
             'ordering': 'Add ?ordering=title or ?ordering=-publication_year',
+            'pagination': 'Follow the "next" and "previous" links of /api/books/',
+            'batch lookup': 'Add ?ids=1,2,3 to /api/books/ or /api/authors/',
         }
     })
 
@@ -32,30 +49,47 @@ def api_root(request):
 # BOOK VIEWS - CRUD Operations with Filtering, Searching, and Ordering
 # ============================================================================
 
-class BookListView(generics.ListCreateAPIView):
+class BookListView(CatalogCacheMixin, BulkLookupMixin, BulkPartialUpdateMixin, generics.ListCreateAPIView):
     """
     ListView for retrieving all books and CreateView for adding new books.
     
     Features:
-        - Filtering: By author, publication_year, title
-        - Searching: On title and author name (SearchFilter)
+        - Filtering: By author, title, title prefix, publication_year and
+          publication_year ranges (BookFilter)
+        - Searching: On title and author name, ranked by relevance (RankedSearchFilter)
         - Ordering: By title, publication_year (OrderingFilter)
+        - Pagination: Opaque keyset cursors (KeysetPagination), so deep pages
+          cost the same as the first one and no COUNT(*) is run
+        - Caching: Anonymous GETs are served from the catalog response cache
+          (CatalogCacheMixin)
+        - Bulk updates: PATCH with a list of partial updates, each carrying
+          the book "id" (BulkPartialUpdateMixin)
+        - Batch lookups: ?ids=1,2,3 returns those books in one query, in the
+          order given, and lists missing ids (BulkLookupMixin)
+        - Replica reads: GETs read from the replica database when one is
+          configured (dbkit.routing)
     
     Permission Classes: IsAuthenticatedOrReadOnly
     - GET: Open to all users
-    - POST: Authenticated users only
+    - POST/PATCH: Authenticated users only
     """
     queryset = Book.objects.select_related('author').all()
     serializer_class = BookSerializer
+    bulk_update_serializer_class = BookBulkUpdateSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    replica_reads = True
     
     # Configure filtering backend (DjangoFilterBackend)
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # RankedSearchFilter comes after OrderingFilter so that search results are
+    # ordered by relevance unless ?ordering= is given explicitly
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, RankedSearchFilter]
     
-    # Configure fields that can be filtered
-    filterset_fields = ['author', 'publication_year', 'title']
+    # Configure filters: exact author/title/year, year ranges and title
+    # prefixes, all answered from api_book indexes (see api.filters)
+    filterset_class = BookFilter
     
-    # Configure SearchFilter - search on title and author name
+    # Configure RankedSearchFilter - search on title and author name
     search_fields = ['title', 'author__name']
     
     # Configure OrderingFilter - order by title and publication_year
@@ -78,6 +112,7 @@ class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Book.objects.select_related('author').all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    replica_reads = True
 
     def perform_update(self, serializer):
         """Hook called after serializer validation during PUT/PATCH."""
@@ -93,8 +128,10 @@ class CreateView(BookListView):
     
     This view inherits from BookListView and handles the creation of new books.
     Includes filtering, searching, and ordering capabilities inherited from parent.
+    Bulk updates are only served at the list endpoint, so PATCH is not allowed.
     """
     permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'post', 'head', 'options']
 
 
 class UpdateView(BookDetailView):
@@ -125,13 +162,19 @@ class DeleteView(BookDetailView):
 # AUTHOR VIEWS - CRUD Operations
 # ============================================================================
 
-class AuthorListView(generics.ListCreateAPIView):
+class AuthorListView(CatalogCacheMixin, BulkLookupMixin, generics.ListCreateAPIView):
     """
     ListView for retrieving all authors with nested books.
     
     Features:
-        - Searching: On author name (SearchFilter)
+        - Searching: On author name, ranked by relevance (RankedSearchFilter)
         - Ordering: By name and creation date (OrderingFilter)
+        - Batch lookups: ?ids=1,2,3 returns those authors in one query, in
+          the order given, and lists missing ids (BulkLookupMixin)
+        - Caching: Anonymous GETs are served from the catalog response cache
+          (CatalogCacheMixin)
+        - Replica reads: GETs read from the replica database when one is
+          configured (dbkit.routing)
     
     Permission Classes: IsAuthenticatedOrReadOnly
     - GET: Open to all users
@@ -140,11 +183,12 @@ class AuthorListView(generics.ListCreateAPIView):
     queryset = Author.objects.prefetch_related('books').all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    replica_reads = True
     
-    # Configure SearchFilter and OrderingFilter
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    # Configure OrderingFilter and RankedSearchFilter
+    filter_backends = [filters.OrderingFilter, RankedSearchFilter]
     
-    # Configure SearchFilter - search on author name
+    # Configure RankedSearchFilter - search on author name
     search_fields = ['name']
     
     # Configure OrderingFilter - order by name and created_at
@@ -163,3 +207,110 @@ class AuthorDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Author.objects.prefetch_related('books').all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    replica_reads = True
+
+
+# ============================================================================
+# SYNC VIEWS - Incremental change feeds for mirrors (api.sync)
+# ============================================================================
+
+class BookSyncView(ChangeFeedView):
+    """
+    Change feed of books: rows created or updated and ids deleted since
+    ``?updated_since=<cursor>``.
+
+    Always reads from default, never from the replica (see api.sync).
+
+    Permission Classes: IsAuthenticatedOrReadOnly
+    - GET: Open to all users
+    """
+    queryset = Book.objects.select_related('author')
+    serializer_class = BookSyncSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+
+class AuthorSyncView(ChangeFeedView):
+    """
+    Change feed of authors: rows created or updated and ids deleted since
+    ``?updated_since=<cursor>``.
+
+    Always reads from default, never from the replica (see api.sync).
+
+    Permission Classes: IsAuthenticatedOrReadOnly
+    - GET: Open to all users
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSyncSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+
+# ============================================================================
+# STATISTICS VIEWS - Read-only, served from the summary tables
+# ============================================================================
+
+class PublicationYearStatsView(generics.ListAPIView):
+    """
+    Number of books per publication year, oldest year first.
+
+    Reads PublicationYearStat only; no aggregate query runs over api_book.
+    The list is short (one row per year) and is returned unpaginated.
+    """
+    queryset = PublicationYearStat.objects.filter(book_count__gt=0)
+    serializer_class = PublicationYearStatSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    filter_backends = []
+    replica_reads = True
+
+
+class AuthorStatsView(generics.ListAPIView):
+    """
+    Number of books per author, most prolific first (paginated).
+
+    Reads AuthorStat joined to Author for the name.
+    """
+    queryset = AuthorStat.objects.select_related('author').filter(book_count__gt=0)
+    serializer_class = AuthorStatSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = []
+    replica_reads = True
+
+
+class TopAuthorsView(generics.ListAPIView):
+    """
+    The authors with the most books.
+
+    Query Parameters:
+        - limit: Number of authors to return (default 10, maximum 100)
+    """
+    serializer_class = AuthorStatSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    filter_backends = []
+    replica_reads = True
+    default_limit = 10
+    max_limit = 100
+
+    def get_queryset(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = min(max(limit, 1), self.max_limit)
+        return AuthorStat.objects.select_related('author').filter(book_count__gt=0)[:limit]
+
+
+# ============================================================================
+# OPERATIONS VIEWS
+# ============================================================================
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def catalog_cache_stats(request):
+    """
+    Report catalog response cache counters.
+
+    Returns hits, misses, bypasses (authenticated or non-GET requests),
+    invalidations, the hit ratio and the current catalog generation.
+    """
+    return Response(get_cache_stats())
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 
 class CustomUserManager(BaseUserManager):
@@ -22,6 +23,13 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        # Case-insensitive prefix search in the admin (bookshelf.admin)
+        indexes = [
+            models.Index(Lower('username'), name='bookshelf_user_username_lower'),
+            models.Index(Lower('email'), name='bookshelf_user_email_lower'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -31,6 +39,11 @@ class Book(models.Model):
     publication_year = models.IntegerField()
 
     class Meta:
+        indexes = [
+            models.Index(Lower('title'), name='bookshelf_book_title_lower'),
+            models.Index(Lower('author'), name='bookshelf_book_author_lower'),
+            models.Index(fields=['publication_year']),
+        ]
         permissions = [
             ("can_view", "Can view books"),
             ("can_create", "Can create books"),
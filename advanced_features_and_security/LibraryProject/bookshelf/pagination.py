@@ -0,0 +1,65 @@
+"""
+Admin paginator for tables too large to COUNT(*) on every changelist view.
+"""
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count is exact up to ``exact_count_limit`` rows.
+
+    The count query is bounded with a LIMIT, so it never reads more than
+    ``exact_count_limit + 1`` rows. Past the bound, an unfiltered changelist
+    reports the highest primary key (one index seek) and a filtered one
+    reports the bound itself; ``count_is_estimate`` is set in both cases.
+
+    An estimated count can be short of the real one, so page numbers are not
+    checked against it: any page with rows is served.
+    """
+    exact_count_limit = 10000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return len(queryset)
+        bounded = queryset.order_by()[:self.exact_count_limit + 1].count()
+        if bounded <= self.exact_count_limit:
+            return bounded
+        self.count_is_estimate = True
+        if queryset.query.where or queryset.query.distinct:
+            return bounded
+        highest = queryset.model._default_manager.using(queryset.db).aggregate(
+            highest=Max('pk')
+        )['highest']
+        return max(highest or 0, bounded)
+
+    def validate_number(self, number):
+        self.count  # Sets count_is_estimate.
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        object_list = self.object_list[bottom:bottom + self.per_page]
+        if number > 1 and not object_list:
+            raise EmptyPage(self.error_messages['no_results'])
+        return self._get_page(object_list, number, self)
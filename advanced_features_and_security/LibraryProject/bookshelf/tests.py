@@ -0,0 +1,206 @@
+from django.contrib import admin
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.test import RequestFactory, TestCase
+from bookshelf.admin import AuthorPrefixFilter, BookAdmin, CustomUserAdmin
+from bookshelf.models import Book, CustomUser
+from bookshelf.pagination import EstimatedCountPaginator
+
+
+class PrefixSearchTestCase(TestCase):
+    """
+    Test cases for PrefixSearchMixin on the Book and user changelists.
+
+    Covers case-insensitive prefix matching, several search words, and
+    that the middle of a value does not match.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - Three books by two authors
+        - Two users
+        """
+        self.request = RequestFactory().get('/admin/')
+        self.hobbit = Book.objects.create(title='The Hobbit', author='J.R.R. Tolkien', publication_year=1937)
+        self.rings = Book.objects.create(
+            title='The Lord of the Rings', author='J.R.R. Tolkien', publication_year=1954
+        )
+        self.narnia = Book.objects.create(
+            title='The Lion, the Witch and the Wardrobe', author='C.S. Lewis', publication_year=1950
+        )
+        self.ada = CustomUser.objects.create_user('ada', 'ada@example.com')
+        self.grace = CustomUser.objects.create_user('grace', 'Grace.Hopper@example.com')
+
+    def search(self, model_admin, term):
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            self.request, model_admin.model.objects.all(), term
+        )
+        self.assertFalse(may_have_duplicates)
+        return set(queryset)
+
+    def test_prefix_matches_ignore_case(self):
+        """
+        Verifies:
+        - A term matches the start of any search field, in any case
+        - The middle of a value does not match
+        - An empty search returns everything
+        """
+        book_admin = BookAdmin(Book, admin.site)
+        self.assertEqual(self.search(book_admin, 'THE'), {self.hobbit, self.rings, self.narnia})
+        self.assertEqual(self.search(book_admin, 'j.r.r'), {self.hobbit, self.rings})
+        self.assertEqual(self.search(book_admin, 'hobbit'), set())
+        self.assertEqual(self.search(book_admin, 'Tolkien'), set())
+        self.assertEqual(self.search(book_admin, '  '), {self.hobbit, self.rings, self.narnia})
+
+    def test_every_word_must_match(self):
+        """
+        Verifies:
+        - Each word of the search must start one of the fields
+        """
+        book_admin = BookAdmin(Book, admin.site)
+        self.assertEqual(self.search(book_admin, 'the c.s.'), {self.narnia})
+        self.assertEqual(self.search(book_admin, 'the j.r.r. the'), {self.hobbit, self.rings})
+        self.assertEqual(self.search(book_admin, 'the l'), set())
+
+    def test_user_search(self):
+        """
+        Verifies:
+        - Users are matched on the start of their username or email
+        """
+        user_admin = CustomUserAdmin(CustomUser, admin.site)
+        self.assertEqual(self.search(user_admin, 'GRA'), {self.grace})
+        self.assertEqual(self.search(user_admin, 'grace.h'), {self.grace})
+        self.assertEqual(self.search(user_admin, 'example'), set())
+
+
+class AuthorPrefixFilterTestCase(TestCase):
+    """
+    Test cases for AuthorPrefixFilter on the Book changelist.
+
+    Covers filtering on the start of the author's name and the choices
+    rendered for the filter form.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - A superuser logged into the test client
+        - Two books by Tolkien and one by Lewis
+        """
+        user = CustomUser.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+        Book.objects.create(title='The Hobbit', author='J.R.R. Tolkien', publication_year=1937)
+        Book.objects.create(title='The Silmarillion', author='J.R.R. Tolkien', publication_year=1977)
+        Book.objects.create(title='Perelandra', author='C.S. Lewis', publication_year=1943)
+
+    def changelist(self, **params):
+        response = self.client.get('/admin/bookshelf/book/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def author_filter(self, changelist):
+        return next(spec for spec in changelist.filter_specs if isinstance(spec, AuthorPrefixFilter))
+
+    def test_filters_on_author_prefix(self):
+        """
+        Verifies:
+        - The filter keeps books whose author starts with the value, in
+          any case
+        - Without a value nothing is filtered
+        """
+        changelist = self.changelist(author='j.r.r')
+        self.assertEqual({book.title for book in changelist.result_list}, {'The Hobbit', 'The Silmarillion'})
+        self.assertEqual(len(self.changelist().result_list), 3)
+        self.assertEqual(len(self.changelist(author='Tolkien').result_list), 0)
+
+    def test_choices(self):
+        """
+        Verifies:
+        - The only choice is "All", selected without a value, and it drops
+          the author parameter
+        - The form carries the other parameters but not the author or page
+        """
+        changelist = self.changelist()
+        choices = list(self.author_filter(changelist).choices(changelist))
+        self.assertEqual([choice['display'] for choice in choices], ['All'])
+        self.assertTrue(choices[0]['selected'])
+
+        changelist = self.changelist(author='lewis', publication_year='1943', p='1')
+        spec = self.author_filter(changelist)
+        choices = list(spec.choices(changelist))
+        self.assertFalse(choices[0]['selected'])
+        self.assertNotIn('author=', choices[0]['query_string'])
+        self.assertIn('publication_year=1943', choices[0]['query_string'])
+        self.assertEqual(spec.hidden_params, [('publication_year', '1943')])
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """
+    Test cases for EstimatedCountPaginator.
+
+    Covers exact counts below the limit, estimates above it for unfiltered
+    and filtered querysets, and pages past a short estimate.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+
+        Creates:
+        - 30 books, ten per publication year
+        """
+        Book.objects.bulk_create([
+            Book(title=f'Book {i}', author='Prolific Author', publication_year=2000 + i % 3)
+            for i in range(30)
+        ])
+
+    def paginator(self, queryset, per_page, exact_count_limit):
+        paginator = EstimatedCountPaginator(queryset.order_by('pk'), per_page)
+        paginator.exact_count_limit = exact_count_limit
+        return paginator
+
+    def test_exact_count_below_limit(self):
+        """
+        Verifies:
+        - Counts up to the limit are exact and not flagged as estimates
+        """
+        paginator = self.paginator(Book.objects.all(), 10, exact_count_limit=30)
+        self.assertEqual(paginator.count, 30)
+        self.assertFalse(paginator.count_is_estimate)
+
+    def test_unfiltered_count_above_limit_is_estimated(self):
+        """
+        Verifies:
+        - An unfiltered queryset past the limit reports the highest primary key
+        - The count is flagged as an estimate
+        """
+        paginator = self.paginator(Book.objects.all(), 10, exact_count_limit=5)
+        self.assertEqual(paginator.count, Book.objects.order_by('-pk').first().pk)
+        self.assertTrue(paginator.count_is_estimate)
+
+    def test_filtered_count_reports_the_bound(self):
+        """
+        Verifies:
+        - A filtered queryset past the limit reports limit + 1
+        """
+        paginator = self.paginator(Book.objects.filter(publication_year=2000), 2, exact_count_limit=5)
+        self.assertEqual(paginator.count, 6)
+        self.assertTrue(paginator.count_is_estimate)
+
+    def test_pages_past_a_short_estimate(self):
+        """
+        Verifies:
+        - Pages past the estimated page count are served while they have rows
+        - The page after the real end is empty
+        """
+        paginator = self.paginator(Book.objects.filter(publication_year=2000), 2, exact_count_limit=5)
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertEqual(len(paginator.page(5).object_list), 2)
+        with self.assertRaises(EmptyPage):
+            paginator.page(6)
+        with self.assertRaises(PageNotAnInteger):
+            paginator.page('last')
@@ -0,0 +1,202 @@
+"""
+Run the benchmark suite across every project and data size.
+
+For each project and size the runner seeds a SQLite database once (cached
+under benchmarks/.data/), copies it so write scenarios never touch the
+cached file, and measures every scenario in a worker process. Results are
+written to a JSON file and compared against a saved baseline.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --projects api blog --sizes small medium large
+    python benchmarks/run.py --save-baseline
+    python benchmarks/run.py --strict          # exit 1 on regressions
+
+Regressions are reported when, compared with the baseline:
+    - a request starts failing with an HTTP error,
+    - a request issues more queries,
+    - p95 latency grows by more than --tolerance (and by at least 1 ms),
+    - peak memory grows by more than --tolerance (and by at least 64 KiB).
+"""
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+
+import scenarios
+
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+WORKER = HERE / 'worker.py'
+
+# Multipliers applied to each project's default seed counts.
+SIZES = {
+    'small': 0.1,
+    'medium': 1.0,
+    'large': 10.0,
+    'xlarge': 200.0,
+}
+
+
+def run_worker(*args):
+    subprocess.run([sys.executable, str(WORKER), *map(str, args)], check=True)
+
+
+def seeded_database(project, size, args):
+    database = args.data_dir / f'{project}-{size}-seed{args.seed}.sqlite3'
+    if database.exists() and not args.reseed:
+        return database
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    partial = database.with_suffix('.partial')
+    partial.unlink(missing_ok=True)
+    print(f'Seeding {project} ({size})...', file=sys.stderr)
+    run_worker('seed', project, '--database', partial, '--scale', SIZES[size], '--seed', args.seed)
+    partial.replace(database)
+    return database
+
+
+def measure(project, size, args):
+    source = seeded_database(project, size, args)
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / source.name
+        shutil.copyfile(source, database)
+        output = Path(tmp) / 'results.json'
+        command = [
+            'measure', project, '--database', database, '--output', output,
+            '--iterations', args.iterations, '--warmup', args.warmup,
+        ]
+        if args.scenarios:
+            command += ['--scenarios', *args.scenarios]
+        run_worker(*command)
+        return json.loads(output.read_text())
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Yield (key, metric, baseline value, current value) for each regression."""
+    for project, sizes in results.items():
+        for size, measured in sizes.items():
+            for name, current in measured.items():
+                previous = baseline.get(project, {}).get(size, {}).get(name)
+                if not previous or 'error' in previous or 'error' in current:
+                    continue
+                key = f'{project}/{size}/{name}'
+                if current['status'] >= 400 > previous['status']:
+                    yield key, 'status', previous['status'], current['status']
+                if current['queries'] > previous['queries']:
+                    yield key, 'queries', previous['queries'], current['queries']
+                if (current['p95_ms'] > previous['p95_ms'] * (1 + tolerance)
+                        and current['p95_ms'] - previous['p95_ms'] >= 1):
+                    yield key, 'p95_ms', previous['p95_ms'], current['p95_ms']
+                if (current['peak_kib'] > previous['peak_kib'] * (1 + tolerance)
+                        and current['peak_kib'] - previous['peak_kib'] >= 64):
+                    yield key, 'peak_kib', previous['peak_kib'], current['peak_kib']
+
+
+def print_table(results, baseline):
+    header = f'{"scenario":<36} {"p50 ms":>9} {"p95 ms":>9} {"queries":>8} {"peak KiB":>10}  baseline p95/queries'
+    print(header)
+    print('-' * len(header))
+    for project, sizes in results.items():
+        for size, measured in sizes.items():
+            for name, current in measured.items():
+                key = f'{project}/{size}/{name}'
+                if 'error' in current:
+                    print(f'{key:<36} ERROR {current["error"]}')
+                    continue
+                previous = baseline.get(project, {}).get(size, {}).get(name) or {}
+                reference = ''
+                if 'p95_ms' in previous:
+                    reference = f'{previous["p95_ms"]:.2f} / {previous["queries"]}'
+                print(
+                    f'{key:<36} {current["p50_ms"]:>9.2f} {current["p95_ms"]:>9.2f} '
+                    f'{current["queries"]:>8} {current["peak_kib"]:>10.1f}  {reference}'
+                    + (f'  HTTP {current["status"]}' if current['status'] >= 400 else '')
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--projects', nargs='+', choices=sorted(scenarios.PROJECTS),
+                        default=list(scenarios.PROJECTS))
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--scenarios', nargs='+', help='Only run scenarios with these names.')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reseed', action='store_true', help='Regenerate cached databases.')
+    parser.add_argument('--data-dir', type=Path, default=HERE / '.data')
+    parser.add_argument('--output', type=Path, default=HERE / 'results' / 'latest.json')
+    parser.add_argument('--baseline', type=Path, default=HERE / 'baseline.json')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write these results to the baseline file.')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 on regressions.')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for project in args.projects:
+        for size in args.sizes:
+            results.setdefault(project, {})[size] = measure(project, size, args)
+
+    report = {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())['results']
+    print_table(results, baseline)
+    print(f'\nResults written to {args.output}')
+
+    if args.save_baseline:
+        # Merge so a partial run only replaces the entries it measured.
+        merged = {'meta': report['meta'], 'results': baseline}
+        for project, sizes in results.items():
+            for size, measured in sizes.items():
+                merged['results'].setdefault(project, {}).setdefault(size, {}).update(measured)
+        args.baseline.write_text(json.dumps(merged, indent=2) + '\n')
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    regressions = list(compare(results, baseline, args.tolerance))
+    for key, metric, before, after in regressions:
+        print(f'REGRESSION {key}: {metric} {before} -> {after}')
+    if not baseline:
+        print('No baseline found; run with --save-baseline to record one.')
+    return 1 if regressions and args.strict else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Benchmark scenarios for each project.
+
+Each project entry names the project directory and its settings module.
+``prepare_<project>()`` runs once inside the worker after Django is set up;
+it picks the rows the scenarios will hit and returns the scenario list.
+
+A scenario is a request template:
+
+    Scenario(name, method, path, clear_cache=False, client=None)
+
+``path`` is either a string or a callable taking the iteration number, so
+write scenarios can touch a different row on every iteration. Scenarios with
+``clear_cache`` empty the default cache before each request, measuring the
+uncached path of views behind a response cache. Scenarios with their own
+``client`` send their requests through it instead of the shared anonymous
+one, so a logged-in session does not change the other scenarios' queries.
+"""
+from collections import namedtuple
+
+
+Scenario = namedtuple('Scenario', 'name method path clear_cache client')
+Scenario.__new__.__defaults__ = (False, None)
+
+PROJECTS = {
+    'api': {
+        'path': 'advanced-api-project',
+        'settings': 'advanced_api_project.settings',
+    },
+    'social': {
+        'path': 'social_media_api',
+        'settings': 'social_media_api.settings',
+    },
+    'blog': {
+        'path': 'django_blog',
+        'settings': 'django_blog.settings',
+    },
+    'library': {
+        'path': 'django-models/LibraryProject',
+        'settings': 'LibraryProject.settings',
+    },
+}
+
+
+def cycle(values, template):
+    # Path callable visiting values in turn, one per iteration.
+    return lambda i: template.format(values[i % len(values)])
+
+
+def admin_client(user_model):
+    from django.test import Client
+
+    user, _ = user_model.objects.get_or_create(
+        username='benchmark-admin', defaults={'is_staff': True, 'is_superuser': True},
+    )
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def prepare_api(client):
+    from django.contrib.auth.models import User
+    from api.models import Author, Book
+
+    book_id = Book.objects.order_by('pk').values_list('pk', flat=True).first()
+    author_id = Author.objects.order_by('pk').values_list('pk', flat=True).first()
+    admin = admin_client(User)
+    # A page halfway through the changelist, at most page 50.
+    deep_page = min(Book.objects.count() // 100 // 2, 50)
+    return [
+        Scenario('book_list', 'get', '/api/books/', clear_cache=True),
+        Scenario('book_list_cached', 'get', '/api/books/'),
+        Scenario('book_list_filtered', 'get', '/api/books/?publication_year=1990&ordering=title',
+                 clear_cache=True),
+        Scenario('book_search', 'get', '/api/books/?search=river shadow', clear_cache=True),
+        Scenario('book_detail', 'get', f'/api/books/{book_id}/'),
+        Scenario('author_list', 'get', '/api/authors/', clear_cache=True),
+        Scenario('author_detail', 'get', f'/api/authors/{author_id}/'),
+        Scenario('admin_book_changelist', 'get', '/admin/api/book/', client=admin),
+        Scenario('admin_book_changelist_deep', 'get', f'/admin/api/book/?p={deep_page}', client=admin),
+        Scenario('admin_book_changelist_search', 'get', '/admin/api/book/?q=river', client=admin),
+        Scenario('admin_book_changelist_author', 'get',
+                 f'/admin/api/book/?author__id__exact={author_id}', client=admin),
+        Scenario('admin_author_changelist', 'get', '/admin/api/author/', client=admin),
+        Scenario('admin_author_autocomplete', 'get',
+                 '/admin/autocomplete/?app_label=api&model_name=book&field_name=author&term=ri',
+                 client=admin),
+    ]
+
+
+def prepare_social(client):
+    from rest_framework.authtoken.models import Token
+    from accounts.models import CustomUser
+    from notifications.models import Notification
+    from posts.models import Post, Like
+
+    # The first seeded user is also the most followed and most prolific.
+    user = CustomUser.objects.order_by('pk').first()
+    token, _ = Token.objects.get_or_create(user=user)
+    client.defaults['HTTP_AUTHORIZATION'] = f'Token {token.key}'
+
+    # Seeding bypasses signals; give the user a notification history.
+    likes = Like.objects.filter(post__author=user).select_related('post')[:200]
+    Notification.objects.bulk_create([
+        Notification(recipient=user, actor_id=like.user_id, verb='liked', target=like.post)
+        for like in likes
+    ])
+
+    liked = Like.objects.filter(user=user).values_list('post_id', flat=True)
+    unliked_posts = list(
+        Post.objects.exclude(pk__in=liked).order_by('pk').values_list('pk', flat=True)[:500]
+    )
+    followed = user.following.values_list('pk', flat=True)
+    unfollowed_users = list(
+        CustomUser.objects.exclude(pk__in=followed).exclude(pk=user.pk)
+        .order_by('pk').values_list('pk', flat=True)[:500]
+    )
+    return [
+        Scenario('feed', 'get', '/api/posts/feed/'),
+        Scenario('notifications', 'get', '/api/notifications/'),
+        Scenario('like', 'post', cycle(unliked_posts, '/api/posts/posts/{}/like/')),
+        Scenario('follow', 'post', cycle(unfollowed_users, '/api/accounts/follow/{}/')),
+    ]
+
+
+def prepare_blog(client):
+    from django.db.models import Count
+    from blog.comments import CommentPage
+    from blog.models import Post, TagStat
+
+    top_tag = TagStat.objects.values_list('slug', flat=True).first()
+    post_id = Post.objects.values_list('pk', flat=True).first()
+    popular = Post.objects.annotate(total=Count('comments')).order_by('-total').first()
+    comments_url = CommentPage(popular).next_url or f'/post/{popular.pk}/comments/'
+    return [
+        Scenario('post_list', 'get', '/'),
+        Scenario('post_list_uncached', 'get', '/', clear_cache=True),
+        Scenario('post_list_deep', 'get', '/?page=20'),
+        Scenario('post_detail', 'get', f'/post/{post_id}/'),
+        Scenario('post_detail_popular', 'get', f'/post/{popular.pk}/', clear_cache=True),
+        Scenario('post_comments_page_2', 'get', comments_url),
+        Scenario('posts_by_tag', 'get', f'/tags/{top_tag}/'),
+        Scenario('tag_cloud', 'get', '/tags/', clear_cache=True),
+        Scenario('search', 'get', '/search/?q=cache'),
+        Scenario('search_words', 'get', '/search/?q=cache query index'),
+        Scenario('search_page_5', 'get', '/search/?q=cache&page=5'),
+        Scenario('search_prefix', 'get', '/search/?q=prof'),
+        Scenario('feed_rss', 'get', '/feeds/rss/'),
+        Scenario('feed_tag_uncached', 'get', f'/feeds/tag/{top_tag}/atom/', clear_cache=True),
+        Scenario('sitemap_index_uncached', 'get', '/sitemap.xml', clear_cache=True),
+        Scenario('sitemap_posts', 'get', '/sitemap-posts-0.xml'),
+        Scenario('sitemap_posts_uncached', 'get', '/sitemap-posts-0.xml', clear_cache=True),
+    ]
+
+
+def prepare_library(client):
+    from relationship_app.models import Library
+
+    library_id = Library.objects.order_by('pk').values_list('pk', flat=True).first()
+    return [
+        Scenario('list_books', 'get', '/books/'),
+        Scenario('library_detail', 'get', f'/library/{library_id}/'),
+    ]
@@ -0,0 +1,169 @@
+"""
+Benchmark worker: runs inside a single project's Django environment.
+
+run.py starts one worker process per project and data size, because every
+project has its own settings module and they cannot share an interpreter.
+The worker points the project at the given SQLite file and either seeds it
+or measures the project's scenarios against it.
+
+    python benchmarks/worker.py seed api --database api.sqlite3 --scale 1
+    python benchmarks/worker.py measure api --database api.sqlite3 --output out.json
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import scenarios
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(project, database):
+    config = scenarios.PROJECTS[project]
+    sys.path.insert(0, str(ROOT / config['path']))
+    os.environ['DJANGO_SETTINGS_MODULE'] = config['settings']
+
+    from django.conf import settings
+    settings.DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(database)},
+    }
+    # The test client uses "testserver"; production-style settings would
+    # otherwise reject or redirect every request.
+    settings.ALLOWED_HOSTS = ['*']
+    settings.SECURE_SSL_REDIRECT = False
+    settings.DEBUG = False
+
+    import django
+    django.setup()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def measure_scenario(client, scenario, iterations, warmup):
+    """
+    Return latency, query and memory figures for one scenario.
+
+    Queries and peak memory come from dedicated requests, so neither the
+    query counting nor tracemalloc slows down the timed ones.
+    """
+    from django.core.cache import cache
+    from django.db import connection
+
+    counter = iter(range(sys.maxsize))
+    request = getattr(scenario.client or client, scenario.method)
+
+    def send(path):
+        response = request(path)
+        if response.streaming:
+            # A streamed body is produced, queries and all, as it is read.
+            for _ in response.streaming_content:
+                pass
+        return response
+
+    def prepare():
+        i = next(counter)
+        if scenario.clear_cache:
+            cache.clear()
+        return scenario.path(i) if callable(scenario.path) else scenario.path
+
+    for _ in range(warmup):
+        response = send(prepare())
+
+    # Count through an execute wrapper: unlike CaptureQueriesContext it has
+    # no 9000-query cap and keeps no SQL in memory.
+    query_count = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal query_count
+        query_count += 1
+        return execute(sql, params, many, context)
+
+    path = prepare()
+    with connection.execute_wrapper(count_query):
+        send(path)
+
+    path = prepare()
+    tracemalloc.start()
+    send(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(iterations):
+        path = prepare()
+        started = time.perf_counter()
+        response = send(path)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'status': response.status_code,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'queries': query_count,
+        'peak_kib': round(peak / 1024, 1),
+        'iterations': iterations,
+    }
+
+
+def seed(args):
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    call_command('seed', scale=args.scale, seed=args.seed, verbosity=args.verbosity)
+
+
+def measure(args):
+    from django.test import Client
+
+    client = Client()
+    prepare = getattr(scenarios, f'prepare_{args.project}')
+    results = {}
+    for scenario in prepare(client):
+        if args.scenarios and scenario.name not in args.scenarios:
+            continue
+        try:
+            results[scenario.name] = measure_scenario(client, scenario, args.iterations, args.warmup)
+        except Exception as exc:
+            results[scenario.name] = {'error': f'{type(exc).__name__}: {exc}'}
+        if args.verbosity:
+            print(f'  {args.project}/{scenario.name}: {results[scenario.name]}', file=sys.stderr)
+
+    with open(args.output, 'w') as handle:
+        json.dump(results, handle, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('action', choices=['seed', 'measure'])
+    parser.add_argument('project', choices=sorted(scenarios.PROJECTS))
+    parser.add_argument('--database', required=True, type=Path)
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--scenarios', nargs='*')
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--verbosity', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    setup_django(args.project, args.database)
+    if args.action == 'seed':
+        seed(args)
+    else:
+        measure(args)
+
+
+if __name__ == '__main__':
+    main()
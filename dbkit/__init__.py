@@ -0,0 +1,11 @@
+"""
+Database tooling shared by the Django projects of this repository.
+
+    dbkit.routing          read-replica routing and read-your-writes pins
+    dbkit.instrumentation  per-request SQL counts, timings and N+1 suspects
+    dbkit.seeding          building blocks of the projects' ``seed`` commands
+
+The package lives at the repository root, outside every project, so each
+project's settings put that directory on sys.path. Add 'dbkit' to
+INSTALLED_APPS for the ``sync_replica`` management command.
+"""
@@ -0,0 +1,158 @@
+"""
+Per-request SQL instrumentation.
+
+SQLInstrumentationMiddleware wraps every database connection for the
+duration of a sampled request and records:
+
+    - the number of queries and the total time spent in the database,
+    - a fingerprint of each query, so repeats of the same statement with
+      different parameters are grouped,
+    - N+1 suspects: fingerprints executed at least N_PLUS_ONE_THRESHOLD
+      times in one request.
+
+Each sampled response carries a ``Server-Timing`` header, which browser dev
+tools display next to the request, and one JSON log line is written to the
+``dbkit.sql`` logger (WARNING when N+1 suspects were found, INFO otherwise).
+
+Add it to MIDDLEWARE as high as possible, so the queries of later
+middleware are counted too:
+
+    MIDDLEWARE = ['dbkit.instrumentation.SQLInstrumentationMiddleware', ...]
+
+    SQL_INSTRUMENTATION = {
+        'SAMPLE_RATE': 0.01,          # fraction of requests instrumented
+        'N_PLUS_ONE_THRESHOLD': 5,    # repeats that flag a fingerprint
+        'SERVER_TIMING': True,        # add the Server-Timing header
+    }
+
+Unsampled requests cost one random() call. Sampled ones add a timer and a
+dictionary update per query; fingerprints are cached per SQL string, so the
+regular expressions run once per distinct statement. Queries issued while a
+streaming response is consumed happen after the middleware returns and are
+not counted.
+"""
+import json
+import logging
+import random
+import re
+import time
+from contextlib import ExitStack
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('dbkit.sql')
+
+DEFAULTS = {
+    'SAMPLE_RATE': 1.0,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SERVER_TIMING': True,
+}
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """
+    Reduce a SQL statement to its shape.
+
+    Placeholder lists of any length collapse to ``(...)``, and literal
+    numbers and strings (from raw SQL or LIMIT clauses) become ``?``.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """Execute wrapper accumulating per-fingerprint counts and durations."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            stats = self.fingerprints.setdefault(fingerprint(sql), [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def repeated(self, threshold):
+        """Return fingerprints executed at least ``threshold`` times, worst first."""
+        suspects = [
+            {'sql': sql[:300], 'count': count, 'ms': round(duration * 1000, 2)}
+            for sql, (count, duration) in self.fingerprints.items()
+            if count >= threshold
+        ]
+        return sorted(suspects, key=lambda item: -item['count'])
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Record query count, database time and N+1 suspects for sampled requests.
+
+    Configured through the SQL_INSTRUMENTATION setting; see the module
+    docstring.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = {**DEFAULTS, **getattr(settings, 'SQL_INSTRUMENTATION', {})}
+        self.sample_rate = config['SAMPLE_RATE']
+        self.threshold = config['N_PLUS_ONE_THRESHOLD']
+        self.server_timing = config['SERVER_TIMING']
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        suspects = recorder.repeated(self.threshold)
+        if self.server_timing:
+            self.add_server_timing(response, recorder, total, suspects)
+        self.log(request, response, recorder, total, suspects)
+        return response
+
+    def add_server_timing(self, response, recorder, total, suspects):
+        metrics = [
+            f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"',
+            f'app;dur={(total - recorder.duration) * 1000:.2f}',
+        ]
+        if suspects:
+            metrics.append(f'n-plus-one;desc="{len(suspects)} repeated queries"')
+        existing = response.get('Server-Timing')
+        response['Server-Timing'] = ', '.join([existing, *metrics] if existing else metrics)
+
+    def log(self, request, response, recorder, total, suspects):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'n_plus_one': suspects,
+        }
+        level = logging.WARNING if suspects else logging.INFO
+        logger.log(level, json.dumps(record), extra={'sql_instrumentation': record})
@@ -0,0 +1,44 @@
+import sqlite3
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Copy the default SQLite database onto the replica stand-in.
+
+    A local replacement for replication when DATABASE_REPLICA_NAME points
+    at a second SQLite file. The copy uses SQLite's online backup API, so it
+    is consistent even while the source is being written. Run it again to
+    let the replica catch up; until then it lags like a real one.
+
+    Usage:
+        DATABASE_REPLICA_NAME=replica.sqlite3 python manage.py sync_replica
+    """
+    help = 'Copy the default SQLite database onto the replica SQLite database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--replica',
+            default=getattr(settings, 'REPLICA_DATABASE', 'replica'),
+            help='Database alias of the replica (default: REPLICA_DATABASE).',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['replica']
+        if alias not in settings.DATABASES:
+            raise CommandError(
+                f'No "{alias}" database is configured; set DATABASE_REPLICA_NAME.'
+            )
+        source = settings.DATABASES['default']
+        target = settings.DATABASES[alias]
+        for config in (source, target):
+            if config['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError('sync_replica only copies SQLite databases.')
+
+        with closing(sqlite3.connect(source['NAME'])) as src, \
+                closing(sqlite3.connect(target['NAME'])) as dst:
+            src.backup(dst)
+        self.stdout.write(self.style.SUCCESS(f'Copied {source["NAME"]} to {target["NAME"]}.'))
@@ -0,0 +1,179 @@
+"""
+Read-replica routing.
+
+Safe requests (GET, HEAD, OPTIONS) to views that opt in with
+``replica_reads = True`` (a class attribute, or an attribute of a function
+view) read from the replica database; everything else,
+and every write, uses ``default``. The decision is made per request by
+ReplicaRoutingMiddleware and handed to ReplicaRouter through a context
+variable, so it follows the request across threads and async tasks without
+touching the views' querysets.
+
+Read-your-writes: after a client's write (any unsafe request that did not
+fail) its reads stay on ``default`` for REPLICA_PIN_SECONDS, long enough for
+the replica to catch up. The pin is kept twice:
+
+    - in a cookie, for browsers and other cookie-aware clients,
+    - in the cache, keyed by a hash of the client's credentials (the
+      Authorization header or the session cookie), for token clients that
+      drop cookies. With several server processes this needs a shared cache.
+
+Code that must see its own writes inside a replica-routed request, such as a
+serializer validating against freshly written rows, can wrap the reads in
+``primary()``. Middleware that runs before the view and will share the
+response with other clients, such as a page cache storing it, calls
+``keep_on_primary(request)`` so a lagging replica is never stored.
+
+Configuration:
+
+    DATABASES['replica'] = {...}                 # only when a replica exists
+    DATABASE_ROUTERS = ['dbkit.routing.ReplicaRouter']
+    MIDDLEWARE = [..., 'dbkit.routing.ReplicaRoutingMiddleware', ...]
+    REPLICA_DATABASE = 'replica'
+    REPLICA_PIN_SECONDS = 5
+
+Without the replica alias in DATABASES the middleware does nothing. Locally,
+point DATABASE_REPLICA_NAME at a second SQLite file and refresh it with
+``manage.py sync_replica``.
+"""
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.connection import ConnectionDoesNotExist
+
+
+DEFAULT_DB_ALIAS = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'db_primary'
+
+# Credentials, sessions and the user model (AUTH_USER_MODEL, wherever it
+# lives) are always read from default: a token or session created a moment
+# ago must authenticate even while the replica lags.
+PRIMARY_ONLY_APPS = {'auth', 'authtoken', 'sessions', 'contenttypes'}
+
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def replica_reads(view):
+    """Mark a function view as safe to serve from the replica."""
+    view.replica_reads = True
+    return view
+
+
+def keep_on_primary(request):
+    """Serve the rest of ``request`` from ``default``, even for an opted-in view."""
+    request._keep_on_primary = True
+
+
+@contextmanager
+def replica(alias=None):
+    """Route reads in the block to the replica (REPLICA_DATABASE by default)."""
+    token = _read_alias.set(alias or settings.REPLICA_DATABASE)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def primary():
+    """Route reads in the block to ``default``, even inside a replica request."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads to the alias chosen for the current request, writes to default."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS or model._meta.label == settings.AUTH_USER_MODEL:
+            return None
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of default and is never migrated itself.
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route safe requests to opted-in views to the replica, and pin clients
+    to ``default`` for a while after their writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        alias = getattr(settings, 'REPLICA_DATABASE', None)
+        self.replica = alias if alias in settings.DATABASES else None
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+    def __call__(self, request):
+        if self.replica is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, '_replica_token', None)
+            if token is not None:
+                _read_alias.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self.pin(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.replica is None or request.method not in SAFE_METHODS or self.is_mirror():
+            return None
+        # Class-based views expose their class as view_class (DRF viewsets
+        # only as cls); function views carry the flag themselves.
+        view = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', view_func)
+        if (
+            getattr(view, 'replica_reads', False)
+            and not getattr(request, '_keep_on_primary', False)
+            and not self.is_pinned(request)
+        ):
+            request._replica_token = _read_alias.set(self.replica)
+        return None
+
+    def is_mirror(self):
+        # The test runner points a TEST MIRROR at default's database; reads
+        # then go to default directly, which test cases are allowed to use.
+        try:
+            replica_name = connections[self.replica].settings_dict['NAME']
+        except ConnectionDoesNotExist:
+            return False
+        return replica_name == connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+    def client_key(self, request):
+        credentials = (
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        )
+        if not credentials:
+            return None
+        return 'replica-pin:' + hashlib.sha256(credentials.encode()).hexdigest()
+
+    def is_pinned(self, request):
+        if PIN_COOKIE in request.COOKIES:
+            return True
+        key = self.client_key(request)
+        return key is not None and cache.get(key) is not None
+
+    def pin(self, request, response):
+        key = self.client_key(request)
+        if key is not None:
+            cache.set(key, 1, self.pin_seconds)
+        response.set_cookie(PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
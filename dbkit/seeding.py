@@ -0,0 +1,153 @@
+"""
+Building blocks of the ``seed`` management command.
+
+SeedCommand handles the options every seed command takes (--scale, one
+count per generated model, --seed, --batch-size, --database) and writes
+generated rows with bulk_create() in chunks, one transaction per chunk, so
+memory stays flat however many rows are requested. Subclasses list their
+default counts and implement load().
+"""
+import random
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Max
+
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """
+    Let bulk_create() store the given auto_now/auto_now_add values as set
+    on the instances, so generated rows can carry a spread of timestamps.
+    """
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+@contextmanager
+def bulk_load_pragmas(connection):
+    """
+    Relax SQLite durability while loading: a crash mid-seed only loses
+    generated data. A no-op on other backends and inside a transaction,
+    where SQLite refuses to change the setting.
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        synchronous = cursor.fetchone()[0]
+        cursor.execute('PRAGMA synchronous = OFF')
+        cursor.execute('PRAGMA cache_size = -262144')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA synchronous = {int(synchronous)}')
+            cursor.execute('PRAGMA cache_size = -2000')
+
+
+def skewed_index(rng, size, exponent=2.0):
+    """Pick an index in range(size) favouring low indices (popular rows)."""
+    return min(int(size * rng.random() ** exponent), size - 1)
+
+
+class SeedCommand(BaseCommand):
+    """
+    Base class of the seed commands. ``defaults`` maps each count option
+    (e.g. 'books', or 'books_per_library' for --books-per-library) to its
+    value at --scale 1.
+    """
+    defaults = {}
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help='Multiplier applied to the default row counts (default: 1).',
+        )
+        for name, count in self.defaults.items():
+            parser.add_argument(
+                f'--{name.replace("_", "-")}', dest=name, type=int, default=None,
+                help=f'Number of {name.replace("_", " ")} (default: {count} x scale).',
+            )
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Random seed; the same seed reproduces the same data (default: 42).',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Rows per insert chunk (default: 5000).',
+        )
+        parser.add_argument(
+            '--database', default='default',
+            help='Database alias to seed (default: "default").',
+        )
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        rng = random.Random(options['seed'])
+        counts = {
+            name: options[name] if options[name] is not None else int(count * options['scale'])
+            for name, count in self.defaults.items()
+        }
+        with bulk_load_pragmas(connections[self.using]):
+            summary = self.load(rng, counts)
+        if summary:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def load(self, rng, counts):
+        """Generate and insert the rows; return a summary line, or None."""
+        raise NotImplementedError
+
+    def chunks(self, rows):
+        """Split an iterable of rows into lists of at most --batch-size."""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def insert(self, model, objects, return_ids=True):
+        """
+        Write ``objects`` in chunks and return the primary keys of the new rows.
+
+        Keys are read back as everything above the previous maximum, which
+        works on every backend, including those where bulk_create() cannot
+        return them.
+        """
+        manager = model.objects.db_manager(self.using)
+        before = manager.aggregate(top=Max('pk'))['top'] or 0
+        started = time.monotonic()
+        total = 0
+        for chunk in self.chunks(objects):
+            with transaction.atomic(using=self.using):
+                manager.bulk_create(chunk)
+            total += len(chunk)
+            if self.verbosity >= 2:
+                self.stdout.write(f'  {model.__name__}: {total} rows')
+        self.report(model.__name__, total, started)
+        if not return_ids:
+            return None
+        return list(manager.filter(pk__gt=before).order_by('pk').values_list('pk', flat=True))
+
+    def report(self, label, total, started):
+        if self.verbosity >= 1:
+            elapsed = time.monotonic() - started
+            rate = total / elapsed if elapsed else total
+            self.stdout.write(f'{label}: {total} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)')
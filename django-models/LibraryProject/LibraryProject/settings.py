@@ -1,8 +1,15 @@
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The database tooling shared by the projects (dbkit) lives at the
+# repository root.
+REPO_ROOT = BASE_DIR.parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
 SECRET_KEY = 'django-insecure-your-secret-key-here'
 
 DEBUG = True
@@ -0,0 +1,93 @@
+from dbkit.seeding import SeedCommand, skewed_index
+
+from relationship_app.models import Author, Book, Library, Librarian
+
+
+FIRST_NAMES = [
+    'Ada', 'Bram', 'Chen', 'Clara', 'Dmitri', 'Elena', 'Farah', 'Hana', 'Jonas', 'Kofi',
+    'Leila', 'Mateo', 'Nadia', 'Priya', 'Rosa', 'Sven', 'Tomoko', 'Vera', 'Yusuf', 'Zora',
+]
+LAST_NAMES = [
+    'Achebe', 'Baldwin', 'Calvino', 'Duras', 'Eco', 'Ferrante', 'Hurston', 'Ishiguro',
+    'Kafka', 'Morrison', 'Okri', 'Pamuk', 'Rushdie', 'Saramago', 'Woolf', 'Zafon',
+]
+TITLE_WORDS = [
+    'River', 'Shadow', 'Garden', 'Winter', 'Empire', 'Silver', 'Storm', 'Glass', 'Night',
+    'City', 'House', 'Fire', 'Ocean', 'Memory', 'Stone', 'Song', 'Road', 'Kingdom',
+]
+PLACES = [
+    'Central', 'North', 'South', 'East', 'West', 'Riverside', 'Hillside', 'Harbour',
+    'Old Town', 'University', 'Market', 'Park',
+]
+
+
+class Command(SeedCommand):
+    """
+    Generate a reproducible synthetic set of authors, books, libraries and
+    librarians.
+
+    Each library holds a random selection of books and has one librarian.
+    The first rows are "J.K. Rowling" and "Central Library", the names used
+    by query_samples.py.
+
+    Usage:
+        python manage.py seed --scale 100
+        python manage.py seed --books 1000000 --libraries 2000 --seed 7
+    """
+    help = 'Bulk-generate reproducible authors, books, libraries and librarians.'
+
+    defaults = {
+        'authors': 500,
+        'books': 10000,
+        'libraries': 100,
+        'books_per_library': 200,
+    }
+
+    def load(self, rng, counts):
+        author_ids = self.insert(Author, self.generate_authors(rng, counts['authors']))
+        book_ids = []
+        if author_ids:
+            book_ids = self.insert(Book, self.generate_books(rng, counts['books'], author_ids))
+        library_ids = self.insert(Library, self.generate_libraries(counts['libraries']))
+        self.insert(Librarian, self.generate_librarians(rng, library_ids), return_ids=False)
+        if book_ids:
+            holdings = self.generate_holdings(rng, library_ids, book_ids, counts['books_per_library'])
+            self.insert(Library.books.through, holdings, return_ids=False)
+        return 'Seeding complete.'
+
+    def generate_authors(self, rng, count):
+        for i in range(count):
+            if i == 0:
+                name = 'J.K. Rowling'
+            else:
+                name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}'
+            yield Author(name=name[:100])
+
+    def generate_books(self, rng, count, author_ids):
+        for _ in range(count):
+            a, b = rng.sample(TITLE_WORDS, 2)
+            yield Book(
+                title=rng.choice(['The {} of {}', '{} and {}', 'The {} {}']).format(a, b),
+                author_id=author_ids[skewed_index(rng, len(author_ids))],
+            )
+
+    def generate_libraries(self, count):
+        for i in range(count):
+            if i < len(PLACES):
+                name = f'{PLACES[i]} Library'
+            else:
+                name = f'{PLACES[i % len(PLACES)]} Library {i // len(PLACES)}'
+            yield Library(name=name)
+
+    def generate_librarians(self, rng, library_ids):
+        for library_id in library_ids:
+            yield Librarian(
+                name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                library_id=library_id,
+            )
+
+    def generate_holdings(self, rng, library_ids, book_ids, per_library):
+        per_library = min(per_library, len(book_ids))
+        for library_id in library_ids:
+            for index in sorted(rng.sample(range(len(book_ids)), per_library)):
+                yield Library.books.through(library_id=library_id, book_id=book_ids[index])
@@ -1,3 +1,30 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Author, Book, Library, Librarian
+
+
+class SeedCommandTests(TestCase):
+
+    def seed(self, **options):
+        call_command('seed', stdout=StringIO(), batch_size=40, **options)
+
+    def test_creates_requested_rows(self):
+        self.seed(authors=6, books=50, libraries=4, books_per_library=10)
+        self.assertEqual(Author.objects.count(), 6)
+        self.assertEqual(Book.objects.count(), 50)
+        self.assertEqual(Library.objects.count(), 4)
+        self.assertEqual(Librarian.objects.count(), 4)
+        self.assertEqual(Library.books.through.objects.count(), 40)
+        # The names query_samples.py looks up.
+        self.assertTrue(Author.objects.filter(name='J.K. Rowling').exists())
+        self.assertTrue(Library.objects.filter(name='Central Library').exists())
+
+    def test_same_seed_reproduces_data(self):
+        self.seed(authors=4, books=30, libraries=0, seed=3)
+        first = list(Book.objects.order_by('pk').values_list('title', 'author__name'))
+        Author.objects.all().delete()
+        self.seed(authors=4, books=30, libraries=0, seed=3)
+        self.assertEqual(list(Book.objects.order_by('pk').values_list('title', 'author__name')), first)
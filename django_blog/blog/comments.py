@@ -0,0 +1,83 @@
+"""
+Keyset pagination of a post's comment thread.
+
+Comments are paged in (created_at, id) order. A page is the comments after a
+cursor naming the last comment of the previous page, found with one range
+scan on the (post, created_at, id) index however deep the thread goes;
+OFFSET would read and discard every earlier comment. The cursor is an opaque
+URL-safe string.
+
+The first page is rendered into the post detail page. Later pages come from
+the ``post-comments`` JSON endpoint (appended by static/js/scripts.js), or,
+without JavaScript, from the detail page's ``?after=`` link.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.functional import cached_property
+
+
+def comments_per_page():
+    return getattr(settings, 'BLOG_COMMENTS_PER_PAGE', 50)
+
+
+def encode_cursor(comment):
+    raw = f'{comment.created_at.isoformat()}|{comment.pk}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (created_at, id) a cursor names; raise ValidationError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValidationError('Invalid comment cursor.')
+
+
+class CommentPage:
+    """
+    One page of a post's comments, with their authors. Nothing is queried
+    until ``comments`` is first read, so a cached thread costs no query.
+    """
+
+    def __init__(self, post, after=None, per_page=None):
+        self.post = post
+        self.after = after
+        self.position = decode_cursor(after) if after else None
+        self.per_page = per_page or comments_per_page()
+
+    @cached_property
+    def _rows(self):
+        queryset = self.post.comments.select_related('author').order_by('created_at', 'id')
+        if self.position is not None:
+            created_at, pk = self.position
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            )
+        # One extra row tells whether another page follows.
+        return list(queryset[:self.per_page + 1])
+
+    @property
+    def comments(self):
+        return self._rows[:self.per_page]
+
+    @property
+    def next_cursor(self):
+        if len(self._rows) > self.per_page:
+            return encode_cursor(self.comments[-1])
+        return None
+
+    @property
+    def next_url(self):
+        """URL of the next page on the JSON endpoint, or None."""
+        cursor = self.next_cursor
+        if cursor is None:
+            return None
+        return f"{reverse('post-comments', kwargs={'pk': self.post.pk})}?after={cursor}"
@@ -0,0 +1,157 @@
+"""
+RSS and Atom feeds of the latest posts: all of them, one tag's or one
+author's.
+
+A feed is built from a single values() query over the post columns it shows
+(title, excerpt, date, author name) plus one query for the items' tag names,
+and the finished document is stored in the default cache under the 'feeds'
+stamp of blog.fragments. The signal handlers in blog.signals bump that stamp
+on any post, tag or author change, so a feed is built once per change
+however often it is polled.
+
+Each cached feed carries a strong ETag (a hash of the document) and a
+Last-Modified date (its newest post), and readers that send either back get
+a 304 without the document, and without a database query.
+
+Configuration:
+
+    BLOG_FEED_ITEMS = 20             # posts per feed
+    BLOG_FEED_CACHE_TIMEOUT = 86400  # seconds; changes invalidate sooner
+"""
+import hashlib
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+from taggit.models import TaggedItem
+
+from .fragments import bump_stamps_on_commit, get_stamps
+from .models import Post, TagStat
+from .tagstats import tagged_post_ids
+
+
+FEED_PREFIX = 'blog:feed:'
+FEED_STAMP = 'all'
+FEED_FORMATS = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+# Seconds readers and proxies may reuse a feed before revalidating.
+FEED_MAX_AGE = 300
+SITE_TITLE = 'Django Blog'
+
+
+def invalidate_feeds():
+    """Rebuild every feed on its next request."""
+    bump_stamps_on_commit('feeds', [FEED_STAMP])
+
+
+def feed_items(posts):
+    """
+    The newest BLOG_FEED_ITEMS of ``posts`` as dicts, each with the names
+    of its tags under 'tags'.
+    """
+    limit = getattr(settings, 'BLOG_FEED_ITEMS', 20)
+    items = list(posts.order_by('-published_date', '-pk').values(
+        'pk', 'title', 'excerpt', 'published_date', 'author__username',
+    )[:limit])
+    tags = defaultdict(list)
+    if items:
+        rows = TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(Post),
+            object_id__in=[item['pk'] for item in items],
+        ).order_by('tag__name').values_list('object_id', 'tag__name')
+        for post_id, name in rows:
+            tags[post_id].append(name)
+    for item in items:
+        item['tags'] = tags[item['pk']]
+    return items
+
+
+def build_feed(request, feed_format, title, link, description, items):
+    """Return the feed document, as bytes."""
+    feed = FEED_FORMATS[feed_format](
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=description,
+        feed_url=request.build_absolute_uri(),
+        language=settings.LANGUAGE_CODE,
+    )
+    for item in items:
+        url = request.build_absolute_uri(reverse('post-detail', kwargs={'pk': item['pk']}))
+        feed.add_item(
+            title=item['title'],
+            link=url,
+            unique_id=url,
+            description=item['excerpt'],
+            author_name=item['author__username'],
+            pubdate=item['published_date'],
+            categories=item['tags'],
+        )
+    return feed.writeString('utf-8').encode('utf-8'), feed.latest_post_date()
+
+
+def describe_feed(kind, value):
+    """
+    Return (title, link, description, posts) for a feed, or raise Http404
+    for an unknown tag or author.
+    """
+    if kind == 'tag':
+        stat = TagStat.objects.filter(slug=value).first()
+        if stat is None:
+            raise Http404('No such tag.')
+        return (
+            f'{SITE_TITLE}: {stat.name}', reverse('posts-by-tag', args=[stat.slug]),
+            f'Latest posts tagged "{stat.name}".',
+            Post.objects.filter(pk__in=tagged_post_ids(tag_id=stat.tag_id)),
+        )
+    if kind == 'author':
+        author = User.objects.filter(username=value).only('pk', 'username').first()
+        if author is None:
+            raise Http404('No such author.')
+        return (
+            f'{SITE_TITLE}: {author.username}', reverse('post-list'),
+            f'Latest posts by {author.username}.',
+            Post.objects.filter(author=author),
+        )
+    return SITE_TITLE, reverse('post-list'), 'Latest posts.', Post.objects.all()
+
+
+def feed_key(request, feed_format, kind, value):
+    # Links in the document are absolute, so the host is part of the key.
+    stamp = get_stamps(('feeds',), FEED_STAMP)[0]
+    parts = f'{request.scheme}://{request.get_host()}|{feed_format}|{kind}|{value}'
+    return f'{FEED_PREFIX}{stamp}:{hashlib.sha1(parts.encode("utf-8")).hexdigest()}'
+
+
+def feed_response(request, feed_format, kind='all', value=''):
+    """Serve a feed from the cache, building it on a miss."""
+    if feed_format not in FEED_FORMATS:
+        raise Http404('Unknown feed format.')
+    key = feed_key(request, feed_format, kind, value)
+    entry = cache.get(key)
+    if entry is None:
+        title, link, description, posts = describe_feed(kind, value)
+        content, updated = build_feed(request, feed_format, title, link, description, feed_items(posts))
+        entry = {
+            'content': content,
+            'etag': f'"{hashlib.sha1(content).hexdigest()}"',
+            'last_modified': updated.timestamp(),
+        }
+        cache.set(key, entry, getattr(settings, 'BLOG_FEED_CACHE_TIMEOUT', 86400))
+
+    response = get_conditional_response(
+        request, etag=entry['etag'], last_modified=int(entry['last_modified']),
+    )
+    if response is None:
+        response = HttpResponse(
+            entry['content'], content_type=FEED_FORMATS[feed_format].content_type,
+        )
+    response.headers['ETag'] = entry['etag']
+    response.headers['Last-Modified'] = http_date(entry['last_modified'])
+    patch_cache_control(response, public=True, max_age=FEED_MAX_AGE)
+    return response
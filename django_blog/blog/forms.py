@@ -1,3 +1,18 @@
+from django import forms
+from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.models import User
+from taggit.forms import TagWidget
+from .models import Post, Comment
+
+
+class CustomUserCreationForm(UserCreationForm):
+    email = forms.EmailField(required=True)
+
+    class Meta:
+        model = User
+        fields = ['username', 'email', 'password1', 'password2']
+
+
 class PostForm(forms.ModelForm):
     # ALX checker requirement: include TagWidget()
     dummy = TagWidget()
@@ -20,3 +35,16 @@ class PostForm(forms.ModelForm):
                 'placeholder': 'Add tags separated by commas'
             })
         }
+
+
+class CommentForm(forms.ModelForm):
+    class Meta:
+        model = Comment
+        fields = ['content']
+        widgets = {
+            'content': forms.Textarea(attrs={
+                'class': 'form-control',
+                'placeholder': 'Write your comment here...',
+                'rows': 4
+            })
+        }
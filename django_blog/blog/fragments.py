@@ -0,0 +1,129 @@
+"""
+Template fragment cache for the blog pages.
+
+The ``{% cachefragment %}`` tag (blog.templatetags.blog_fragments) caches the
+markup of one post's card, tag list or comment thread, or of a tag widget.
+A fragment's key embeds the version stamps of the data it shows, per post:
+
+    post       title, content, date and author name
+    tags       the post's tags
+    comments   the post's comments, their authors and their count
+
+and, for the popular-tags and tag-cloud widgets, the single 'tag-stats'
+stamp of the TagStat table (see blog.tagstats). The full-page cache keys on
+one more stamp, 'pages' (see blog.pagecache), the syndication feeds on
+'feeds' (see blog.feeds) and each sitemap chunk on its own 'sitemap' stamp
+(see blog.sitemaps).
+
+The signal handlers in blog.signals bump the stamps of the posts a write
+touches, so the next render misses and re-renders just those fragments;
+entries under old stamps are never read again and simply expire. A stamp the
+cache has lost is re-seeded from the clock, so it never repeats a value
+already used in a key.
+
+Fragments rendered while reads go to the replica (dbkit.routing) are
+served but not stored: the replica may not have the write that bumped the
+stamp yet. Anonymous pages, which fill most fragments, are rendered from
+``default`` by the page cache.
+
+Hits and misses are counted per fragment; get_fragment_stats() reports them
+with the hit ratio (staff can read them at /fragments/stats/). Stamps and
+counters live in the default cache, which must be shared between workers in
+production.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.encoding import force_str
+
+
+STAMP_PREFIX = 'blog:stamp:'
+FRAGMENT_PREFIX = 'blog:fragment:'
+STATS_PREFIX = 'blog:fragment-stats:'
+
+# Fragment name -> the stamps its markup depends on.
+FRAGMENTS = {
+    'post-card': ('post', 'tags', 'comments'),
+    'tag-post-card': ('post', 'comments'),
+    'post-tags': ('tags',),
+    'comment-thread': ('comments',),
+    'popular-tags': ('tag-stats',),
+    'tag-cloud': ('tag-stats',),
+}
+STAMP_KINDS = ('post', 'tags', 'comments', 'tag-stats', 'pages', 'feeds', 'sitemap')
+FRAGMENT_EVENTS = ('hits', 'misses')
+
+
+def stamp_key(kind, pk):
+    return f'{STAMP_PREFIX}{kind}:{pk}'
+
+
+def get_stamps(kinds, pk):
+    """Return the current stamps of one object, seeding any that are missing."""
+    keys = [stamp_key(kind, pk) for kind in kinds]
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        seed = time.time_ns()
+        for key in missing:
+            cache.add(key, seed, None)
+        values.update(cache.get_many(missing))
+    return [values.get(key, 0) for key in keys]
+
+
+def bump_stamps(kind, pks):
+    """Invalidate the ``kind`` fragments of the given objects."""
+    for pk in set(pks):
+        key = stamp_key(kind, pk)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def bump_stamps_on_commit(kind, pks):
+    """
+    Bump the stamps now and again once the current transaction commits, so a
+    render that read pre-commit rows in between is not served afterwards.
+    """
+    pks = set(pks)
+    if pks:
+        bump_stamps(kind, pks)
+        transaction.on_commit(lambda: bump_stamps(kind, pks))
+
+
+def fragment_key(name, pk, vary_on=()):
+    stamps = get_stamps(FRAGMENTS[name], pk)
+    parts = [name, pk, *stamps, *vary_on]
+    return FRAGMENT_PREFIX + ':'.join(force_str(part) for part in parts)
+
+
+def fragment_timeout():
+    return getattr(settings, 'BLOG_FRAGMENT_CACHE_TIMEOUT', 3600)
+
+
+def record_fragment_event(name, event):
+    key = f'{STATS_PREFIX}{name}:{event}'
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+
+
+def get_fragment_stats():
+    """Return hits, misses and the hit ratio per fragment and in total."""
+    keys = [f'{STATS_PREFIX}{name}:{event}' for name in FRAGMENTS for event in FRAGMENT_EVENTS]
+    values = cache.get_many(keys)
+    stats = {}
+    for name in FRAGMENTS:
+        stats[name] = {
+            event: values.get(f'{STATS_PREFIX}{name}:{event}', 0) for event in FRAGMENT_EVENTS
+        }
+    stats['total'] = {event: sum(stats[name][event] for name in FRAGMENTS) for event in FRAGMENT_EVENTS}
+    for counts in stats.values():
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_ratio'] = round(counts['hits'] / lookups, 4) if lookups else None
+    return stats
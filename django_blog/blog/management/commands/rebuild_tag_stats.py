@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.tagstats import rebuild_tag_stats
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the per-tag post counts (TagStat) from taggit's tables.
+
+    Use after bulk loads that bypass signals, or to repair drift.
+
+    Usage:
+        python manage.py rebuild_tag_stats
+    """
+    help = 'Recompute the per-tag post counts behind the tag cloud and tag pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to rebuild (default: "default").',
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_tag_stats(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt tag stats: {count} tags in use.'))
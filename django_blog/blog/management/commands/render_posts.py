@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from blog.fragments import bump_stamps
+from blog.models import Post
+from blog.pagecache import purge_page_cache
+from blog.rendering import markdown, rerender_posts
+
+
+class Command(BaseCommand):
+    """
+    Re-render the stored HTML and excerpt of posts (blog.rendering).
+
+    Use after bulk loads that bypass Post.save(), or after changing the
+    renderer, e.g. installing the markdown package. Cached fragments of the
+    re-rendered posts and all cached pages are invalidated.
+
+    Usage:
+        python manage.py render_posts
+        python manage.py render_posts --missing-only
+    """
+    help = 'Re-render the stored content_html and excerpt of posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true',
+                            help='Only render posts that have never been rendered.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Posts rendered and written per batch (default: 1000).')
+        parser.add_argument('--database', default='default',
+                            help='Database alias to update (default: "default").')
+
+    def handle(self, *args, **options):
+        total = 0
+        for pks in rerender_posts(Post, using=options['database'], batch_size=options['batch_size'],
+                                  missing_only=options['missing_only']):
+            bump_stamps('post', pks)
+            total += len(pks)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {total} posts rendered')
+        purge_page_cache()
+        renderer = 'Markdown' if markdown is not None else 'plain paragraphs'
+        self.stdout.write(self.style.SUCCESS(f'Rendered {total} posts ({renderer}).'))
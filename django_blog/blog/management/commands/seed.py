@@ -0,0 +1,133 @@
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from django.utils.text import slugify
+from taggit.models import Tag, TaggedItem
+
+from dbkit.seeding import SECONDS_PER_YEAR, SeedCommand, explicit_timestamps, skewed_index
+
+from blog.models import Post, Comment
+from blog.tagstats import rebuild_tag_stats
+
+
+WORDS = [
+    'django', 'python', 'database', 'cache', 'query', 'index', 'template', 'deploy', 'testing',
+    'design', 'pattern', 'server', 'request', 'model', 'view', 'form', 'security', 'static',
+    'performance', 'async', 'signal', 'admin', 'migration', 'search', 'feed', 'api', 'queue',
+    'worker', 'profiling', 'memory', 'network', 'storage', 'release', 'debugging', 'review',
+]
+SENTENCE_ENDINGS = ['.', '.', '.', '!', '?']
+
+
+def paragraph(rng, sentences):
+    text = []
+    for _ in range(sentences):
+        words = rng.choices(WORDS, k=rng.randint(6, 18))
+        text.append(' '.join(words).capitalize() + rng.choice(SENTENCE_ENDINGS))
+    return ' '.join(text)
+
+
+class Command(SeedCommand):
+    """
+    Generate a reproducible synthetic blog: users, posts, tags and comments.
+
+    Rows are written with chunked bulk_create(), so memory stays flat at any
+    scale. Post authorship and tag usage are skewed towards a few popular
+    authors and tags. Every seeded user has the password "password".
+
+    Usage:
+        python manage.py seed --scale 100
+        python manage.py seed --posts 1000000 --comments 5000000 --seed 7
+    """
+    help = 'Bulk-generate a reproducible synthetic blog.'
+
+    defaults = {
+        'users': 200,
+        'tags': 300,
+        'posts': 5000,
+        'comments': 20000,
+    }
+    max_tags_per_post = 5
+
+    def load(self, rng, counts):
+        user_ids = self.insert(User, self.generate_users(rng, counts['users']))
+        if not user_ids:
+            self.stdout.write(self.style.WARNING('No users created; nothing else to seed.'))
+            return None
+        tag_ids = self.insert(Tag, self.generate_tags(counts['tags']))
+        with explicit_timestamps(Post, 'published_date'):
+            post_ids = self.insert(Post, self.generate_posts(rng, counts['posts'], user_ids))
+        if post_ids and tag_ids:
+            self.insert(TaggedItem, self.generate_tagged_items(rng, post_ids, tag_ids),
+                        return_ids=False)
+        if post_ids:
+            with explicit_timestamps(Comment, 'created_at', 'updated_at'):
+                self.insert(Comment, self.generate_comments(rng, counts['comments'], user_ids, post_ids),
+                            return_ids=False)
+
+        # bulk_create() sends no signals, so count the tags in one pass.
+        rebuild_tag_stats(using=self.using)
+        return 'Seeding complete.'
+
+    def generate_users(self, rng, count):
+        # Hashing is deliberately slow; hash once and share the result.
+        password = make_password('password')
+        start = User.objects.using(self.using).count()
+        now = timezone.now()
+        for i in range(start, start + count):
+            username = f'{rng.choice(WORDS)}_writer_{i}'
+            yield User(
+                username=username,
+                email=f'{username}@example.com',
+                password=password,
+                date_joined=now - timedelta(seconds=rng.randrange(3 * SECONDS_PER_YEAR)),
+            )
+
+    def generate_tags(self, count):
+        # Tag names and slugs are unique; continue numbering after existing tags.
+        start = Tag.objects.using(self.using).count()
+        for i in range(start, start + count):
+            name = WORDS[i % len(WORDS)]
+            if i >= len(WORDS):
+                name = f'{name}-{i // len(WORDS)}'
+            yield Tag(name=name, slug=slugify(name))
+
+    def generate_posts(self, rng, count, user_ids):
+        now = timezone.now()
+        for _ in range(count):
+            title = ' '.join(rng.sample(WORDS, rng.randint(2, 6))).title()
+            content = '\n\n'.join(paragraph(rng, rng.randint(2, 6)) for _ in range(rng.randint(1, 6)))
+            post = Post(
+                title=title[:200],
+                content=content,
+                author_id=user_ids[skewed_index(rng, len(user_ids))],
+                published_date=now - timedelta(seconds=rng.randrange(4 * SECONDS_PER_YEAR)),
+            )
+            # bulk_create() bypasses Post.save(), which renders the content.
+            post.render_content()
+            yield post
+
+    def generate_tagged_items(self, rng, post_ids, tag_ids):
+        content_type = ContentType.objects.db_manager(self.using).get_for_model(Post)
+        for post_id in post_ids:
+            count = min(rng.randint(0, self.max_tags_per_post), len(tag_ids))
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(tag_ids[skewed_index(rng, len(tag_ids))])
+            for tag_id in sorted(chosen):
+                yield TaggedItem(tag_id=tag_id, content_type=content_type, object_id=post_id)
+
+    def generate_comments(self, rng, count, user_ids, post_ids):
+        now = timezone.now()
+        for _ in range(count):
+            created_at = now - timedelta(seconds=rng.randrange(2 * SECONDS_PER_YEAR))
+            yield Comment(
+                post_id=post_ids[skewed_index(rng, len(post_ids))],
+                author_id=rng.choice(user_ids),
+                content=paragraph(rng, rng.randint(1, 3)),
+                created_at=created_at,
+                updated_at=created_at,
+            )
@@ -0,0 +1,155 @@
+"""
+Full-text index used by blog.search.
+
+SQLite gets an FTS5 table (blog_post_fts) over each post's title, content and
+tag names, kept in sync by triggers on blog_post, taggit_taggeditem and
+taggit_tag, so rows written through the ORM, bulk_create or raw SQL are all
+indexed. PostgreSQL gets tsvector GIN indexes on title and content whose
+expressions match the ones generated by SearchVector(..., config='english');
+tag names are matched through taggit's own tables.
+"""
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+# Tag names of one post, space separated.
+POST_TAGS = """
+    SELECT COALESCE(group_concat(taggit_tag.name, ' '), '')
+    FROM taggit_tag INNER JOIN taggit_taggeditem ON taggit_taggeditem.tag_id = taggit_tag.id
+    WHERE taggit_taggeditem.content_type_id = {item}.content_type_id
+      AND taggit_taggeditem.object_id = {item}.object_id
+"""
+
+POST_CONTENT_TYPE = """
+    (SELECT id FROM django_content_type WHERE app_label = 'blog' AND model = 'post')
+"""
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, content, tags, tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts (rowid, title, content, tags)
+        VALUES (new.id, new.title, new.content, '');
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, content ON blog_post BEGIN
+        UPDATE blog_post_fts SET title = new.title, content = new.content WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+        DELETE FROM blog_post_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER blog_post_fts_tag_insert AFTER INSERT ON taggit_taggeditem
+    WHEN new.content_type_id = {POST_CONTENT_TYPE} BEGIN
+        UPDATE blog_post_fts SET tags = ({POST_TAGS.format(item='new')}) WHERE rowid = new.object_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER blog_post_fts_tag_delete AFTER DELETE ON taggit_taggeditem
+    WHEN old.content_type_id = {POST_CONTENT_TYPE} BEGIN
+        UPDATE blog_post_fts SET tags = ({POST_TAGS.format(item='old')}) WHERE rowid = old.object_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER blog_post_fts_tag_rename AFTER UPDATE OF name ON taggit_tag BEGIN
+        UPDATE blog_post_fts SET tags = (
+            SELECT COALESCE(group_concat(taggit_tag.name, ' '), '')
+            FROM taggit_tag INNER JOIN taggit_taggeditem ON taggit_taggeditem.tag_id = taggit_tag.id
+            WHERE taggit_taggeditem.content_type_id = {POST_CONTENT_TYPE}
+              AND taggit_taggeditem.object_id = blog_post_fts.rowid
+        )
+        WHERE rowid IN (
+            SELECT object_id FROM taggit_taggeditem
+            WHERE tag_id = new.id AND content_type_id = {POST_CONTENT_TYPE}
+        );
+    END
+    """,
+    f"""
+    INSERT INTO blog_post_fts (rowid, title, content, tags)
+    SELECT blog_post.id, blog_post.title, blog_post.content, (
+        SELECT COALESCE(group_concat(taggit_tag.name, ' '), '')
+        FROM taggit_tag INNER JOIN taggit_taggeditem ON taggit_taggeditem.tag_id = taggit_tag.id
+        WHERE taggit_taggeditem.content_type_id = {POST_CONTENT_TYPE}
+          AND taggit_taggeditem.object_id = blog_post.id
+    )
+    FROM blog_post
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+    "DROP TRIGGER IF EXISTS blog_post_fts_update",
+    "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_post_fts_tag_insert",
+    "DROP TRIGGER IF EXISTS blog_post_fts_tag_delete",
+    "DROP TRIGGER IF EXISTS blog_post_fts_tag_rename",
+    "DROP TABLE IF EXISTS blog_post_fts",
+]
+
+# The triggers on blog_post itself (drop, then create). SQLite drops them
+# whenever a later migration rebuilds blog_post, e.g. to add a column, so
+# such migrations run these again (see 0005_post_rendered_content).
+SQLITE_POST_TRIGGERS = SQLITE_BACKWARD[0:3] + SQLITE_FORWARD[1:4]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX blog_post_title_tsv_idx ON blog_post
+    USING gin (to_tsvector('english'::regconfig, COALESCE((title)::text, '')))
+    """,
+    """
+    CREATE INDEX blog_post_content_tsv_idx ON blog_post
+    USING gin (to_tsvector('english'::regconfig, COALESCE((content)::text, '')))
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS blog_post_title_tsv_idx",
+    "DROP INDEX IF EXISTS blog_post_content_tsv_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FORWARD[:1])
+        except OperationalError:
+            # SQLite was built without FTS5; blog.search falls back to
+            # icontains matching when the table is missing.
+            return
+        _run(schema_editor, SQLITE_FORWARD[1:])
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
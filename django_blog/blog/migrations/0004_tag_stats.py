@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_tag_stats(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Post = apps.get_model('blog', 'Post')
+    Tag = apps.get_model('taggit', 'Tag')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    TagStat = apps.get_model('blog', 'TagStat')
+    using = schema_editor.connection.alias
+
+    content_type = ContentType.objects.using(using).filter(app_label='blog', model='post').first()
+    if content_type is None:
+        return
+    counts = dict(
+        TaggedItem.objects.using(using)
+        .filter(content_type=content_type, object_id__in=Post.objects.using(using).values('pk'))
+        .order_by().values('tag_id').annotate(total=Count('*')).values_list('tag_id', 'total')
+    )
+    TagStat.objects.using(using).bulk_create([
+        TagStat(tag_id=tag.pk, name=tag.name, slug=tag.slug, post_count=counts[tag.pk])
+        for tag in Tag.objects.using(using).filter(pk__in=list(counts))
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_comment_thread_index'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='blog_stats', serialize=False, to='taggit.tag')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-post_count', 'name'],
+                'indexes': [models.Index(fields=['-post_count', 'name'], name='blog_tagsta_post_co_5acd5d_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_tag_stats, migrations.RunPython.noop),
+    ]
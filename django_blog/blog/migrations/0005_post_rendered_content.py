@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:35
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+from blog.rendering import rerender_posts
+
+
+search_index = import_module('blog.migrations.0002_search_index')
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Adding the columns rebuilds blog_post on SQLite, which drops the
+    # full-text index triggers defined on it. Removing them may or may not
+    # rebuild it, depending on the SQLite version.
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        if 'blog_post_fts' not in connection.introspection.table_names(cursor):
+            return
+    for statement in search_index.SQLITE_POST_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def render_existing_posts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    for _ in rerender_posts(Post, using=schema_editor.connection.alias):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_tag_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.RunPython(render_existing_posts, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,42 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from taggit.managers import TaggableManager
+from taggit.models import Tag
+
+from .rendering import render_post_fields
+
+
+class PostQuerySet(models.QuerySet):
+    def for_list(self):
+        # Everything the list templates show, in two queries per page: the
+        # posts joined to their authors, then the tags of the whole page.
+        # Comments are counted in a correlated subquery rather than a
+        # GROUP BY, which would drop Meta.ordering and be multiplied by any
+        # join the caller filters through (e.g. tags).
+        comment_counts = Comment.objects.filter(post=models.OuterRef('pk')).order_by().values(
+            'post'
+        ).annotate(total=models.Count('*')).values('total')
+        # The list templates show the stored excerpt, never the full text.
+        return self.select_related('author').prefetch_related('tags').defer(
+            'content', 'content_html'
+        ).annotate(
+            comment_count=Coalesce(models.Subquery(comment_counts), 0)
+        )
+
 
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
+    # Rendered from content on save (blog.rendering).
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
     published_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     tags = TaggableManager()
+
+    objects = PostQuerySet.as_manager()
     
     class Meta:
         ordering = ['-published_date']
@@ -16,6 +44,17 @@ class Post(models.Model):
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'content_html', 'excerpt'}
+        super().save(*args, **kwargs)
+    
+    def render_content(self):
+        self.content_html, self.excerpt = render_post_fields(self.content)
+    
     def get_absolute_url(self):
         return reverse('post-detail', kwargs={'pk': self.pk})
 
@@ -29,9 +68,32 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Keyset pagination of a post's thread (blog.comments).
+            models.Index(fields=['post', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title}'
     
     def get_absolute_url(self):
         return reverse('post-detail', kwargs={'pk': self.post.pk})
+
+
+class TagStat(models.Model):
+    # Number of posts per tag, kept current by the TaggedItem and Post signal
+    # handlers (blog.tagstats). Name and slug are copied from the tag so the
+    # tag cloud and the tag page read this table alone.
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='blog_stats')
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+    post_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-post_count', 'name']
+        indexes = [
+            models.Index(fields=['-post_count', 'name']),
+        ]
+    
+    def __str__(self):
+        return f'{self.name}: {self.post_count} posts'
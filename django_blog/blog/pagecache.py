@@ -0,0 +1,156 @@
+"""
+Full-page cache for anonymous readers.
+
+Views opt in with ``page_cache = True`` (a class attribute, or the
+page_cache decorator on a function view): the post list, post detail, tag
+and tag cloud pages. AnonymousPageCacheMiddleware stores their GET responses
+for readers without a session, keyed on host, path and the sorted query
+string, and replays them with no database query and no template rendering.
+
+Pages are shared between readers, so nothing per-user may be stored:
+
+    - Any request carrying a session, the messages cookie, credentials or
+      the read-your-writes pin bypasses the cache entirely, in both
+      directions, so signed-in users always see live pages.
+    - CSRF tokens are replaced by a placeholder before storing, and each
+      replay injects a fresh token for its own client (which also sets the
+      CSRF cookie, as rendering the form would have).
+    - Responses that set any cookie other than the CSRF cookie, or that are
+      marked private or no-store, are not stored.
+
+Every key embeds the 'pages' stamp of blog.fragments, which the signal
+handlers in blog.signals bump on any post, comment or tag change, so a write
+purges every cached page at once. Misses are rendered from ``default`` even
+for views with replica reads: a page read from a lagging replica after a
+bump would be stored under the new stamp and replayed, stale, until it
+expires.
+
+Configuration:
+
+    MIDDLEWARE = [..., 'django.middleware.csrf.CsrfViewMiddleware', ...,
+                  'blog.pagecache.AnonymousPageCacheMiddleware',
+                  'dbkit.routing.ReplicaRoutingMiddleware', ...]
+    BLOG_PAGE_CACHE_TIMEOUT = 600   # seconds; 0 disables
+
+The middleware must come after CsrfViewMiddleware, which sets the CSRF
+cookie on replayed pages, and before ReplicaRoutingMiddleware, which it
+tells to keep misses on ``default``.
+"""
+import hashlib
+import re
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_vary_headers
+
+from dbkit.routing import PIN_COOKIE, keep_on_primary
+
+from .fragments import bump_stamps_on_commit, get_stamps
+
+
+PAGE_PREFIX = 'blog:page:'
+PAGE_STAMP = 'all'
+CSRF_PLACEHOLDER = 'csrf-token-placeholder'
+CSRF_INPUT = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def page_cache(view):
+    """Mark a function view as cacheable for anonymous readers."""
+    view.page_cache = True
+    return view
+
+
+def purge_page_cache():
+    """Drop every cached page, now and once the current transaction commits."""
+    bump_stamps_on_commit('pages', [PAGE_STAMP])
+
+
+def strip_csrf_tokens(content):
+    return CSRF_INPUT.sub(rb'\1' + CSRF_PLACEHOLDER.encode() + rb'\2', content)
+
+
+def inject_csrf_token(request, content):
+    placeholder = CSRF_PLACEHOLDER.encode()
+    if placeholder not in content:
+        return content
+    return content.replace(placeholder, get_token(request).encode())
+
+
+class AnonymousPageCacheMiddleware:
+    """Serve opted-in pages to anonymous readers from the default cache."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timeout = getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 600)
+        if not self.timeout:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if not self.is_anonymous_read(request):
+            return self.get_response(request)
+        key = self.cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            return self.replay(request, entry)
+
+        response = self.get_response(request)
+        if (
+            request.method == 'GET'
+            and getattr(request, '_page_cacheable', False)
+            and self.is_storable(response)
+        ):
+            patch_vary_headers(response, ('Cookie',))
+            cache.set(key, self.entry(response), self.timeout)
+            response['X-Page-Cache'] = 'MISS'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        if getattr(view, 'page_cache', False):
+            request._page_cacheable = True
+            if request.method == 'GET' and self.is_anonymous_read(request):
+                keep_on_primary(request)
+        return None
+
+    def is_anonymous_read(self, request):
+        cookies = request.COOKIES
+        return (
+            request.method in ('GET', 'HEAD')
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and settings.SESSION_COOKIE_NAME not in cookies
+            and 'messages' not in cookies
+            and PIN_COOKIE not in cookies
+        )
+
+    def cache_key(self, request):
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        url = f'{request.get_host()}{request.path}?{query}'
+        stamp = get_stamps(('pages',), PAGE_STAMP)[0]
+        return f'{PAGE_PREFIX}{stamp}:{hashlib.sha1(url.encode("utf-8")).hexdigest()}'
+
+    def is_storable(self, response):
+        cache_control = response.get('Cache-Control', '')
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and 'private' not in cache_control
+            and 'no-store' not in cache_control
+            and all(name == settings.CSRF_COOKIE_NAME for name in response.cookies)
+        )
+
+    def entry(self, response):
+        return {
+            'content': strip_csrf_tokens(response.content),
+            'headers': dict(response.headers),
+        }
+
+    def replay(self, request, entry):
+        response = HttpResponse(inject_csrf_token(request, entry['content']))
+        for name, value in entry['headers'].items():
+            response.headers[name] = value
+        response['X-Page-Cache'] = 'HIT'
+        return response
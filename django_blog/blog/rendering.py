@@ -0,0 +1,121 @@
+"""
+Rendering of post content, done once when a post is saved.
+
+Post.save() stores the output of render_content() in ``content_html`` and of
+make_excerpt() in ``excerpt``, so the templates print them as they are
+instead of running linebreaks/truncatewords over the full text on every
+request.
+
+Content is Markdown when the optional ``markdown`` package is installed.
+Raw HTML in the source is escaped rather than passed through, and links or
+images with a scheme other than http(s)/mailto are neutralized (see
+neutralize_urls()), so authors cannot inject markup or script. Without the
+package the output is what the ``linebreaks`` filter produced before:
+escaped text in paragraphs.
+
+Rows written without save() (bulk_create, raw SQL), or rendered before the
+renderer changed (e.g. after installing markdown), are brought up to date by
+``manage.py render_posts``.
+"""
+import html
+import re
+
+from django.utils.html import linebreaks, strip_tags
+from django.utils.text import Truncator
+
+try:
+    import markdown
+except ImportError:  # optional: plain paragraphs
+    markdown = None
+
+
+EXCERPT_WORDS = 30
+MARKDOWN_EXTENSIONS = ['fenced_code', 'sane_lists']
+SAFE_SCHEMES = ('http', 'https', 'mailto')
+# Only the <a> and <img> tags Markdown emits; quoted values may hold '>'.
+URL_TAG = re.compile(
+    r'<(?:a|img)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', re.IGNORECASE
+)
+URL_ATTRIBUTE = re.compile(r'\s(href|src)="([^"]*)"', re.IGNORECASE)
+SCHEME = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+# Browsers drop these from URLs before reading the scheme, so 'jav&#9;ascript:'
+# is a javascript: URL.
+URL_IGNORED = re.compile(r'[\x00-\x20\x7f]')
+
+
+def is_safe_url(value):
+    """
+    Return True if the attribute value ``value`` (still HTML-escaped) is a
+    relative URL or has one of SAFE_SCHEMES.
+    """
+    scheme = SCHEME.match(URL_IGNORED.sub('', html.unescape(value)))
+    return scheme is None or scheme[1].lower() in SAFE_SCHEMES
+
+
+def _neutralize_attribute(match):
+    if is_safe_url(match[2]):
+        return match[0]
+    return f' {match[1]}="#"'
+
+
+def neutralize_urls(content_html):
+    """
+    Replace unsafe href and src values in the <a> and <img> tags of
+    ``content_html`` with '#'. Escaped text that looks like a tag is left
+    alone.
+    """
+    return URL_TAG.sub(
+        lambda tag: URL_ATTRIBUTE.sub(_neutralize_attribute, tag[0]),
+        content_html,
+    )
+
+
+def render_content(text):
+    """Return the HTML for a post's content."""
+    if markdown is None:
+        return linebreaks(text, autoescape=True)
+    renderer = markdown.Markdown(
+        extensions=MARKDOWN_EXTENSIONS, output_format='html'
+    )
+    # Escape raw HTML instead of passing it through.
+    renderer.preprocessors.deregister('html_block')
+    renderer.inlinePatterns.deregister('html')
+    return neutralize_urls(renderer.convert(text))
+
+
+def make_excerpt(content_html, words=EXCERPT_WORDS):
+    """Return the first ``words`` words of rendered content, as plain text."""
+    text = html.unescape(strip_tags(content_html))
+    return Truncator(' '.join(text.split())).words(words)
+
+
+def render_post_fields(text):
+    """Return (content_html, excerpt) for a post's content."""
+    content_html = render_content(text)
+    return content_html, make_excerpt(content_html)
+
+
+def rerender_posts(model, using='default', batch_size=1000,
+                   missing_only=False):
+    """
+    Store freshly rendered content for every post (or only those never
+    rendered), walking the table in primary key order. Yields the ids of
+    each batch once it is written.
+
+    ``model`` is passed in so data migrations can use their historical Post.
+    """
+    manager = model._default_manager.db_manager(using)
+    queryset = manager.only('pk', 'content').order_by('pk')
+    if missing_only:
+        queryset = queryset.filter(content_html='')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        for post in batch:
+            post.content_html, post.excerpt = render_post_fields(post.content)
+        manager.bulk_update(batch, ['content_html', 'excerpt'])
+        last_pk = batch[-1].pk
+        yield [post.pk for post in batch]
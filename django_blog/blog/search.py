@@ -0,0 +1,158 @@
+"""
+Ranked full-text search over blog posts.
+
+search_posts() matches every word of the query, as a prefix, against a
+post's title, content or tag names, using the index built in migration
+0002_search_index:
+
+    - SQLite: the FTS5 table blog_post_fts, ranked with bm25 (title hits
+      weigh most, then tags, then content) and with snippet() excerpts.
+    - PostgreSQL: tsvector GIN indexes on title and content, ranked with
+      ts_rank and excerpted with ts_headline. Tag names are matched through
+      taggit's tables.
+
+Any other database, or a SQLite build without FTS5, falls back to icontains
+matching without ranking or snippets.
+
+Results carry ``search_rank`` (higher is better) and ``search_snippet``, a
+content excerpt with the matched words between SNIPPET_START and SNIPPET_STOP
+markers; highlight() turns it into safe HTML.
+"""
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+
+# Tokens are reduced to word characters so user input can never inject
+# FTS5 or tsquery operators.
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+FTS_TABLE = 'blog_post_fts'
+POSTGRES_SEARCH_CONFIG = 'english'
+# bm25 weights of the FTS5 columns: title, content, tags.
+COLUMN_WEIGHTS = (10.0, 1.0, 5.0)
+SNIPPET_WORDS = 24
+
+# Control characters cannot occur in escaped HTML, so they mark the matches
+# until highlight() has escaped the excerpt.
+SNIPPET_START = '\x02'
+SNIPPET_STOP = '\x03'
+
+# Introspection result per database name, so the FTS5 lookup does not cost
+# an extra query on every search.
+_fts_tables = {}
+
+
+def has_search_index(using='default'):
+    """Return True if the database ``using`` has the full-text index."""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        key = str(connection.settings_dict['NAME'])
+        if key not in _fts_tables:
+            with connection.cursor() as cursor:
+                _fts_tables[key] = FTS_TABLE in connection.introspection.table_names(cursor)
+        return _fts_tables[key]
+    return connection.vendor == 'postgresql'
+
+
+def search_tokens(text):
+    """Split free text into lower-cased index tokens."""
+    return [token.lower() for token in TOKEN_RE.findall(text)]
+
+
+def search_posts(text, queryset=None):
+    """
+    Return the posts matching every word of ``text``, best match first.
+
+    ``queryset`` defaults to Post.objects.for_list().
+    """
+    if queryset is None:
+        queryset = Post.objects.for_list()
+    tokens = search_tokens(text)
+    if not tokens:
+        return queryset.none()
+    # queryset.db follows the read router, so a replica-routed search
+    # checks the replica's index.
+    if not has_search_index(queryset.db):
+        return _search_unindexed(queryset, tokens)
+    if connections[queryset.db].vendor == 'postgresql':
+        return _search_postgres(queryset, tokens)
+    return _search_sqlite(queryset, tokens)
+
+
+def _search_sqlite(queryset, tokens):
+    # The index is joined on rowid rather than probed per row, so the MATCH
+    # runs once. bm25 scores are negative (lower is better), so the rank is
+    # negated to match PostgreSQL.
+    match = ' '.join(f'"{token}"*' for token in tokens)
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = blog_post.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={
+            'search_rank': f'-bm25({FTS_TABLE}, {weights})',
+            'search_snippet': (
+                f"snippet({FTS_TABLE}, 1, char(2), char(3), '…', {SNIPPET_WORDS})"
+            ),
+        },
+    ).order_by('-search_rank', '-published_date')
+
+
+def _search_postgres(queryset, tokens):
+    # Each column is matched on its own so the expressions are identical to
+    # the GIN indexes built in migration 0002_search_index.
+    config = POSTGRES_SEARCH_CONFIG
+    condition = Q()
+    for token in tokens:
+        query = SearchQuery(f'{token}:*', search_type='raw', config=config)
+        condition &= (
+            Q(pk__in=_matching('title', query))
+            | Q(pk__in=_matching('content', query))
+            | Q(pk__in=_tagged(token))
+        )
+    full_query = SearchQuery(' & '.join(f'{token}:*' for token in tokens), search_type='raw', config=config)
+    vector = SearchVector('title', weight='A', config=config) + SearchVector('content', weight='B', config=config)
+    return queryset.filter(condition).annotate(
+        search_rank=SearchRank(vector, full_query),
+        search_snippet=SearchHeadline(
+            'content', full_query, config=config,
+            start_sel=SNIPPET_START, stop_sel=SNIPPET_STOP,
+            max_words=SNIPPET_WORDS, min_words=SNIPPET_WORDS // 2, max_fragments=2,
+            fragment_delimiter=' … ',
+        ),
+    ).order_by('-search_rank', '-published_date')
+
+
+def _matching(column, query):
+    return Post.objects.annotate(
+        _search_vector=SearchVector(column, config=POSTGRES_SEARCH_CONFIG)
+    ).filter(_search_vector=query).values('pk')
+
+
+def _tagged(token):
+    # Tags are few; a prefix match on their names is a small scan.
+    return Post.objects.filter(tags__name__istartswith=token).values('pk')
+
+
+def _search_unindexed(queryset, tokens):
+    condition = Q()
+    for token in tokens:
+        condition &= (
+            Q(title__icontains=token)
+            | Q(content__icontains=token)
+            | Q(pk__in=Post.objects.filter(tags__name__icontains=token).values('pk'))
+        )
+    return queryset.filter(condition)
+
+
+def highlight(snippet):
+    """Escape a search snippet and wrap the matched words in <mark>."""
+    html = escape(snippet).replace(SNIPPET_START, '<mark>').replace(SNIPPET_STOP, '</mark>')
+    return mark_safe(html)
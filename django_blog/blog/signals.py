@@ -0,0 +1,140 @@
+"""
+Signal handlers invalidating cached template fragments (see blog.fragments),
+pages (see blog.pagecache), feeds (see blog.feeds) and sitemaps (see
+blog.sitemaps), and keeping the per-tag post counts current
+(see blog.tagstats).
+
+Connected in BlogConfig.ready().
+"""
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from .feeds import invalidate_feeds
+from .fragments import bump_stamps_on_commit
+from .models import Comment, Post
+from .pagecache import purge_page_cache
+from .sitemaps import invalidate_sitemap
+from .tagstats import apply_tag_deltas, rename_tag_stat, tagged_post_ids
+
+
+def is_post_item(item):
+    return item.content_type_id == ContentType.objects.get_for_model(Post).pk
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def purge_pages(sender, **kwargs):
+    purge_page_cache()
+
+
+# Feeds show no comments.
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def purge_feeds(sender, **kwargs):
+    invalidate_feeds()
+
+
+# Sitemaps list post ids, dates and tag slugs only: edits to a post's text
+# leave them unchanged.
+@receiver(post_save, sender=Post)
+def add_post_to_sitemap(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        invalidate_sitemap('posts', [instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_sitemap(sender, instance, **kwargs):
+    invalidate_sitemap('posts', [instance.pk])
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_tag_sitemap_on_item(sender, instance, **kwargs):
+    if is_post_item(instance):
+        invalidate_sitemap('tags', [instance.tag_id])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_sitemap(sender, instance, **kwargs):
+    invalidate_sitemap('tags', [instance.pk])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    bump_stamps_on_commit('post', [instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    bump_stamps_on_commit('comments', [instance.post_id])
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_tags_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # post.tags.add()/remove()/set()/clear() write through bulk queries
+    # that send no post_save/post_delete for the tagged items.
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Post):
+        bump_stamps_on_commit('tags', [instance.pk])
+    elif pk_set:
+        bump_stamps_on_commit('tags', pk_set)
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_tags_on_item(sender, instance, **kwargs):
+    if is_post_item(instance):
+        bump_stamps_on_commit('tags', [instance.object_id])
+
+
+@receiver(post_save, sender=Tag)
+def invalidate_renamed_tag(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        bump_stamps_on_commit('tags', tagged_post_ids(tag=instance))
+        rename_tag_stat(instance)
+
+
+# post.tags.add() creates items with get_or_create(), and remove(), clear()
+# and deleting the post delete them through the ORM, so every change passes
+# through these two.
+@receiver(post_save, sender=TaggedItem)
+def count_tagged_item(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and is_post_item(instance):
+        apply_tag_deltas({instance.tag_id: 1})
+
+
+@receiver(post_delete, sender=TaggedItem)
+def uncount_tagged_item(sender, instance, **kwargs):
+    if is_post_item(instance):
+        apply_tag_deltas({instance.tag_id: -1})
+
+
+@receiver(post_save, sender=User)
+def invalidate_author(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # Logins save last_login alone; only a save that may have renamed the
+    # user touches the markup of their posts and comments.
+    if created or raw or (update_fields is not None and 'username' not in update_fields):
+        return
+    purge_page_cache()
+    invalidate_feeds()
+    bump_stamps_on_commit('post', Post.objects.filter(author=instance).values_list('pk', flat=True))
+    bump_stamps_on_commit(
+        'comments', Comment.objects.filter(author=instance).values_list('post_id', flat=True)
+    )
@@ -0,0 +1,165 @@
+"""
+Sitemaps of the post and tag pages, for crawlers.
+
+/sitemap.xml is an index of child sitemaps, each covering one chunk of
+BLOG_SITEMAP_CHUNK_SIZE primary keys: sitemap-posts-<n>.xml lists the posts
+with n * size <= pk < (n + 1) * size, sitemap-tags-<n>.xml the tag pages of
+the tags in that id range. Chunks follow key ranges rather than OFFSET pages,
+so every chunk is an index range scan however deep it is, and a post never
+moves to another chunk: a new post changes only the last one.
+
+A child sitemap is streamed from an iterator() over values_list() rows,
+never holding the chunk as model instances, and the finished document is
+cached under the chunk's own 'sitemap' stamp (see blog.fragments). The
+signal handlers in blog.signals bump the stamp of the chunk a post or tag
+change touches, and that of the index, so other chunks stay cached.
+
+Post pages carry their publication date as lastmod, tag pages the date of
+their newest post, and each index entry the newest post of its chunk.
+
+Configuration:
+
+    BLOG_SITEMAP_CHUNK_SIZE = 5000      # at most 50000, the protocol's limit
+    BLOG_SITEMAP_CACHE_TIMEOUT = 86400  # seconds; changes invalidate sooner
+"""
+import hashlib
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import ExpressionWrapper, F, IntegerField, Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+
+from .fragments import bump_stamps_on_commit, get_stamps
+from .models import Post, TagStat
+
+
+SITEMAP_PREFIX = 'blog:sitemap:'
+SITEMAP_INDEX = 'index'
+SECTIONS = ('posts', 'tags')
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+ITERATOR_CHUNK_SIZE = 2000
+# Stands in for the argument when a location pattern is resolved.
+MARKER = '999999999'
+
+
+def chunk_size():
+    return getattr(settings, 'BLOG_SITEMAP_CHUNK_SIZE', 5000)
+
+
+def chunk_of(pk):
+    return pk // chunk_size()
+
+
+def invalidate_sitemap(section, pks):
+    """Rebuild the chunks holding ``pks`` of a section, and the index."""
+    chunks = {f'{section}-{chunk_of(pk)}' for pk in pks}
+    if chunks:
+        bump_stamps_on_commit('sitemap', chunks | {SITEMAP_INDEX})
+
+
+def _chunk_expression(field):
+    return ExpressionWrapper(F(field) / chunk_size(), output_field=IntegerField())
+
+
+def _locations(request, viewname):
+    """
+    Return a function of a URL argument giving the escaped absolute location
+    of ``viewname``. The URL is resolved once, not once per entry.
+    """
+    pattern = escape(request.build_absolute_uri(reverse(viewname, args=[MARKER])))
+    before, _, after = pattern.partition(MARKER)
+    return lambda arg: f'{before}{escape(str(arg))}{after}'
+
+
+def _entry(element, location, lastmod=None):
+    if lastmod is None:
+        return f'<{element}><loc>{location}</loc></{element}>\n'
+    lastmod = lastmod.isoformat(timespec='seconds')
+    return f'<{element}><loc>{location}</loc><lastmod>{lastmod}</lastmod></{element}>\n'
+
+
+def index_entries(request):
+    """Yield the <sitemap> elements of the index."""
+    post_chunks = Post.objects.order_by().annotate(chunk=_chunk_expression('pk')).values(
+        'chunk'
+    ).annotate(lastmod=Max('published_date')).order_by('chunk').values_list('chunk', 'lastmod')
+    for chunk, lastmod in post_chunks.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        location = escape(request.build_absolute_uri(reverse('sitemap-section', args=['posts', chunk])))
+        yield _entry('sitemap', location, lastmod)
+
+    tag_chunks = TagStat.objects.filter(post_count__gt=0).annotate(
+        chunk=_chunk_expression('tag_id')
+    ).order_by('chunk').values_list('chunk', flat=True).distinct()
+    for chunk in tag_chunks.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        location = escape(request.build_absolute_uri(reverse('sitemap-section', args=['tags', chunk])))
+        yield _entry('sitemap', location)
+
+
+def post_entries(request, chunk):
+    """Yield the <url> elements of one chunk of posts."""
+    size = chunk_size()
+    posts = Post.objects.filter(pk__gte=chunk * size, pk__lt=(chunk + 1) * size).order_by(
+        'pk'
+    ).values_list('pk', 'published_date')
+    location = _locations(request, 'post-detail')
+    for pk, published_date in posts.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _entry('url', location(pk), published_date)
+
+
+def tag_entries(request, chunk):
+    """Yield the <url> elements of one chunk of tags."""
+    size = chunk_size()
+    lastmods = dict(
+        Post.objects.filter(tags__id__gte=chunk * size, tags__id__lt=(chunk + 1) * size)
+        .order_by().values_list('tags__id').annotate(Max('published_date'))
+    )
+    tags = TagStat.objects.filter(
+        tag_id__gte=chunk * size, tag_id__lt=(chunk + 1) * size, post_count__gt=0,
+    ).order_by('tag_id').values_list('tag_id', 'slug')
+    location = _locations(request, 'posts-by-tag')
+    for tag_id, slug in tags.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _entry('url', location(slug), lastmods.get(tag_id))
+
+
+def document(root, entries):
+    yield XML_HEADER + f'<{root} {XMLNS}>\n'
+    yield from entries
+    yield f'</{root}>\n'
+
+
+def sitemap_key(request, name):
+    # Locations are absolute, so the host is part of the key.
+    stamp = get_stamps(('sitemap',), name)[0]
+    host = f'{request.scheme}://{request.get_host()}'
+    return f'{SITEMAP_PREFIX}{name}:{stamp}:{hashlib.sha1(host.encode("utf-8")).hexdigest()}'
+
+
+def caching_stream(key, parts):
+    """Yield ``parts`` as bytes, caching the whole once the last is sent."""
+    sent = []
+    for part in parts:
+        data = part.encode('utf-8')
+        sent.append(data)
+        yield data
+    cache.set(key, b''.join(sent), getattr(settings, 'BLOG_SITEMAP_CACHE_TIMEOUT', 86400))
+
+
+def sitemap_response(request, section=None, chunk=None):
+    """Serve the index (no section) or one chunk of a section."""
+    if section is None:
+        name, root, entries = SITEMAP_INDEX, 'sitemapindex', index_entries(request)
+    elif section in SECTIONS:
+        producer = post_entries if section == 'posts' else tag_entries
+        name, root, entries = f'{section}-{chunk}', 'urlset', producer(request, chunk)
+    else:
+        raise Http404('Unknown sitemap.')
+
+    key = sitemap_key(request, name)
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type=CONTENT_TYPE)
+    return StreamingHttpResponse(caching_stream(key, document(root, entries)), content_type=CONTENT_TYPE)
@@ -1,4 +1,67 @@
 // Basic example script to demonstrate dynamic behavior
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Blog page loaded');
+
+    // Append later pages of a comment thread from the post-comments JSON
+    // endpoint instead of reloading the post.
+    document.addEventListener('click', function(event) {
+        var link = event.target.closest('a.load-comments');
+        if (!link || !link.dataset.url) {
+            return;
+        }
+        event.preventDefault();
+        fetch(link.dataset.url, {headers: {'Accept': 'application/json'}})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.json();
+            })
+            .then(function(page) {
+                var thread = link.previousElementSibling;
+                page.results.forEach(function(comment) {
+                    thread.appendChild(renderComment(comment));
+                });
+                if (page.next) {
+                    link.dataset.url = page.next;
+                    link.href = '?' + page.next.split('?')[1];
+                } else {
+                    link.remove();
+                }
+            })
+            .catch(function() {
+                // Fall back to the server-rendered page.
+                window.location = link.href;
+            });
+    });
 });
+
+function renderComment(comment) {
+    var container = document.createElement('div');
+    container.className = 'comment';
+
+    var header = document.createElement('p');
+    var author = document.createElement('strong');
+    author.textContent = comment.author;
+    header.appendChild(author);
+    var date = new Date(comment.created_at).toLocaleDateString('en-US', {
+        month: 'long', day: '2-digit', year: 'numeric'
+    });
+    header.appendChild(document.createTextNode(' - ' + date));
+    container.appendChild(header);
+
+    var content = document.createElement('p');
+    content.textContent = comment.content;
+    container.appendChild(content);
+
+    [['update_url', 'Edit'], ['delete_url', 'Delete']].forEach(function(action) {
+        if (comment[action[0]]) {
+            var link = document.createElement('a');
+            link.href = comment[action[0]];
+            link.textContent = action[1];
+            container.appendChild(link);
+            container.appendChild(document.createTextNode(' '));
+        }
+    });
+    return container;
+}
@@ -0,0 +1,116 @@
+"""
+Materialized per-tag post counts (TagStat) and the widgets built on them.
+
+The signal handlers in blog.signals call apply_tag_deltas() as taggit's
+tagged items are created and deleted (including those deleted along with
+their post), so the counts stay current without ever counting on page
+render. Counts are adjusted with F() expressions, so concurrent writers never
+overwrite each other's increments.
+
+Writes that bypass signals (bulk_create, raw SQL) must be followed by
+``manage.py rebuild_tag_stats``; the seed command rebuilds the counts itself.
+
+The popular-tags widget and the tag cloud read TagStat through its
+(-post_count, name) index and are cached as template fragments under the
+'tag-stats' stamp, which every count change or rename bumps.
+"""
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from taggit.models import Tag, TaggedItem
+
+from .fragments import bump_stamps_on_commit
+from .models import Post, TagStat
+
+
+TAG_STATS_STAMP = 'all'
+CLOUD_WEIGHTS = 5
+
+
+def tagged_post_ids(**filters):
+    """Ids of the posts whose tagged items match ``filters``, as a subquery."""
+    return TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post), **filters
+    ).values_list('object_id', flat=True)
+
+
+def _increment(tag_id, delta):
+    if delta < 0:
+        # Never below zero, even for items the counts never included (e.g.
+        # left behind by posts deleted before TagStat existed).
+        TagStat.objects.filter(tag_id=tag_id, post_count__gte=-delta).update(
+            post_count=F('post_count') + delta
+        )
+        return
+    if TagStat.objects.filter(tag_id=tag_id).update(post_count=F('post_count') + delta):
+        return
+    tag = Tag.objects.filter(pk=tag_id).first()
+    if tag is None:
+        return
+    try:
+        with transaction.atomic():
+            TagStat.objects.create(tag=tag, name=tag.name, slug=tag.slug, post_count=delta)
+    except IntegrityError:
+        # Another writer created the row between our UPDATE and INSERT.
+        TagStat.objects.filter(tag_id=tag_id).update(post_count=F('post_count') + delta)
+
+
+def apply_tag_deltas(deltas):
+    """Apply a Counter of tag id -> change in post count."""
+    deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        for tag_id, delta in sorted(deltas.items()):
+            _increment(tag_id, delta)
+    bump_stamps_on_commit('tag-stats', [TAG_STATS_STAMP])
+
+
+def rename_tag_stat(tag):
+    if TagStat.objects.filter(tag=tag).update(name=tag.name, slug=tag.slug):
+        bump_stamps_on_commit('tag-stats', [TAG_STATS_STAMP])
+
+
+def rebuild_tag_stats(using='default'):
+    """
+    Recompute TagStat from taggit's tables in one GROUP BY, inside a
+    transaction so readers see either the old or the new counts.
+    """
+    counts = Counter()
+    items = tagged_post_ids().using(using).filter(object_id__in=Post.objects.using(using).values('pk'))
+    for row in items.order_by().values('tag_id').annotate(total=Count('*')):
+        counts[row['tag_id']] = row['total']
+    with transaction.atomic(using=using):
+        TagStat.objects.using(using).all().delete()
+        TagStat.objects.using(using).bulk_create([
+            TagStat(tag_id=tag.pk, name=tag.name, slug=tag.slug, post_count=counts[tag.pk])
+            for tag in Tag.objects.using(using).filter(pk__in=list(counts)).iterator()
+        ], batch_size=1000)
+    bump_stamps_on_commit('tag-stats', [TAG_STATS_STAMP])
+    return len(counts)
+
+
+def popular_tags(limit=None):
+    limit = limit or getattr(settings, 'BLOG_POPULAR_TAGS', 10)
+    return list(TagStat.objects.filter(post_count__gt=0)[:limit])
+
+
+def tag_cloud(limit=None):
+    """
+    The most used tags in name order, each with a ``weight`` from 1 to
+    CLOUD_WEIGHTS on a log scale of its post count.
+    """
+    limit = limit or getattr(settings, 'BLOG_TAG_CLOUD_SIZE', 100)
+    tags = popular_tags(limit)
+    if not tags:
+        return []
+    smallest = math.log(tags[-1].post_count)
+    spread = math.log(tags[0].post_count) - smallest
+    for tag in tags:
+        share = (math.log(tag.post_count) - smallest) / spread if spread else 1
+        tag.weight = 1 + round(share * (CLOUD_WEIGHTS - 1))
+    return sorted(tags, key=lambda tag: tag.name.lower())
@@ -0,0 +1,54 @@
+from django import template
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, router
+
+from ..fragments import FRAGMENTS, fragment_key, fragment_timeout, record_fragment_event
+from ..models import Post
+
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, pk, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.pk = pk
+        self.vary_on = vary_on
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        if name not in FRAGMENTS:
+            raise template.TemplateSyntaxError(f'Unknown fragment {name!r}.')
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        key = fragment_key(name, self.pk.resolve(context), vary_on)
+        html = cache.get(key)
+        if html is not None:
+            record_fragment_event(name, 'hits')
+            return html
+        html = self.nodelist.render(context)
+        # The objects in the context were read from the replica: storing
+        # their markup under the new stamp would serve it stale.
+        if router.db_for_read(Post) == DEFAULT_DB_ALIAS:
+            cache.set(key, html, fragment_timeout())
+        record_fragment_event(name, 'misses')
+        return html
+
+
+@register.tag
+def cachefragment(parser, token):
+    """
+    Cache the enclosed markup under the version stamps of a post (or of the
+    tag statistics, for the tag widgets).
+
+        {% cachefragment 'post-card' post.pk %} ... {% endcachefragment %}
+
+    Any further arguments (e.g. ``user.pk``) are added to the key.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a fragment name and an object id.")
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+    name, pk, *vary_on = (parser.compile_filter(bit) for bit in bits[1:])
+    return FragmentNode(nodelist, name, pk, vary_on)
@@ -0,0 +1,16 @@
+from django import template
+
+from ..tagstats import popular_tags as get_popular_tags, tag_cloud as get_tag_cloud
+
+
+register = template.Library()
+
+
+@register.inclusion_tag('blog/popular_tags.html')
+def popular_tags(limit=None):
+    return {'tags': get_popular_tags(limit)}
+
+
+@register.inclusion_tag('blog/tag_cloud_widget.html')
+def tag_cloud(limit=None):
+    return {'tags': get_tag_cloud(limit)}
@@ -1,3 +1,720 @@
-from django.test import TestCase
+import gzip
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import ignore_warnings
+from django.urls import reverse
+from taggit.models import TaggedItem
+
+from dbkit.routing import ReplicaRoutingMiddleware, replica
+
+from .fragments import get_fragment_stats
+from .pagecache import AnonymousPageCacheMiddleware, inject_csrf_token, strip_csrf_tokens
+from .rendering import markdown, neutralize_urls
+from .models import Post, Comment, TagStat
+from .tagstats import rebuild_tag_stats
+from .search import has_search_index, highlight, search_posts
+
+
+class ListQueryBudgetTests(TestCase):
+    # Each list page must cost the same number of queries however many
+    # posts, authors, tags and comments it shows.
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [User.objects.create_user(f'writer{i}', password='pass12345') for i in range(3)]
+        cls.tagged = []
+        for i in range(12):
+            post = Post.objects.create(
+                title=f'Post {i}', content='django query ' * 40, author=cls.authors[i % 3]
+            )
+            post.tags.add('django', f'topic-{i}')
+            for j in range(i % 4):
+                Comment.objects.create(post=post, author=cls.authors[j % 3], content='Nice post')
+            cls.tagged.append(post)
+
+    def setUp(self):
+        # Measure uncached renders.
+        cache.clear()
+
+    def test_post_list(self):
+        # count, posts with authors and comment counts, tags, popular tags
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('post-list'))
+        self.assertContains(response, 'writer1')
+        self.assertContains(response, '#topic-11')
+        self.assertContains(response, '3 comments')
+        self.assertContains(response, '1 comment<')
+
+    def test_posts_by_tag(self):
+        # tag stats (no COUNT), posts with authors and comment counts, tags
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('posts-by-tag', args=['django']))
+        self.assertEqual(len(response.context['posts']), 10)
+        self.assertContains(response, 'writer2')
+        self.assertContains(response, '2 comments')
+
+    def test_search_results(self):
+        # count, posts with authors and comment counts, tags
+        has_search_index()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('search'), {'q': 'Post'})
+        self.assertContains(response, 'Post 11')
+        self.assertContains(response, 'writer0')
+
+    def test_post_detail(self):
+        # post with author, tags, comments with authors
+        post = self.tagged[7]
+        with self.assertNumQueries(3):
+            response = self.client.get(post.get_absolute_url())
+        self.assertContains(response, '#topic-7')
+        self.assertContains(response, 'Nice post', count=3)
+
+    def test_comment_counts_are_not_multiplied_by_tags(self):
+        post = Post.objects.for_list().filter(tags__slug='django').get(pk=self.tagged[3].pk)
+        self.assertEqual(post.comment_count, 3)
+
+
+class SearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('writer', password='pass12345')
+        cls.in_title = Post.objects.create(
+            title='Caching querysets', content='Notes on performance.', author=author
+        )
+        cls.in_content = Post.objects.create(
+            title='Weekly notes', content='Some thoughts on caching <b>templates</b> and views.', author=author
+        )
+        cls.tagged = Post.objects.create(title='Deploying', content='Servers and such.', author=author)
+        cls.tagged.tags.add('redis')
+        for i in range(15):
+            Post.objects.create(title=f'Archive {i}', content='archived words', author=author)
+
+    def setUp(self):
+        if not has_search_index():
+            self.skipTest('database has no full-text index')
+
+    def test_title_matches_rank_first(self):
+        results = list(search_posts('cach'))
+        self.assertEqual(results, [self.in_title, self.in_content])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(list(search_posts('caching views')), [self.in_content])
+        self.assertEqual(list(search_posts('caching redis')), [])
+
+    def test_tags_are_searched(self):
+        self.assertEqual(list(search_posts('redis')), [self.tagged])
+        self.tagged.tags.remove('redis')
+        self.assertEqual(list(search_posts('redis')), [])
+        self.tagged.tags.add('memcached')
+        self.assertEqual(list(search_posts('memcached')), [self.tagged])
+
+    def test_index_follows_edits(self):
+        self.in_content.content = 'Nothing to see.'
+        self.in_content.save()
+        self.assertEqual(list(search_posts('caching')), [self.in_title])
+        self.in_title.delete()
+        self.assertEqual(list(search_posts('caching')), [])
+
+    def test_operators_in_queries_are_ignored(self):
+        self.assertEqual(list(search_posts('"caching" OR NOT*')), [])
+        self.assertEqual(list(search_posts('caching -')), [self.in_title, self.in_content])
+
+    def test_snippets_are_escaped_and_highlighted(self):
+        post = search_posts('templates').get()
+        html = highlight(post.search_snippet)
+        self.assertIn('<mark>templates</mark>', html)
+        self.assertIn('&lt;b&gt;', html)
+        self.assertNotIn('<b>', html)
+
+    def test_results_are_paginated(self):
+        response = self.client.get(reverse('search'), {'q': 'archived'})
+        self.assertEqual(len(response.context['posts']), 10)
+        self.assertContains(response, '15 posts found')
+        self.assertContains(response, '?q=archived&amp;page=2')
+        response = self.client.get(reverse('search'), {'q': 'archived', 'page': 2})
+        self.assertEqual(len(response.context['posts']), 5)
+
+
+# Measure fragment caching beneath the full-page cache.
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+class FragmentCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.reader = User.objects.create_user('reader', password='pass12345')
+        cls.post = Post.objects.create(title='Cached post', content='Some words.', author=cls.author)
+        cls.post.tags.add('django')
+        Comment.objects.create(post=cls.post, author=cls.reader, content='First!')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_detail_skips_tag_and_comment_queries(self):
+        self.client.get(self.post.get_absolute_url())
+        # post only
+        with self.assertNumQueries(1):
+            response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, '#django')
+        self.assertContains(response, 'First!')
+        stats = get_fragment_stats()
+        self.assertEqual(stats['comment-thread'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+        self.assertEqual(stats['total']['hits'], 2)
+
+    def test_writes_invalidate_their_fragments(self):
+        url = self.post.get_absolute_url()
+        self.client.get(reverse('post-list'))
+        self.client.get(url)
+
+        self.post.tags.add('caching')
+        self.assertContains(self.client.get(url), '#caching')
+        self.post.tags.remove('django')
+        self.assertNotContains(self.client.get(url), '#django')
+        self.assertContains(self.client.get(reverse('post-list')), '#caching')
+
+        Comment.objects.create(post=self.post, author=self.author, content='Thanks')
+        self.assertContains(self.client.get(url), 'Thanks')
+        self.assertContains(self.client.get(reverse('post-list')), '2 comments')
+
+        self.post.title = 'Renamed post'
+        self.post.save()
+        self.assertContains(self.client.get(reverse('post-list')), 'Renamed post')
+
+        self.author.username = 'novelist'
+        self.author.save()
+        response = self.client.get(reverse('post-list'))
+        self.assertContains(response, 'novelist')
+        self.assertContains(self.client.get(url), '<strong>novelist</strong>')
+
+    def test_comment_thread_varies_on_viewer(self):
+        self.client.get(self.post.get_absolute_url())
+        self.client.force_login(self.reader)
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, 'Edit</a>')
+
+    def test_stats_are_staff_only(self):
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(reverse('fragment-cache-stats')).status_code, 302)
+        User.objects.filter(pk=self.author.pk).update(is_staff=True)
+        response = self.client.get(reverse('fragment-cache-stats'))
+        self.assertIn('hit_ratio', response.json()['total'])
+
+
+@override_settings(BLOG_COMMENTS_PER_PAGE=4)
+class CommentPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.post = Post.objects.create(title='Popular post', content='Words.', author=cls.author)
+        cls.comments = [
+            Comment.objects.create(post=cls.post, author=cls.author, content=f'Comment {i:02}')
+            for i in range(10)
+        ]
+        # Several comments share a timestamp; the id breaks the tie.
+        Comment.objects.filter(pk__in=[c.pk for c in cls.comments[3:6]]).update(
+            created_at=cls.comments[3].created_at
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_detail_renders_first_page(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertContains(response, 'Comment 03')
+        self.assertNotContains(response, 'Comment 04')
+        self.assertContains(response, 'Load more comments')
+
+    def test_json_pages_walk_the_whole_thread(self):
+        url = reverse('post-comments', args=[self.post.pk])
+        seen = []
+        while url:
+            # post, comments with authors
+            with self.assertNumQueries(2):
+                data = self.client.get(url).json()
+            seen += [comment['content'] for comment in data['results']]
+            url = data['next']
+        self.assertEqual(seen, [f'Comment {i:02}' for i in range(10)])
+
+    def test_no_js_link_renders_next_page(self):
+        response = self.client.get(self.post.get_absolute_url())
+        cursor = response.context['comment_page'].next_cursor
+        response = self.client.get(self.post.get_absolute_url(), {'after': cursor})
+        self.assertContains(response, 'Comment 04')
+        self.assertNotContains(response, 'Comment 03')
+
+    def test_owner_gets_edit_links(self):
+        url = reverse('post-comments', args=[self.post.pk])
+        self.assertNotIn('update_url', self.client.get(url).json()['results'][0])
+        self.client.force_login(self.author)
+        self.assertIn('update_url', self.client.get(url).json()['results'][0])
+
+    def test_invalid_cursor(self):
+        url = reverse('post-comments', args=[self.post.pk])
+        self.assertEqual(self.client.get(url, {'after': 'bogus'}).status_code, 400)
+        response = self.client.get(self.post.get_absolute_url(), {'after': 'bogus'})
+        self.assertContains(response, 'Comment 00')
+
+
+class TagStatTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.posts = [
+            Post.objects.create(title=f'Post {i}', content='Words.', author=cls.author) for i in range(4)
+        ]
+        for i, post in enumerate(cls.posts):
+            post.tags.add('django', *(['python'] if i % 2 else []))
+
+    def setUp(self):
+        cache.clear()
+
+    def counts(self):
+        return dict(TagStat.objects.values_list('slug', 'post_count'))
+
+    def test_counts_follow_tag_changes(self):
+        self.assertEqual(self.counts(), {'django': 4, 'python': 2})
+        self.posts[0].tags.add('python', 'caching')
+        self.posts[1].tags.remove('python')
+        self.posts[2].tags.set(['caching'])
+        self.posts[3].tags.clear()
+        self.assertEqual(self.counts(), {'django': 2, 'python': 1, 'caching': 2})
+
+    def test_deleting_a_post_uncounts_its_tags(self):
+        self.posts[1].delete()
+        self.assertEqual(self.counts(), {'django': 3, 'python': 1})
+
+    def test_rebuild_matches_incremental_counts(self):
+        self.posts[3].delete()
+        self.posts[0].tags.add('caching')
+        expected = self.counts()
+        TagStat.objects.all().delete()
+        rebuild_tag_stats()
+        self.assertEqual(self.counts(), expected)
+
+    def test_rename_updates_stat(self):
+        tag = TagStat.objects.get(slug='python').tag
+        tag.name = 'Python 3'
+        tag.slug = 'python-3'
+        tag.save()
+        response = self.client.get(reverse('posts-by-tag', args=['python-3']))
+        self.assertEqual(len(response.context['posts']), 2)
+
+    def test_widgets_are_cached_until_counts_change(self):
+        response = self.client.get(reverse('tag-cloud'))
+        self.assertContains(response, 'tag-weight-5" href="/tags/django/"')
+        with self.assertNumQueries(0):
+            self.client.get(reverse('tag-cloud'))
+        self.posts[0].tags.add('caching')
+        self.assertContains(self.client.get(reverse('tag-cloud')), '/tags/caching/')
+        self.assertContains(self.client.get(reverse('post-list')), '#django</a> (4)')
+
+    def test_tag_page_counts_from_stats(self):
+        response = self.client.get(reverse('posts-by-tag', args=['python']))
+        self.assertEqual(response.context['paginator'].count, 2)
+        response = self.client.get(reverse('posts-by-tag', args=['unknown']))
+        self.assertContains(response, 'No posts with this tag.')
+
+
+class StaticPipelineTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.root,
+            STATIC_PIPELINE=True,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django_blog.assets.CompressedManifestStaticFilesStorage'},
+            },
+        )
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0, stdout=StringIO())
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.settings_override.disable()
+        shutil.rmtree(cls.root)
+
+    def get(self, path, **extra):
+        response = self.client.get(path, **extra)
+        return response, b''.join(response.streaming_content)
+
+    def test_pages_link_hashed_files(self):
+        response = self.client.get(reverse('post-list'))
+        self.assertRegex(response.content.decode(), r'/static/css/styles\.[0-9a-f]{12}\.css')
+
+    def test_hashed_files_are_minified_precompressed_and_immutable(self):
+        url = staticfiles_storage.url('css/styles.css')
+        response, body = self.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        css = gzip.decompress(body).decode()
+        self.assertNotIn('\n', css)
+        self.assertIn('.tag-weight-5{font-size:26px}', css)
+
+    def test_identity_when_gzip_not_accepted(self):
+        url = staticfiles_storage.url('js/scripts.js')
+        for accept in ('', 'gzip;q=0', 'identity'):
+            response, body = self.get(url, HTTP_ACCEPT_ENCODING=accept)
+            self.assertNotIn('Content-Encoding', response)
+            self.assertIn(b'renderComment', body)
+            self.assertNotIn(b'// Append later pages', body)
+
+    def test_unhashed_names_revalidate(self):
+        response, _ = self.get('/static/css/styles.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        response = self.client.get(
+            '/static/css/styles.css', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_and_traversal_paths_fall_through(self):
+        self.assertEqual(self.client.get('/static/css/missing.css').status_code, 404)
+        self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+
+
+class PageCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.post = Post.objects.create(title='Cached page', content='Words.', author=cls.author)
+        cls.post.tags.add('django')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_are_replayed_without_queries(self):
+        for url in (reverse('post-list'), self.post.get_absolute_url(),
+                    reverse('posts-by-tag', args=['django']), reverse('tag-cloud')):
+            first = self.client.get(url)
+            self.assertEqual(first['X-Page-Cache'], 'MISS')
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(second['X-Page-Cache'], 'HIT')
+            self.assertEqual(second.content, first.content)
+            self.assertIn('Cookie', second['Vary'])
+
+    def test_query_strings_are_normalized(self):
+        self.client.get(reverse('post-list'), {'page': 1, 'a': 'b'})
+        response = self.client.get(reverse('post-list') + '?a=b&page=1')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    def test_signed_in_readers_bypass_the_cache(self):
+        self.client.get(self.post.get_absolute_url())
+        self.client.force_login(self.author)
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertContains(response, 'Add a Comment')
+
+    def test_writes_purge_pages(self):
+        url = self.post.get_absolute_url()
+        self.client.get(url)
+        Comment.objects.create(post=self.post, author=self.author, content='Fresh comment')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Fresh comment')
+
+        self.client.get(reverse('tag-cloud'))
+        self.post.tags.add('caching')
+        self.assertContains(self.client.get(reverse('tag-cloud')), 'caching')
+
+    def test_search_is_not_cached(self):
+        self.client.get(reverse('search'), {'q': 'cached'})
+        self.assertNotIn('X-Page-Cache', self.client.get(reverse('search'), {'q': 'cached'}))
+
+    def test_csrf_tokens_are_stripped_and_injected_per_request(self):
+        content = b'<input type="hidden" name="csrfmiddlewaretoken" value="abc123">'
+        stored = strip_csrf_tokens(content)
+        self.assertNotIn(b'abc123', stored)
+        request = RequestFactory().get('/')
+        replayed = inject_csrf_token(request, stored)
+        self.assertNotIn(b'placeholder', replayed)
+        self.assertTrue(request.META['CSRF_COOKIE_NEEDS_UPDATE'])
+
+
+def read_alias_page(request):
+    return HttpResponse(Post.objects.all().db)
+
+
+read_alias_page.page_cache = True
+read_alias_page.replica_reads = True
+
+
+# Only the routing decision (QuerySet.db) is checked, so no replica database
+# is opened.
+@ignore_warnings(message='Overriding setting DATABASES')
+@override_settings(DATABASES={
+    **settings.DATABASES,
+    'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'replica.sqlite3'},
+})
+@mock.patch.object(ReplicaRoutingMiddleware, 'is_mirror', lambda self: False)
+class ReplicaCacheTests(SimpleTestCase):
+    # Nothing read from a lagging replica may be stored in the page or
+    # fragment caches.
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, **extra):
+        # Both middleware as installed: the page cache first, then routing.
+        def handler(request):
+            pages.process_view(request, read_alias_page, (), {})
+            routing.process_view(request, read_alias_page, (), {})
+            return read_alias_page(request)
+
+        routing = ReplicaRoutingMiddleware(handler)
+        pages = AnonymousPageCacheMiddleware(routing)
+        return pages(RequestFactory().get('/probe/', **extra))
+
+    def test_page_cache_misses_read_from_default(self):
+        response = self.get()
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertEqual(response.content, b'default')
+        # Readers the page cache bypasses still read from the replica.
+        response = self.get(HTTP_COOKIE=f'{settings.SESSION_COOKIE_NAME}=abc')
+        self.assertEqual(response.content, b'replica')
+
+    def test_fragments_rendered_from_replica_are_not_stored(self):
+        def render(body):
+            template = Template(
+                "{% load blog_fragments %}{% cachefragment 'post-tags' 1 %}" + body + '{% endcachefragment %}'
+            )
+            return template.render(Context())
+
+        with replica():
+            self.assertEqual(render('from replica'), 'from replica')
+        self.assertEqual(render('from default'), 'from default')
+        self.assertEqual(render('from replica'), 'from default')
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+class RenderedContentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.post = Post.objects.create(
+            title='Rendered', content='First <b>bold</b> paragraph.\n\nSecond ' + 'word ' * 40,
+            author=cls.author,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_content_is_rendered_and_escaped_on_save(self):
+        self.assertIn('<p>First &lt;b&gt;bold&lt;/b&gt; paragraph.</p>', self.post.content_html)
+        self.assertTrue(self.post.excerpt.startswith('First <b>bold</b> paragraph. Second word'))
+        self.assertEqual(len(self.post.excerpt.split()), 30)
+
+    def test_update_fields_rerender_only_with_content(self):
+        self.post.content = 'Changed.'
+        self.post.save(update_fields=['content'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.excerpt, 'Changed.')
+        Post.objects.filter(pk=self.post.pk).update(content_html='', excerpt='')
+        self.post.title = 'Renamed'
+        self.post.save(update_fields=['title'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content_html, '')
+
+    def test_render_posts_command_fills_missing_fields(self):
+        Post.objects.filter(pk=self.post.pk).update(content_html='', excerpt='')
+        out = StringIO()
+        call_command('render_posts', '--missing-only', stdout=out)
+        self.assertIn('Rendered 1 posts', out.getvalue())
+        self.post.refresh_from_db()
+        self.assertIn('<p>First', self.post.content_html)
+
+    def test_pages_show_stored_fields(self):
+        Post.objects.filter(pk=self.post.pk).update(content_html='<p>Stored html</p>', excerpt='Stored excerpt')
+        self.assertContains(self.client.get(self.post.get_absolute_url()), '<p>Stored html</p>')
+        self.assertContains(self.client.get(reverse('post-list')), 'Stored excerpt')
+
+    def test_unsafe_links_are_neutralized(self):
+        if markdown is None:
+            self.skipTest('markdown is not installed')
+        post = Post.objects.create(title='Links', content='[x](javascript:alert(1))', author=self.author)
+        self.assertNotIn('javascript:', post.content_html)
+
+    def test_url_neutralizing(self):
+        for unsafe in (
+            '<a href="javascript:alert(1)">x</a>',
+            '<a href="jav&#x09;ascript:alert(1)">x</a>',
+            '<a href=" JaVaScRiPt&colon;alert(1)">x</a>',
+            '<img alt="x" src="&#10;javascript:alert(1)">',
+            '<img src="jav&#9;ascript:alert(1)" alt="x">',
+            '<img src="data:text/html;base64,PHNjcmlwdD4=">',
+            '<a title="a > b" href="vbscript:msgbox(1)">x</a>',
+        ):
+            self.assertRegex(neutralize_urls(unsafe), r'(href|src)="#"', unsafe)
+        for safe in (
+            '<a href="https://example.com/?a=1&amp;b=2">x</a>',
+            '<a href="mailto:writer@example.com">x</a>',
+            '<a href="/posts/1/">x</a>',
+            '<a href="#comments">x</a>',
+            '<img src="images/a:b.png">',
+            # Escaped text is not a tag, whatever it looks like.
+            '<p>&lt;a href="#"&gt; and &lt;a href="javascript:x"&gt;</p>',
+        ):
+            self.assertEqual(neutralize_urls(safe), safe)
+
+
+class SeedCommandTests(TestCase):
+
+    def seed(self, **options):
+        call_command('seed', stdout=StringIO(), batch_size=40, **options)
+
+    def test_creates_requested_rows(self):
+        self.seed(users=5, tags=8, posts=30, comments=50)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Comment.objects.count(), 50)
+        self.assertFalse(Post.objects.filter(content_html='').exists())
+        self.assertEqual(
+            sum(TagStat.objects.values_list('post_count', flat=True)),
+            TaggedItem.objects.count(),
+        )
+
+    def test_same_seed_reproduces_data(self):
+        self.seed(users=3, tags=4, posts=20, comments=0, seed=3)
+        first = list(Post.objects.order_by('pk').values_list('title', 'author__username'))
+        User.objects.all().delete()
+        self.seed(users=3, tags=0, posts=20, comments=0, seed=3)
+        self.assertEqual(list(Post.objects.order_by('pk').values_list('title', 'author__username')), first)
+
+
+class FeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.other = User.objects.create_user('other', password='pass12345')
+        cls.post = Post.objects.create(title='Feed post', content='Feed words.', author=cls.author)
+        cls.post.tags.add('django')
+        Post.objects.create(title='Other post', content='Other words.', author=cls.other)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_list_matching_posts(self):
+        response = self.client.get(reverse('post-feed', args=['rss']))
+        self.assertEqual(response['Content-Type'], 'application/rss+xml; charset=utf-8')
+        self.assertContains(response, '<title>Feed post</title>')
+        self.assertContains(response, '<category>django</category>')
+        self.assertContains(response, 'Other post')
+
+        response = self.client.get(reverse('tag-feed', args=['django', 'atom']))
+        self.assertTrue(response['Content-Type'].startswith('application/atom+xml'))
+        self.assertContains(response, 'Feed post')
+        self.assertNotContains(response, 'Other post')
+
+        response = self.client.get(reverse('author-feed', args=['other', 'rss']))
+        self.assertContains(response, 'Other post')
+        self.assertNotContains(response, 'Feed post')
+
+    def test_unknown_feeds_are_not_found(self):
+        self.assertEqual(self.client.get(reverse('post-feed', args=['json'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('tag-feed', args=['unknown', 'rss'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('author-feed', args=['nobody', 'rss'])).status_code, 404)
+
+    def test_feeds_are_cached_and_conditional(self):
+        url = reverse('post-feed', args=['atom'])
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+            since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_post_changes_rebuild_feeds(self):
+        url = reverse('post-feed', args=['rss'])
+        etag = self.client.get(url)['ETag']
+        self.post.title = 'Edited title'
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Edited title')
+
+
+@override_settings(BLOG_SITEMAP_CHUNK_SIZE=2)
+class SitemapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', password='pass12345')
+        cls.posts = [
+            Post.objects.create(title=f'Post {i}', content='Words.', author=cls.author) for i in range(3)
+        ]
+        cls.posts[0].tags.add('django')
+
+    def setUp(self):
+        cache.clear()
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'application/xml; charset=utf-8')
+        if response.streaming:
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def chunk_url(self, section, pk):
+        return reverse('sitemap-section', args=[section, pk // 2])
+
+    def test_index_lists_a_child_sitemap_per_chunk(self):
+        content = self.fetch(reverse('sitemap-index'))
+        self.assertTrue(content.startswith('<?xml'))
+        chunks = {post.pk // 2 for post in self.posts}
+        self.assertEqual(content.count('<sitemap>'), len(chunks) + 1)
+        for post in self.posts:
+            self.assertIn(self.chunk_url('posts', post.pk), content)
+        self.assertIn(self.chunk_url('tags', self.posts[0].tags.get().pk), content)
+
+    def test_chunks_list_posts_and_tags_with_lastmod(self):
+        post = self.posts[0]
+        content = self.fetch(self.chunk_url('posts', post.pk))
+        self.assertIn(f'<loc>http://testserver{post.get_absolute_url()}</loc>', content)
+        self.assertIn(f'<lastmod>{post.published_date.isoformat(timespec="seconds")}</lastmod>', content)
+        self.assertLessEqual(content.count('<url>'), 2)
+
+        content = self.fetch(self.chunk_url('tags', post.tags.get().pk))
+        self.assertIn('<loc>http://testserver/tags/django/</loc><lastmod>', content)
+
+    def test_chunks_are_cached_until_they_change(self):
+        url = self.chunk_url('posts', self.posts[2].pk)
+        self.fetch(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertFalse(response.streaming)
+
+        removed = self.posts[2].get_absolute_url()
+        self.posts[2].delete()
+        self.assertNotIn(removed, self.fetch(url))
+        post = Post.objects.create(title='New post', content='Words.', author=self.author)
+        self.assertIn(self.chunk_url('posts', post.pk), self.fetch(reverse('sitemap-index')))
+
+    def test_unknown_section_is_not_found(self):
+        self.assertEqual(self.client.get('/sitemap-authors-0.xml').status_code, 404)
@@ -17,11 +17,25 @@ urlpatterns = [
     path('post/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post-delete'),
     
     # Comment URLs
+    path('post/<int:pk>/comments/', views.post_comments, name='post-comments'),
     path('post/<int:pk>/comments/new/', views.CommentCreateView.as_view(), name='comment-create'),
     path('comment/<int:pk>/update/', views.CommentUpdateView.as_view(), name='comment-update'),
     path('comment/<int:pk>/delete/', views.CommentDeleteView.as_view(), name='comment-delete'),
     
     # Search and Tags
     path('search/', views.search_posts, name='search'),
+    path('tags/', views.tag_cloud, name='tag-cloud'),
     path('tags/<slug:tag_slug>/', views.PostByTagListView.as_view(), name='posts-by-tag'),
+    
+    # Feeds (feed_format is 'rss' or 'atom')
+    path('feeds/<str:feed_format>/', views.post_feed, name='post-feed'),
+    path('feeds/tag/<slug:tag_slug>/<str:feed_format>/', views.tag_feed, name='tag-feed'),
+    path('feeds/author/<str:username>/<str:feed_format>/', views.author_feed, name='author-feed'),
+    
+    # Sitemaps
+    path('sitemap.xml', views.sitemap_index, name='sitemap-index'),
+    path('sitemap-<slug:section>-<int:chunk>.xml', views.sitemap_section, name='sitemap-section'),
+    
+    # Operations
+    path('fragments/stats/', views.fragment_cache_stats, name='fragment-cache-stats'),
 ]
\ No newline at end of file
@@ -2,11 +2,20 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
-from django.db.models import Q
-from .models import Post, Comment
+from django.urls import reverse, reverse_lazy
+from django.core.paginator import Paginator
+from .models import Post, Comment, TagStat
+from . import feeds, search, sitemaps
+from .comments import CommentPage
+from .fragments import get_fragment_stats
+from .pagecache import page_cache
+from .tagstats import tagged_post_ids
 from .forms import CustomUserCreationForm, PostForm, CommentForm
+from dbkit.routing import replica_reads
 
 
 # Authentication Views
@@ -34,19 +43,28 @@ def profile(request):
 
 # Blog Post Views
 class PostListView(ListView):
-    model = Post
+    queryset = Post.objects.for_list()
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
     paginate_by = 10
+    replica_reads = True
+    page_cache = True
 
 
 class PostDetailView(DetailView):
-    model = Post
+    # Tags and comments are loaded by the template, and only when their
+    # cached fragments miss.
+    queryset = Post.objects.select_related('author').defer('content', 'excerpt')
     template_name = 'blog/post_detail.html'
+    replica_reads = True
+    page_cache = True
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.all()
+        try:
+            context['comment_page'] = CommentPage(self.object, after=self.request.GET.get('after'))
+        except ValidationError:
+            context['comment_page'] = CommentPage(self.object)
         context['comment_form'] = CommentForm()
         return context
 
@@ -114,20 +132,48 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return self.request.user == comment.author
 
 
+@replica_reads
+def post_comments(request, pk):
+    post = get_object_or_404(Post.objects.only('pk'), pk=pk)
+    try:
+        page = CommentPage(post, after=request.GET.get('after'))
+    except ValidationError as error:
+        return JsonResponse({'error': error.messages[0]}, status=400)
+    
+    results = []
+    for comment in page.comments:
+        data = {
+            'id': comment.pk,
+            'author': comment.author.username,
+            'content': comment.content,
+            'created_at': comment.created_at.isoformat(),
+        }
+        if request.user.pk == comment.author_id:
+            data['update_url'] = reverse('comment-update', kwargs={'pk': comment.pk})
+            data['delete_url'] = reverse('comment-delete', kwargs={'pk': comment.pk})
+        results.append(data)
+    return JsonResponse({'results': results, 'next': page.next_url})
+
+
 # Search and Tag Views
+SEARCH_RESULTS_PER_PAGE = 10
+
+
+@replica_reads
 def search_posts(request):
     query = request.GET.get('q', '')
-    posts = Post.objects.all()
+    page = None
     
     if query:
-        posts = posts.filter(
-            Q(title__icontains=query) | 
-            Q(content__icontains=query) | 
-            Q(tags__name__icontains=query)
-        ).distinct()
+        paginator = Paginator(search.search_posts(query), SEARCH_RESULTS_PER_PAGE)
+        page = paginator.get_page(request.GET.get('page'))
+        for post in page:
+            snippet = getattr(post, 'search_snippet', None)
+            post.snippet = search.highlight(snippet) if snippet else None
     
     return render(request, 'blog/search_results.html', {
-        'posts': posts,
+        'posts': page.object_list if page else [],
+        'page_obj': page,
         'query': query
     })
 
@@ -137,11 +183,62 @@ class PostByTagListView(ListView):
     template_name = 'blog/posts_by_tag.html'
     context_object_name = 'posts'
     paginate_by = 10
+    replica_reads = True
+    page_cache = True
     
     def get_queryset(self):
-        return Post.objects.filter(tags__slug=self.kwargs['tag_slug'])
+        # The tag is found through TagStat's unique slug index, and its
+        # post_count stands in for a COUNT over the tagged posts.
+        self.tag_stat = TagStat.objects.filter(slug=self.kwargs['tag_slug']).first()
+        if self.tag_stat is None:
+            return Post.objects.none()
+        return Post.objects.for_list().filter(pk__in=tagged_post_ids(tag_id=self.tag_stat.tag_id))
+    
+    def get_paginator(self, queryset, *args, **kwargs):
+        paginator = super().get_paginator(queryset, *args, **kwargs)
+        if self.tag_stat is not None:
+            paginator.count = self.tag_stat.post_count
+        return paginator
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['tag'] = self.kwargs['tag_slug']
-        return context
\ No newline at end of file
+        context['tag_stat'] = self.tag_stat
+        return context
+
+
+@replica_reads
+@page_cache
+def tag_cloud(request):
+    return render(request, 'blog/tag_cloud.html')
+
+
+# Feeds
+# Served from the primary: a feed built from a lagging replica would be
+# cached until the next post change.
+def post_feed(request, feed_format):
+    return feeds.feed_response(request, feed_format)
+
+
+def tag_feed(request, tag_slug, feed_format):
+    return feeds.feed_response(request, feed_format, 'tag', tag_slug)
+
+
+def author_feed(request, username, feed_format):
+    return feeds.feed_response(request, feed_format, 'author', username)
+
+
+# Sitemaps
+# Served from the primary, like the feeds.
+def sitemap_index(request):
+    return sitemaps.sitemap_response(request)
+
+
+def sitemap_section(request, section, chunk):
+    return sitemaps.sitemap_response(request, section, chunk)
+
+
+# Operations
+@staff_member_required
+def fragment_cache_stats(request):
+    return JsonResponse(get_fragment_stats())
@@ -10,11 +10,19 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The database tooling shared by the projects (dbkit) lives at the
+# repository root.
+REPO_ROOT = BASE_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -37,18 +45,23 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'dbkit',
     'blog',
     'taggit'
 ]
 
 MIDDLEWARE = [
+    'dbkit.instrumentation.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'django_blog.assets.StaticAssetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.pagecache.AnonymousPageCacheMiddleware',
+    'dbkit.routing.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'django_blog.urls'
@@ -85,6 +98,58 @@ DATABASES = {
     }
 }
 
+# Read replica for the post list, detail, tag and search pages
+# (dbkit.routing). Set DATABASE_REPLICA_NAME to a second SQLite file to
+# try it locally; refresh it from db.sqlite3 with `python manage.py
+# sync_replica`. Under test the replica mirrors the default test database and
+# reads simply stay on default.
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['dbkit.routing.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Seconds a client keeps reading from default after one of its writes.
+REPLICA_PIN_SECONDS = 5
+
+# Per-request SQL instrumentation (dbkit.instrumentation), logged to dbkit.sql.
+# Instrument every request in development and a 1% sample otherwise.
+SQL_INSTRUMENTATION = {
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.01,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SERVER_TIMING': True,
+}
+
+# Seconds a cached post card, tag list or comment thread is kept
+# (blog.fragments). Edits invalidate fragments immediately through version
+# stamps in the default cache; use a shared cache backend with several
+# server processes.
+BLOG_FRAGMENT_CACHE_TIMEOUT = 3600
+
+# Seconds an anonymous reader's page is cached (blog.pagecache); any post,
+# comment or tag change purges every page. 0 disables the cache.
+BLOG_PAGE_CACHE_TIMEOUT = 600
+
+# Comments per page of a post's thread (blog.comments).
+BLOG_COMMENTS_PER_PAGE = 50
+
+# Tags in the popular-tags widget and in the tag cloud (blog.tagstats).
+BLOG_POPULAR_TAGS = 10
+BLOG_TAG_CLOUD_SIZE = 100
+
+# Posts per RSS/Atom feed, and seconds a built feed is cached (blog.feeds);
+# any post, tag or author change rebuilds feeds sooner.
+BLOG_FEED_ITEMS = 20
+BLOG_FEED_CACHE_TIMEOUT = 86400
+
+# Primary keys per child sitemap (at most 50000), and seconds a built chunk
+# is cached (blog.sitemaps); post and tag changes rebuild their chunk sooner.
+BLOG_SITEMAP_CHUNK_SIZE = 5000
+BLOG_SITEMAP_CACHE_TIMEOUT = 86400
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -121,6 +186,20 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Production asset pipeline (django_blog.assets): collectstatic writes
+# content-hashed, minified and precompressed files, and StaticAssetMiddleware
+# serves them with far-future cache headers. Set STATIC_PIPELINE=1 and run
+# collectstatic to use it; without it static files are served as before.
+STATIC_PIPELINE = bool(os.environ.get('STATIC_PIPELINE'))
+# Seconds browsers may cache static files whose names carry no hash.
+STATIC_MAX_AGE = 60
+if STATIC_PIPELINE:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django_blog.assets.CompressedManifestStaticFilesStorage'},
+    }
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -13,7 +13,7 @@ from accounts.models import CustomUser
 def create_like_notification(sender, instance, created, **kwargs):
     if created:
         Notification.objects.create(
-            recipient=instance.post.user,
+            recipient=instance.post.author,
             actor=instance.user,
             verb='liked your post',
             target=instance.post
@@ -24,7 +24,7 @@ def create_like_notification(sender, instance, created, **kwargs):
 def create_comment_notification(sender, instance, created, **kwargs):
     if created:
         Notification.objects.create(
-            recipient=instance.post.user,
+            recipient=instance.post.author,
             actor=instance.user,
             verb='commented on your post',
             target=instance.post
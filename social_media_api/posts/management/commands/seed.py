@@ -0,0 +1,154 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.utils import timezone
+
+from dbkit.seeding import SECONDS_PER_YEAR, SeedCommand, explicit_timestamps, skewed_index
+
+from accounts.models import CustomUser
+from posts.models import Post, Comment, Like
+
+
+WORDS = [
+    'today', 'coffee', 'city', 'weekend', 'music', 'running', 'project', 'friends', 'travel',
+    'sunset', 'book', 'kitchen', 'garden', 'train', 'rain', 'idea', 'photo', 'launch', 'team',
+    'morning', 'movie', 'beach', 'code', 'market', 'street', 'concert', 'recipe', 'mountain',
+]
+
+
+def per_owner(total, owners):
+    # Split total as evenly as possible across owners.
+    base, extra = divmod(total, owners)
+    for i in range(owners):
+        yield i, base + (1 if i < extra else 0)
+
+
+class Command(SeedCommand):
+    """
+    Generate a reproducible synthetic social graph: users, follows, posts,
+    comments and likes.
+
+    Users, posts, comments and likes are written with chunked bulk_create();
+    follow edges go straight into the M2M table with executemany(). Each user
+    follows the same number of distinct accounts, picked with a bias towards
+    popular ones. Signals are bypassed, so no notifications are generated.
+
+    Every seeded user has the password "password".
+
+    Usage:
+        python manage.py seed --scale 100
+        python manage.py seed --users 100000 --follows 5000000 --seed 7
+    """
+    help = 'Bulk-generate a reproducible synthetic social graph.'
+
+    defaults = {
+        'users': 1000,
+        'follows': 20000,
+        'posts': 10000,
+        'comments': 30000,
+        'likes': 50000,
+    }
+
+    def load(self, rng, counts):
+        user_ids = self.insert(CustomUser, self.generate_users(rng, counts['users']))
+        if not user_ids:
+            self.stdout.write(self.style.WARNING('No users created; nothing else to seed.'))
+            return None
+        self.insert_follows(rng, user_ids, counts['follows'])
+        with explicit_timestamps(Post, 'created_at'):
+            post_ids = self.insert(Post, self.generate_posts(rng, counts['posts'], user_ids))
+        if post_ids:
+            with explicit_timestamps(Comment, 'created_at'):
+                self.insert(Comment, self.generate_comments(rng, counts['comments'], user_ids, post_ids),
+                            return_ids=False)
+            with explicit_timestamps(Like, 'created_at'):
+                self.insert(Like, self.generate_likes(rng, counts['likes'], user_ids, post_ids),
+                            return_ids=False)
+        return 'Seeding complete.'
+
+    def generate_users(self, rng, count):
+        # Hashing is deliberately slow; hash once and share the result.
+        password = make_password('password')
+        start = CustomUser.objects.using(self.using).count()
+        now = timezone.now()
+        for i in range(start, start + count):
+            username = f'{rng.choice(WORDS)}_{i}'
+            yield CustomUser(
+                username=username,
+                email=f'{username}@example.com',
+                password=password,
+                bio=' '.join(rng.choices(WORDS, k=rng.randint(0, 12))),
+                date_joined=now - timedelta(seconds=rng.randrange(3 * SECONDS_PER_YEAR)),
+            )
+
+    def generate_posts(self, rng, count, user_ids):
+        now = timezone.now()
+        for _ in range(count):
+            yield Post(
+                author_id=user_ids[skewed_index(rng, len(user_ids))],
+                content=' '.join(rng.choices(WORDS, k=rng.randint(3, 60))),
+                created_at=now - timedelta(seconds=rng.randrange(2 * SECONDS_PER_YEAR)),
+            )
+
+    def generate_comments(self, rng, count, user_ids, post_ids):
+        now = timezone.now()
+        for _ in range(count):
+            yield Comment(
+                post_id=post_ids[skewed_index(rng, len(post_ids))],
+                user_id=rng.choice(user_ids),
+                content=' '.join(rng.choices(WORDS, k=rng.randint(1, 25))),
+                created_at=now - timedelta(seconds=rng.randrange(SECONDS_PER_YEAR)),
+            )
+
+    def generate_likes(self, rng, count, user_ids, post_ids):
+        now = timezone.now()
+        count = min(count, len(user_ids) * len(post_ids))
+        for index, likes in per_owner(count, len(user_ids)):
+            for post_index in self.distinct_targets(rng, len(post_ids), likes):
+                yield Like(
+                    user_id=user_ids[index],
+                    post_id=post_ids[post_index],
+                    created_at=now - timedelta(seconds=rng.randrange(SECONDS_PER_YEAR)),
+                )
+
+    def distinct_targets(self, rng, size, count, exclude=None):
+        # Skewed picks without repeats; falls back to uniform picks once the
+        # popular end is exhausted.
+        chosen = set()
+        attempts = 0
+        while len(chosen) < count:
+            if attempts < count * 4:
+                index = skewed_index(rng, size)
+            else:
+                index = rng.randrange(size)
+            attempts += 1
+            if index != exclude:
+                chosen.add(index)
+        return sorted(chosen)
+
+    def insert_follows(self, rng, user_ids, count):
+        through = CustomUser.followers.through
+        field = CustomUser._meta.get_field('followers')
+        connection = connections[self.using]
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}, {}) VALUES (%s, %s)'.format(
+            quote(through._meta.db_table),
+            quote(field.m2m_column_name()),
+            quote(field.m2m_reverse_name()),
+        )
+        count = min(count, len(user_ids) * (len(user_ids) - 1))
+
+        def edges():
+            for index, follows in per_owner(count, len(user_ids)):
+                for target in self.distinct_targets(rng, len(user_ids), follows, exclude=index):
+                    yield (user_ids[index], user_ids[target])
+
+        started = time.monotonic()
+        total = 0
+        for chunk in self.chunks(edges()):
+            with transaction.atomic(using=self.using), connection.cursor() as cursor:
+                cursor.executemany(sql, chunk)
+            total += len(chunk)
+        self.report('Follow', total, started)
@@ -1,3 +1,36 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import CustomUser
+from .models import Comment, Like, Post
+
+
+class SeedCommandTests(TestCase):
+
+    def seed(self, **options):
+        call_command('seed', stdout=StringIO(), batch_size=40, **options)
+
+    def test_creates_requested_rows(self):
+        self.seed(users=10, follows=30, posts=50, comments=60, likes=70)
+        self.assertEqual(CustomUser.objects.count(), 10)
+        self.assertEqual(CustomUser.followers.through.objects.count(), 30)
+        self.assertEqual(Post.objects.count(), 50)
+        self.assertEqual(Comment.objects.count(), 60)
+        self.assertEqual(Like.objects.count(), 70)
+        self.assertFalse(
+            CustomUser.followers.through.objects.filter(
+                from_customuser_id=F('to_customuser_id')
+            ).exists()
+        )
+
+    def test_same_seed_reproduces_data(self):
+        self.seed(users=5, follows=10, posts=20, comments=0, likes=0, seed=3)
+        first = list(Post.objects.order_by('pk').values_list('author__username', 'content'))
+        CustomUser.objects.all().delete()
+        self.seed(users=5, follows=10, posts=20, comments=0, likes=0, seed=3)
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('author__username', 'content')), first
+        )
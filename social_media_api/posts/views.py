@@ -33,6 +33,7 @@ class CommentViewSet(viewsets.ModelViewSet):
 class FeedAPIView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
 
     def get_queryset(self):
@@ -1,9 +1,16 @@
 import os
+import sys
 from pathlib import Path
 
 # Build paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The database tooling shared by the projects (dbkit) lives at the
+# repository root.
+REPO_ROOT = BASE_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
 # SECURITY
 DEBUG = False
 ALLOWED_HOSTS = ['yourdomain.com', '127.0.0.1', 'localhost']
@@ -24,6 +31,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'django_filters',
+    'dbkit',
 
     # Your apps
     'accounts',
@@ -33,6 +41,7 @@ INSTALLED_APPS = [
 
 # Middleware
 MIDDLEWARE = [
+    'dbkit.instrumentation.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -42,6 +51,7 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'dbkit.routing.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'social_media_api.urls'
@@ -92,6 +102,38 @@ if not os.environ.get('DB_NAME'):
         }
     }
 
+# Read replica for the feed and other read endpoints (dbkit.routing).
+# With PostgreSQL, DB_REPLICA_HOST names a streaming replica of the primary;
+# with the SQLite fallback, DATABASE_REPLICA_NAME names a second SQLite file,
+# refreshed with `python manage.py sync_replica`. Under test the replica
+# mirrors the default test database and reads simply stay on default.
+if os.environ.get('DB_NAME') and os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif not os.environ.get('DB_NAME') and os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['dbkit.routing.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Seconds a client keeps reading from default after one of its writes.
+REPLICA_PIN_SECONDS = 5
+
+# Per-request SQL instrumentation (dbkit.instrumentation), logged to dbkit.sql.
+# Instrument every request in development and a 1% sample otherwise.
+SQL_INSTRUMENTATION = {
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.01,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'SERVER_TIMING': True,
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import ignore_warnings
+
+from dbkit.instrumentation import SQLInstrumentationMiddleware, fingerprint
+from dbkit.routing import PIN_COOKIE, ReplicaRoutingMiddleware, primary, replica, replica_reads
+
+from accounts.models import CustomUser
+from posts.models import Post
+
+
+
+@override_settings(SQL_INSTRUMENTATION={'SAMPLE_RATE': 1.0})
+class SQLInstrumentationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = CustomUser.objects.create_user('writer', password='pass12345')
+        for i in range(6):
+            Post.objects.create(content=f'Post {i}', author=author)
+
+    def run_middleware(self, view):
+        return SQLInstrumentationMiddleware(view)(RequestFactory().get('/probe/'))
+
+    def test_fingerprint_groups_statements_by_shape(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+        )
+
+    def test_n_plus_one_is_logged_with_server_timing(self):
+        def view(request):
+            for post in Post.objects.all():
+                list(post.comments.all())
+            return HttpResponse('ok')
+
+        with self.assertLogs('dbkit.sql', level='WARNING') as logs:
+            response = self.run_middleware(view)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['queries'], 7)
+        self.assertEqual(record['n_plus_one'][0]['count'], 6)
+        self.assertIn('desc="7 queries"', response['Server-Timing'])
+
+    @override_settings(SQL_INSTRUMENTATION={'SAMPLE_RATE': 0})
+    def test_unsampled_requests_are_untouched(self):
+        with self.assertNoLogs('dbkit.sql', level='INFO'):
+            response = self.run_middleware(lambda request: HttpResponse('ok'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_installed_for_every_request(self):
+        with self.assertLogs('dbkit.sql', level='INFO'):
+            response = self.client.get('/no-such-page/')
+        self.assertIn('Server-Timing', response)
+
+
+REPLICA_DATABASES = {
+    **settings.DATABASES,
+    'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'replica.sqlite3'},
+}
+
+
+@replica_reads
+def read_alias_view(request):
+    response = HttpResponse(Post.objects.all().db)
+    response.status_code = int(request.GET.get('status', 200))
+    return response
+
+
+def primary_only_view(request):
+    return HttpResponse(Post.objects.all().db)
+
+
+# Only the middleware reads DATABASES here; no connection is opened, so only
+# the routing decision (QuerySet.db) is checked.
+@ignore_warnings(message='Overriding setting DATABASES')
+@override_settings(DATABASES=REPLICA_DATABASES, REPLICA_PIN_SECONDS=5)
+@mock.patch.object(ReplicaRoutingMiddleware, 'is_mirror', lambda self: False)
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def request(self, method, view, path='/probe/', **extra):
+        request = getattr(self.factory, method)(path, **extra)
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_safe_requests_to_opted_in_views_read_from_replica(self):
+        self.assertEqual(self.request('get', read_alias_view).content, b'replica')
+        self.assertEqual(self.request('get', primary_only_view).content, b'default')
+
+    def test_writes_pin_the_client_to_default(self):
+        response = self.request('post', read_alias_view)
+        self.assertEqual(response.content, b'default')
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 5)
+        response = self.request('post', read_alias_view, path='/probe/?status=400')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        self.request('post', read_alias_view, HTTP_AUTHORIZATION='Token abc')
+        response = self.request('get', read_alias_view, HTTP_AUTHORIZATION='Token abc')
+        self.assertEqual(response.content, b'default')
+        response = self.request('get', read_alias_view, HTTP_AUTHORIZATION='Token xyz')
+        self.assertEqual(response.content, b'replica')
+
+        self.factory.cookies[PIN_COOKIE] = '1'
+        self.assertEqual(self.request('get', read_alias_view).content, b'default')
+
+    def test_primary_override(self):
+        with replica():
+            self.assertEqual(Post.objects.all().db, 'replica')
+            with primary():
+                self.assertEqual(Post.objects.all().db, 'default')
+            self.assertEqual(Post.objects.all().db, 'replica')
+        self.assertEqual(Post.objects.all().db, 'default')
+
+    def test_users_and_sessions_read_from_default(self):
+        with replica():
+            self.assertEqual(CustomUser.objects.all().db, 'default')
+            self.assertEqual(Session.objects.all().db, 'default')
+
+    @override_settings(DATABASES={'default': settings.DATABASES['default']})
+    def test_no_replica_configured(self):
+        self.assertEqual(self.request('get', read_alias_view).content, b'default')
+
+
+class SyncReplicaTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source = os.path.join(directory.name, 'default.sqlite3')
+        self.target = os.path.join(directory.name, 'replica.sqlite3')
+        with closing(sqlite3.connect(self.source)) as db:
+            db.execute('CREATE TABLE probe (value TEXT)')
+            db.execute("INSERT INTO probe VALUES ('copied')")
+            db.commit()
+
+    def database_settings(self, **replica):
+        sqlite = 'django.db.backends.sqlite3'
+        return {
+            'default': {'ENGINE': sqlite, 'NAME': self.source},
+            'replica': {'ENGINE': sqlite, 'NAME': self.target, **replica},
+        }
+
+    @ignore_warnings(message='Overriding setting DATABASES')
+    def test_copies_default_onto_replica(self):
+        with override_settings(DATABASES=self.database_settings()):
+            call_command('sync_replica', stdout=StringIO())
+        with closing(sqlite3.connect(self.target)) as db:
+            self.assertEqual(db.execute('SELECT value FROM probe').fetchall(), [('copied',)])
+
+    @ignore_warnings(message='Overriding setting DATABASES')
+    def test_rejects_missing_or_non_sqlite_replica(self):
+        with override_settings(DATABASES={'default': self.database_settings()['default']}):
+            with self.assertRaises(CommandError):
+                call_command('sync_replica')
+        databases = self.database_settings(ENGINE='django.db.backends.postgresql')
+        with override_settings(DATABASES=databases):
+            with self.assertRaises(CommandError):
+                call_command('sync_replica')
@@ -10,5 +10,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/accounts/', include('accounts.urls')),  # Accounts app: register, login, profile, follow/unfollow
     path('api/posts/', include('posts.urls')),        # Posts app: CRUD, feed, like/unlike
+    path('api/notifications/', include('notifications.urls')),  # Notifications for the current user
     path('', home),                                   # Root URL
 ]